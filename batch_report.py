@@ -0,0 +1,392 @@
+"""
+Headless batch report for patient data analysis.
+Runs selected analyses over one load of the data and writes the results
+as JSON/CSV files and the charts as image files, without any prompts.
+"""
+
+import argparse
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+import instrumentation
+from data_loader import DataLoadError, is_sqlite_path, load_data_patients
+from health_analyzer import (
+    calculate_statistics,
+    compute_risk_pipeline,
+    get_all_statistics,
+    get_indicator_counts,
+    get_patient_summary,
+    get_period_averages,
+    get_risk_distribution,
+    get_top_risk_patients,
+)
+from cohort_cube import get_aggregate_cube
+from sqlite_backend import SQLiteStore
+from stream_analyzer import analyze_csv_stream
+from time_series import get_trend_engine
+from visualizer import ChartJob, render_charts
+
+ANALYSES = (
+    "summary", "statistics", "categories", "daily_averages", "trends", "cohorts", "top_patients"
+)
+
+
+class _StageTimer:
+    """Collect wall-clock durations of named report stages."""
+    
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block under ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+
+def _to_json(value: Any) -> Any:
+    """Convert NumPy and pandas scalars for ``json.dump``."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(cfg.DATE_FORMAT)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write ``data`` as indented JSON."""
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(data, output, indent=2, default=_to_json)
+
+
+def _counts_to_dict(counts: pd.Series) -> Dict[str, int]:
+    """Convert category counts to a plain label -> count mapping."""
+    return {str(label): int(count) for label, count in counts.items()}
+
+
+def run_batch_report(
+    output_dir: Path,
+    analyses: Sequence[str] = ANALYSES,
+    file_path: Optional[str] = None,
+    charts: bool = True,
+    stream_chunksize: Optional[int] = None,
+    stream_check_duplicates: bool = False,
+    chart_workers: int = cfg.RENDER_MAX_WORKERS,
+    top_by: str = cfg.TOP_PATIENTS_RANK_BY,
+    trend_freq: str = "D",
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD,
+    rolling_windows: Sequence[int] = cfg.TREND_ROLLING_WINDOWS,
+    rolling_window: Optional[int] = None
+) -> Dict[str, float]:
+    """
+    Run analyses over one load of the data and write the results.
+    
+    Args:
+        output_dir: Directory receiving the JSON/CSV outputs and charts.
+        analyses: Names from ``ANALYSES`` to run.
+        file_path: Optional path to the data. Defaults to DATA_FILE_PATH.
+            An SQLite database (see ``is_sqlite_path``) is analyzed with
+            SQL queries instead of being loaded.
+        charts: Also render the charts belonging to each analysis.
+        stream_chunksize: Analyze in chunks of this many rows instead of
+            loading the whole file into memory (ignored for a database).
+        stream_check_duplicates: When streaming, also quarantine repeated
+            (id_pasien, tanggal_periksa) pairs, at 8 bytes of memory per row.
+        chart_workers: Worker processes rendering the charts off-screen.
+        top_by: Column ranking the top patients (an indicator or
+            ``cfg.COLUMN_SKOR_RISIKO``).
+        trend_freq: Averaging period of the trend outputs and charts,
+            a key of ``cfg.TREND_FREQUENCIES``.
+        downsample: Downsampling method of long trend charts, see
+            ``visualizer.downsample_series``.
+        rolling_windows: Window lengths in days of the rolling trend
+            tables written by the "trends" analysis.
+        rolling_window: Plot the trend charts as rolling means over this
+            many days instead of per ``trend_freq`` period.
+            
+    Returns:
+        Dict[str, float]: Wall-clock seconds per stage.
+        
+    Raises:
+        DataLoadError: If the data cannot be loaded.
+        ValueError: If an unknown analysis, frequency or window is requested.
+    """
+    unknown = set(analyses) - set(ANALYSES)
+    if unknown:
+        raise ValueError(f"Unknown analyses: {sorted(unknown)}")
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timer = _StageTimer()
+    chart_jobs: List[ChartJob] = []
+    
+    with timer.stage("load"):
+        aggregates = None
+        if is_sqlite_path(file_path):
+            aggregates = SQLiteStore(file_path)
+        elif stream_chunksize:
+            aggregates = analyze_csv_stream(
+                file_path, stream_chunksize, stream_check_duplicates
+            )
+        else:
+            df = load_data_patients(file_path)
+    
+    if "summary" in analyses:
+        with timer.stage("summary"):
+            summary = (
+                aggregates.patient_summary() if aggregates is not None
+                else get_patient_summary(df)
+            )
+            _write_json(output_dir / "summary.json", summary)
+    
+    if "statistics" in analyses:
+        with timer.stage("statistics"):
+            if aggregates is not None:
+                stats, describe = aggregates.statistics(), aggregates.describe()
+            else:
+                stats, describe = calculate_statistics(df), get_all_statistics(df)
+            _write_json(output_dir / "statistics.json", asdict(stats))
+            describe.to_csv(output_dir / "statistics_describe.csv")
+        chart_jobs.append(ChartJob(
+            "rata_rata_indikator",
+            (stats.mean_tekanan, stats.mean_gula, stats.mean_kolesterol),
+            output_dir / "rata_rata_indikator.png",
+        ))
+    
+    if "categories" in analyses:
+        with timer.stage("categories"):
+            category_columns = list(cfg.INDICATOR_CATEGORY_COLUMNS.values())
+            if aggregates is not None:
+                counts = {c: aggregates.indicator_counts(c) for c in category_columns}
+                counts[cfg.CAT_AKHIR] = aggregates.risk_distribution()
+            else:
+                risk_df = compute_risk_pipeline(df, columns_only=True)
+                counts = {c: get_indicator_counts(risk_df, c) for c in category_columns}
+                counts[cfg.CAT_AKHIR] = get_risk_distribution(risk_df)
+            _write_json(
+                output_dir / "categories.json",
+                {column: _counts_to_dict(c) for column, c in counts.items()},
+            )
+        chart_jobs.append(ChartJob(
+            "kategori_risiko", (counts[cfg.CAT_AKHIR],), output_dir / "kategori_risiko.png"
+        ))
+    
+    if "daily_averages" in analyses:
+        with timer.stage("daily_averages"):
+            if aggregates is not None:
+                daily = aggregates.period_averages(trend_freq)
+            else:
+                daily = get_period_averages(df, trend_freq)
+            daily.to_csv(output_dir / "daily_averages.csv", date_format=cfg.DATE_FORMAT)
+            if rolling_window:
+                engine = (
+                    aggregates.trend_engine() if aggregates is not None
+                    else get_trend_engine(df)
+                )
+                daily = engine.rolling(rolling_window)[cfg.HEALTH_COLUMNS]
+        for name in ("tren_tekanan_darah", "tren_gula_darah", "tren_kolesterol", "perbandingan_indikator"):
+            chart_jobs.append(ChartJob(
+                name, (daily,), output_dir / f"{name}.png", {"downsample": downsample}
+            ))
+    
+    if "trends" in analyses:
+        with timer.stage("trends"):
+            engine = (
+                aggregates.trend_engine() if aggregates is not None
+                else get_trend_engine(df)
+            )
+            engine.resample(trend_freq).to_csv(
+                output_dir / "trends.csv", date_format=cfg.DATE_FORMAT
+            )
+            for window in rolling_windows:
+                engine.rolling(window).to_csv(
+                    output_dir / f"trends_rolling_{window}d.csv", date_format=cfg.DATE_FORMAT
+                )
+    
+    if "cohorts" in analyses:
+        with timer.stage("cohorts"):
+            cube = (
+                aggregates.aggregate_cube() if aggregates is not None
+                else get_aggregate_cube(df)
+            )
+            cube.save(output_dir / "cohort_cube.arrow")
+            by = [cfg.COLUMN_JENIS_KELAMIN, cfg.COLUMN_KELOMPOK_UMUR]
+            cohorts = cube.statistics(by).join(cube.risk_distribution(by).rename(columns=str))
+            cohorts.to_csv(output_dir / "cohorts.csv")
+    
+    if "top_patients" in analyses:
+        with timer.stage("top_patients"):
+            if aggregates is not None:
+                top = aggregates.top_risk_patients(by=top_by)
+            else:
+                top = get_top_risk_patients(df, by=top_by)
+            top.to_csv(output_dir / "top_patients.csv")
+        chart_jobs.append(ChartJob(
+            "pasien_risiko_tinggi", (top,), output_dir / "pasien_risiko_tinggi.png"
+        ))
+    
+    if charts and chart_jobs:
+        with timer.stage("charts"):
+            render_charts(chart_jobs, max_workers=chart_workers)
+    
+    timer.timings["total"] = sum(timer.timings.values())
+    _write_json(output_dir / "timings.json", timer.timings)
+    return timer.timings
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Laporan batch analisis data pasien (tanpa interaksi)"
+    )
+    parser.add_argument("output_dir", type=Path, help="Folder tujuan hasil laporan")
+    parser.add_argument(
+        "--analyses",
+        nargs="+",
+        choices=ANALYSES,
+        default=list(ANALYSES),
+        help="Analisis yang dijalankan (default: semua)",
+    )
+    parser.add_argument(
+        "--data", help="Path file CSV, folder dataset berpartisi, atau database SQLite (.db)"
+    )
+    parser.add_argument(
+        "--no-charts", action="store_true", help="Jangan membuat file grafik"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Analisis data per potongan (chunk) tanpa memuat seluruh file ke memori",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=cfg.STREAM_CHUNK_SIZE,
+        help="Jumlah baris per potongan pada mode --stream",
+    )
+    parser.add_argument(
+        "--check-duplicates",
+        action="store_true",
+        help=(
+            "Pada mode --stream, karantina juga pemeriksaan id_pasien + tanggal_periksa "
+            "yang berulang (memori bertambah 8 byte per baris)"
+        ),
+    )
+    parser.add_argument(
+        "--chart-workers",
+        type=int,
+        default=cfg.RENDER_MAX_WORKERS,
+        help="Jumlah proses paralel untuk membuat file grafik",
+    )
+    parser.add_argument(
+        "--top-by",
+        choices=[*cfg.HEALTH_COLUMNS, cfg.COLUMN_SKOR_RISIKO],
+        default=cfg.TOP_PATIENTS_RANK_BY,
+        help="Indikator (atau skor risiko gabungan) untuk memeringkat pasien risiko tertinggi",
+    )
+    parser.add_argument(
+        "--trend-freq",
+        choices=list(cfg.TREND_FREQUENCIES),
+        default="D",
+        help="Periode rata-rata tren: D (harian), W (mingguan), M (bulanan)",
+    )
+    parser.add_argument(
+        "--downsample",
+        choices=["lttb", "minmax", "none"],
+        default=cfg.TREND_DOWNSAMPLE_METHOD,
+        help="Metode pengurangan titik grafik tren yang panjang (none: semua titik)",
+    )
+    parser.add_argument(
+        "--rolling-windows",
+        nargs="+",
+        type=int,
+        default=list(cfg.TREND_ROLLING_WINDOWS),
+        help="Panjang jendela (hari) tabel tren bergerak pada analisis trends",
+    )
+    parser.add_argument(
+        "--rolling-window",
+        type=int,
+        help="Gambar grafik tren sebagai rata-rata bergerak N hari (menggantikan --trend-freq)",
+    )
+    parser.add_argument(
+        "--profile-out",
+        type=Path,
+        help="Catat waktu, CPU, baris, dan memori tiap fungsi analisis ke file JSON ini",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        help="Tulis catatan yang sama dalam format Chrome trace (chrome://tracing, Perfetto)",
+    )
+    parser.add_argument(
+        "--cprofile-out",
+        type=Path,
+        help="Jalankan juga cProfile dan simpan hasilnya (format pstats) ke file ini",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the batch report from the command line.
+    
+    Returns:
+        int: Process exit code.
+    """
+    args = parse_args(argv)
+    instrumented = bool(args.profile_out or args.trace_out or args.cprofile_out)
+    if instrumented:
+        instrumentation.enable(profile=bool(args.cprofile_out))
+    try:
+        timings = run_batch_report(
+            args.output_dir,
+            analyses=args.analyses,
+            file_path=args.data,
+            charts=not args.no_charts,
+            stream_chunksize=args.chunksize if args.stream else None,
+            stream_check_duplicates=args.check_duplicates,
+            chart_workers=args.chart_workers,
+            top_by=args.top_by,
+            trend_freq=args.trend_freq,
+            downsample=None if args.downsample == "none" else args.downsample,
+            rolling_windows=args.rolling_windows,
+            rolling_window=args.rolling_window,
+        )
+    except DataLoadError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        instrumentation.disable()
+    
+    print(f"Laporan ditulis ke: {args.output_dir}")
+    print(f"{'Tahap':<28}{'Detik':>10}")
+    for stage, seconds in timings.items():
+        print(f"{stage:<28}{seconds:>10.3f}")
+    if instrumented:
+        print()
+        print(instrumentation.format_summary())
+        for path in instrumentation.export(args.profile_out, args.trace_out, args.cprofile_out):
+            print(f"Data instrumentasi ditulis ke: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,923 @@
+"""
+Benchmark suite for patient data analysis.
+Times and memory-profiles the public functions of ``health_analyzer``,
+``data_loader``, ``time_series``, ``cohort_cube``, ``quantile_sketch``,
+``sqlite_backend``, ``column_store``, ``data_quality`` and ``visualizer`` on synthetic
+datasets of increasing size, stores the results as JSON and compares them against a baseline.
+"""
+
+import argparse
+import fnmatch
+import inspect
+import json
+import platform
+import shutil
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import cohort_cube
+import column_store
+import config as cfg
+import data_loader
+import data_quality
+import health_analyzer
+import quantile_sketch
+import sqlite_backend
+import time_series
+import visualizer
+from synthetic_data import GENERATOR_VERSION, write_patient_csv
+
+BENCHMARK_MODULES = (
+    health_analyzer, data_loader, time_series, cohort_cube, quantile_sketch, sqlite_backend,
+    column_store, data_quality, visualizer,
+)
+DEFAULT_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+RESULTS_DIR = Path("benchmark_results")
+
+# Public functions without a benchmark case, and why
+NOT_BENCHMARKED = {
+    "health_analyzer.clear_analysis_cache": "tidak bergantung pada ukuran data",
+    "health_analyzer.get_analysis_cache_stats": "tidak bergantung pada ukuran data",
+    "health_analyzer.memoize_by_dataset": "dekorator",
+    "cohort_cube.age_band_labels": "tidak bergantung pada ukuran data",
+    "quantile_sketch.k_for_error": "tidak bergantung pada ukuran data",
+    "quantile_sketch.describe_table": "diukur lewat get_all_statistics[sketch]",
+    "data_loader.clear_cache": "tidak bergantung pada ukuran data",
+    "data_loader.get_cache_stats": "tidak bergantung pada ukuran data",
+    "data_loader.get_sidecar_path": "tidak bergantung pada ukuran data",
+    "data_loader.is_sqlite_path": "tidak bergantung pada ukuran data",
+    "data_loader.get_quarantine_path": "tidak bergantung pada ukuran data",
+    "data_quality.rules_fingerprint": "tidak bergantung pada ukuran data",
+    "sqlite_backend.parse_args": "antarmuka baris perintah",
+    "sqlite_backend.main": "antarmuka baris perintah, diukur lewat import_csv",
+    "column_store.get_column_store_path": "tidak bergantung pada ukuran data",
+    "column_store.write_column_store": "diukur lewat build_column_store",
+    "visualizer.lttb_indices": "diukur lewat downsample_series",
+    "visualizer.minmax_indices": "diukur lewat downsample_series",
+    **{
+        f"visualizer.{name}": "diukur lewat render_chart"
+        for name in (
+            "draw_average_indicators", "draw_blood_pressure_trend",
+            "draw_blood_sugar_trend", "draw_cholesterol_trend", "draw_comparison",
+            "draw_high_risk_patients", "draw_risk_categories",
+        )
+    },
+}
+
+
+class BenchmarkContext:
+    """
+    Inputs shared by the cases of one dataset size.
+    
+    Derived inputs are computed on first use, so a run filtered to a few
+    cases only pays for what those cases need.
+    """
+    
+    def __init__(self, rows: int, csv_path: Path, work_dir: Path) -> None:
+        self.rows = rows
+        self.csv_path = csv_path
+        self.work_dir = work_dir
+    
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        return data_loader.load_data_patients(str(self.csv_path))
+    
+    @cached_property
+    def risk_df(self) -> pd.DataFrame:
+        return health_analyzer.compute_risk_pipeline(self.df, columns_only=True)
+    
+    @cached_property
+    def daily(self) -> pd.DataFrame:
+        return health_analyzer.get_daily_averages(self.df)
+    
+    @cached_property
+    def top_patients(self) -> pd.DataFrame:
+        return health_analyzer.get_top_risk_patients(self.df)
+    
+    @cached_property
+    def patient_index(self) -> data_loader.PatientIndex:
+        return data_loader.PatientIndex(self.df)
+    
+    @cached_property
+    def stats(self) -> health_analyzer.HealthStatistics:
+        return health_analyzer.calculate_statistics(self.df)
+    
+    @cached_property
+    def sqlite_store(self) -> sqlite_backend.SQLiteStore:
+        path = sqlite_backend.import_csv(str(self.csv_path), str(self.path("data.db")))
+        return sqlite_backend.SQLiteStore(path)
+    
+    @cached_property
+    def column_store(self) -> column_store.ColumnStore:
+        return column_store.build_column_store(str(self.csv_path), str(self.path("data.columns")))
+    
+    @cached_property
+    def partition_dir(self) -> Path:
+        root = self.work_dir / "partitions"
+        if not root.exists():
+            data_loader.write_partitioned_dataset(self.df, str(root))
+        return root
+    
+    def path(self, name: str) -> Path:
+        """Scratch file or directory path for a case."""
+        return self.work_dir / name
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """
+    One benchmarked call.
+    
+    ``prepare`` builds the inputs and returns the zero-argument call to
+    time; ``reset`` runs before every timed call (outside the timing),
+    e.g. to drop caches so each run measures the cold path.
+    """
+    name: str
+    prepare: Callable[[BenchmarkContext], Callable[[], Any]]
+    reset: Optional[Callable[[BenchmarkContext], None]] = None
+    max_rows: Optional[int] = None
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one case at one dataset size."""
+    case: str
+    rows: int
+    repeat: int
+    min_s: float
+    median_s: float
+    peak_bytes: int
+
+
+def _drop_sidecar(ctx: BenchmarkContext) -> None:
+    data_loader.clear_cache()
+    data_loader.get_sidecar_path(str(ctx.csv_path)).unlink(missing_ok=True)
+
+
+def _drop_dataset_cache(ctx: BenchmarkContext) -> None:
+    data_loader.clear_cache()
+
+
+def _drop_path(name: str) -> Callable[[BenchmarkContext], None]:
+    def reset(ctx: BenchmarkContext) -> None:
+        shutil.rmtree(ctx.path(name), ignore_errors=True)
+    return reset
+
+
+def _prepare_codes_to_categorical(ctx: BenchmarkContext) -> Callable[[], Any]:
+    codes = health_analyzer.compute_risk_codes(ctx.df)[:, 0]
+    return lambda: health_analyzer.codes_to_categorical(codes)
+
+
+def _prepare_final_risk(ctx: BenchmarkContext) -> Callable[[], Any]:
+    categorized = health_analyzer.add_risk_categories(ctx.df)
+    return lambda: health_analyzer.calculate_final_risk_category(categorized)
+
+
+def _prepare_risk_score(ctx: BenchmarkContext) -> Callable[[], Any]:
+    means = health_analyzer.get_patient_means(ctx.df)
+    return lambda: health_analyzer.compute_risk_score(means)
+
+
+def _prepare_select_top(ctx: BenchmarkContext) -> Callable[[], Any]:
+    means = health_analyzer.get_patient_means(ctx.df)
+    return lambda: health_analyzer.select_top_patients(means, by=cfg.COLUMN_SKOR_RISIKO)
+
+
+def _prepare_patient_features(ctx: BenchmarkContext) -> Callable[[], Any]:
+    index = ctx.patient_index
+    return lambda: health_analyzer.get_patient_features(index)
+
+
+def _prepare_trend_resample(ctx: BenchmarkContext) -> Callable[[], Any]:
+    engine = time_series.TrendEngine.from_frame(ctx.df)
+    return lambda: engine.resample("W")
+
+
+def _prepare_trend_rolling(ctx: BenchmarkContext) -> Callable[[], Any]:
+    engine = time_series.TrendEngine.from_frame(ctx.df)
+    
+    def rolling() -> pd.DataFrame:
+        engine._rolling.clear()  # Windows are cached after the first call
+        return engine.rolling(30)
+    
+    return rolling
+
+
+def _prepare_trend_update(ctx: BenchmarkContext) -> Callable[[], Any]:
+    # Exams of the last day arriving after the rest, with the default
+    # rolling windows already computed; each repeat adds them again, which
+    # recomputes the same trailing rows
+    dates = ctx.df[cfg.COLUMN_TANGGAL_PERIKSA]
+    last_day = dates >= dates.max().normalize()
+    engine = time_series.TrendEngine.from_frame(ctx.df[~last_day])
+    for window in cfg.TREND_ROLLING_WINDOWS:
+        engine.rolling(window)
+    new_rows = ctx.df[last_day]
+    return lambda: engine.update(new_rows)
+
+
+def _prepare_cube_rollup(ctx: BenchmarkContext) -> Callable[[], Any]:
+    cube = cohort_cube.AggregateCube.from_frame(ctx.df)
+    by = [cfg.COLUMN_JENIS_KELAMIN, cfg.COLUMN_KELOMPOK_UMUR]
+    return lambda: (cube.statistics(by), cube.risk_distribution(by))
+
+
+def _prepare_cube_update(ctx: BenchmarkContext) -> Callable[[], Any]:
+    # Same arrival pattern as the trend update: exams of the last day
+    dates = ctx.df[cfg.COLUMN_TANGGAL_PERIKSA]
+    last_day = dates >= dates.max().normalize()
+    cube = cohort_cube.AggregateCube.from_frame(ctx.df[~last_day])
+    new_rows = ctx.df[last_day]
+    return lambda: cube.update(new_rows)
+
+
+def _prepare_sketch_merge(ctx: BenchmarkContext) -> Callable[[], Any]:
+    # Sketches of ten shards, merged as the streaming analysis merges workers
+    values = ctx.df[cfg.COLUMN_TEKANAN_DARAH].to_numpy()
+    shards = []
+    for part in np.array_split(values, 10):
+        shards.append(quantile_sketch.KLLSketch(seed=0))
+        shards[-1].update(part)
+    
+    def merge() -> quantile_sketch.KLLSketch:
+        merged = quantile_sketch.KLLSketch(seed=0)
+        for shard in shards:
+            merged.merge(shard)
+        return merged
+    
+    return merge
+
+
+def _prepare_load(ctx: BenchmarkContext) -> Callable[[], Any]:
+    ctx.df  # First load writes the sidecar
+    return lambda: data_loader.load_data_patients(str(ctx.csv_path))
+
+
+def _prepare_date_index(ctx: BenchmarkContext) -> Callable[[], Any]:
+    ctx.df
+    return lambda: data_loader.get_date_index(str(ctx.csv_path))
+
+
+def _prepare_patient_index(ctx: BenchmarkContext) -> Callable[[], Any]:
+    ctx.df
+    return lambda: data_loader.get_patient_index(str(ctx.csv_path))
+
+
+def _prepare_history_lookups(ctx: BenchmarkContext) -> Callable[[], Any]:
+    index = ctx.patient_index
+    rng = np.random.default_rng(0)
+    patient_ids = index.patient_ids[rng.integers(0, len(index), size=1000)]
+    return lambda: [index.history(patient_id) for patient_id in patient_ids]
+
+
+def _prepare_date_filter(ctx: BenchmarkContext) -> Callable[[], Any]:
+    start, end = _date_filter_bounds(ctx)
+    return lambda: data_loader.load_data_with_date_filter(start, end, str(ctx.csv_path))
+
+
+def _prepare_sqlite_date_filter(ctx: BenchmarkContext) -> Callable[[], Any]:
+    start, end = _date_filter_bounds(ctx)
+    path = str(ctx.sqlite_store.path)
+    return lambda: data_loader.load_data_with_date_filter(start, end, path)
+
+
+def _prepare_sqlite_history(ctx: BenchmarkContext) -> Callable[[], Any]:
+    store = ctx.sqlite_store
+    rng = np.random.default_rng(0)
+    patient_ids = ctx.patient_index.patient_ids[rng.integers(0, len(ctx.patient_index), size=100)]
+    return lambda: [store.history(patient_id) for patient_id in patient_ids]
+
+
+def _sqlite_query(method: str, *args: Any) -> Callable[[BenchmarkContext], Callable[[], Any]]:
+    def prepare(ctx: BenchmarkContext) -> Callable[[], Any]:
+        query = getattr(ctx.sqlite_store, method)
+        return lambda: query(*args)
+    return prepare
+
+
+def _on_column_store(
+    func: Callable[..., Any],
+    *args: Any
+) -> Callable[[BenchmarkContext], Callable[[], Any]]:
+    def prepare(ctx: BenchmarkContext) -> Callable[[], Any]:
+        store = ctx.column_store
+        return lambda: func(store, *args)
+    return prepare
+
+
+def _validate_text(bad_every: Optional[int] = None) -> Callable[[BenchmarkContext], Callable[[], Any]]:
+    """Validate the dataset with integer columns and dates as text, as parsed leniently."""
+    def prepare(ctx: BenchmarkContext) -> Callable[[], Any]:
+        columns = [cfg.COLUMN_TANGGAL_PERIKSA, *cfg.VALID_RANGES]
+        text = ctx.df.astype({column: "string[pyarrow]" for column in columns})
+        if bad_every:
+            text.loc[text.index[::bad_every], cfg.COLUMN_TEKANAN_DARAH] = "?"
+        return lambda: data_quality.validate_patient_data(text)
+    
+    return prepare
+
+
+def _prepare_validate_chunks(ctx: BenchmarkContext) -> Callable[[], Any]:
+    step = -(-len(ctx.df) // 10)
+    chunks = [ctx.df.iloc[start:start + step] for start in range(0, len(ctx.df), step)]
+    
+    def validate() -> int:
+        validator = data_quality.DataValidator()
+        return sum(len(validator.validate(chunk).valid) for chunk in chunks)
+    
+    return validate
+
+
+def _prepare_csv_tail(ctx: BenchmarkContext) -> Callable[[], Any]:
+    with open(ctx.csv_path, "rb") as source:
+        offset = len(source.readline())
+    return lambda: data_loader.read_csv_tail(str(ctx.csv_path), offset)
+
+
+def _prepare_list_partitions(ctx: BenchmarkContext) -> Callable[[], Any]:
+    root = ctx.partition_dir
+    return lambda: data_loader.list_partitions(str(root))
+
+
+def _prepare_render_chart(ctx: BenchmarkContext) -> Callable[[], Any]:
+    daily = ctx.daily
+    return lambda: visualizer.render_chart("perbandingan_indikator", daily)
+
+
+def _prepare_render_charts(ctx: BenchmarkContext) -> Callable[[], Any]:
+    jobs = _chart_jobs(ctx)
+    return lambda: visualizer.render_charts(jobs)
+
+
+def _scalar_categorize(
+    func: Callable[[float], str],
+    column: str
+) -> Callable[[BenchmarkContext], Callable[[], Any]]:
+    return lambda ctx: lambda: ctx.df[column].map(func)
+
+
+def _downsample(method: str) -> Callable[[BenchmarkContext], Callable[[], Any]]:
+    def prepare(ctx: BenchmarkContext) -> Callable[[], Any]:
+        series = ctx.daily[cfg.COLUMN_TEKANAN_DARAH]
+        n_out = max(len(series) // 10, 3)
+        return lambda: visualizer.downsample_series(series, n_out, method)
+    
+    return prepare
+
+
+def _plot(name: str, args: Callable[[BenchmarkContext], Tuple]) -> BenchmarkCase:
+    func = getattr(visualizer, name)
+    
+    def prepare(ctx: BenchmarkContext) -> Callable[[], Any]:
+        chart_args, save_path = args(ctx), ctx.path(f"{name}.png")
+        return lambda: func(*chart_args, save_path=save_path)
+    
+    return BenchmarkCase(f"visualizer.{name}", prepare)
+
+
+def _average_args(ctx: BenchmarkContext) -> Tuple:
+    return (ctx.stats.mean_tekanan, ctx.stats.mean_gula, ctx.stats.mean_kolesterol)
+
+
+def _chart_jobs(ctx: BenchmarkContext) -> List[visualizer.ChartJob]:
+    daily = (ctx.daily,)
+    args = {
+        "tren_tekanan_darah": daily,
+        "tren_gula_darah": daily,
+        "tren_kolesterol": daily,
+        "perbandingan_indikator": daily,
+        "kategori_risiko": (health_analyzer.get_risk_distribution(ctx.risk_df),),
+        "rata_rata_indikator": _average_args(ctx),
+        "pasien_risiko_tinggi": (ctx.top_patients,),
+    }
+    return [
+        visualizer.ChartJob(name, chart_args, ctx.path(f"{name}.png"))
+        for name, chart_args in args.items()
+    ]
+
+
+def _date_filter_bounds(ctx: BenchmarkContext) -> Tuple[str, str]:
+    """A one-month range in the middle of the dataset."""
+    middle = ctx.df[cfg.COLUMN_TANGGAL_PERIKSA].iloc[ctx.rows // 2]
+    start = middle.replace(day=1)
+    end = start + pd.offsets.MonthEnd(0)
+    return start.strftime(cfg.DATE_FORMAT), end.strftime(cfg.DATE_FORMAT)
+
+
+CASES: Tuple[BenchmarkCase, ...] = (
+    # health_analyzer
+    BenchmarkCase(
+        "health_analyzer.categorize_tekanan_darah",
+        _scalar_categorize(health_analyzer.categorize_tekanan_darah, cfg.COLUMN_TEKANAN_DARAH),
+        max_rows=10 ** 6,
+    ),
+    BenchmarkCase(
+        "health_analyzer.categorize_gula_darah",
+        _scalar_categorize(health_analyzer.categorize_gula_darah, cfg.COLUMN_GULA_DARAH),
+        max_rows=10 ** 6,
+    ),
+    BenchmarkCase(
+        "health_analyzer.categorize_kolesterol",
+        _scalar_categorize(health_analyzer.categorize_kolesterol, cfg.COLUMN_KOLESTEROL),
+        max_rows=10 ** 6,
+    ),
+    BenchmarkCase(
+        "health_analyzer.categorize_values",
+        lambda ctx: lambda: health_analyzer.categorize_values(
+            ctx.df[cfg.COLUMN_TEKANAN_DARAH],
+            *cfg.INDICATOR_THRESHOLDS[cfg.COLUMN_TEKANAN_DARAH],
+        ),
+    ),
+    BenchmarkCase(
+        "health_analyzer.compute_risk_codes",
+        lambda ctx: lambda: health_analyzer.compute_risk_codes(ctx.df),
+    ),
+    BenchmarkCase("health_analyzer.codes_to_categorical", _prepare_codes_to_categorical),
+    BenchmarkCase(
+        "health_analyzer.categorize_indicators",
+        lambda ctx: lambda: health_analyzer.categorize_indicators(ctx.df),
+    ),
+    BenchmarkCase(
+        "health_analyzer.add_risk_categories",
+        lambda ctx: lambda: health_analyzer.add_risk_categories(ctx.df),
+    ),
+    BenchmarkCase("health_analyzer.calculate_final_risk_category", _prepare_final_risk),
+    BenchmarkCase(
+        "health_analyzer.compute_risk_pipeline",
+        lambda ctx: lambda: health_analyzer.compute_risk_pipeline(ctx.df),
+    ),
+    BenchmarkCase(
+        "health_analyzer.calculate_statistics",
+        lambda ctx: lambda: health_analyzer.calculate_statistics(ctx.df),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_patient_summary",
+        lambda ctx: lambda: health_analyzer.get_patient_summary(ctx.df),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_all_statistics",
+        lambda ctx: lambda: health_analyzer.get_all_statistics(ctx.df),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_all_statistics[sketch]",
+        lambda ctx: lambda: health_analyzer.get_all_statistics(ctx.df, approximate=True),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_daily_averages",
+        lambda ctx: lambda: health_analyzer.get_daily_averages(ctx.df),
+    ),
+    *(
+        BenchmarkCase(
+            f"health_analyzer.get_period_averages[{freq}]",
+            lambda ctx, freq=freq: lambda: health_analyzer.get_period_averages(ctx.df, freq),
+        )
+        for freq in ("W", "M")
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_risk_distribution",
+        lambda ctx: lambda: health_analyzer.get_risk_distribution(ctx.risk_df),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_indicator_counts",
+        lambda ctx: lambda: health_analyzer.get_indicator_counts(ctx.risk_df, cfg.CAT_TEKANAN),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_patient_means",
+        lambda ctx: lambda: health_analyzer.get_patient_means(ctx.df),
+    ),
+    BenchmarkCase("health_analyzer.compute_risk_score", _prepare_risk_score),
+    BenchmarkCase("health_analyzer.select_top_patients", _prepare_select_top),
+    BenchmarkCase(
+        "health_analyzer.get_top_risk_patients",
+        lambda ctx: lambda: health_analyzer.get_top_risk_patients(ctx.df),
+    ),
+    BenchmarkCase("health_analyzer.get_patient_features", _prepare_patient_features),
+    # time_series
+    BenchmarkCase(
+        "time_series.get_trend_engine",
+        lambda ctx: lambda: time_series.get_trend_engine(ctx.df),
+    ),
+    BenchmarkCase("time_series.TrendEngine.resample[W]", _prepare_trend_resample),
+    BenchmarkCase("time_series.TrendEngine.rolling[30]", _prepare_trend_rolling),
+    BenchmarkCase("time_series.TrendEngine.update[hari terakhir]", _prepare_trend_update),
+    # cohort_cube
+    BenchmarkCase(
+        "cohort_cube.get_aggregate_cube",
+        lambda ctx: lambda: cohort_cube.get_aggregate_cube(ctx.df),
+    ),
+    BenchmarkCase("cohort_cube.AggregateCube.statistics[kohort]", _prepare_cube_rollup),
+    BenchmarkCase("cohort_cube.AggregateCube.update[hari terakhir]", _prepare_cube_update),
+    # quantile_sketch
+    BenchmarkCase(
+        "quantile_sketch.KLLSketch.update",
+        lambda ctx: lambda: quantile_sketch.KLLSketch(seed=0).update(
+            ctx.df[cfg.COLUMN_TEKANAN_DARAH].to_numpy()
+        ),
+    ),
+    BenchmarkCase("quantile_sketch.KLLSketch.merge[10]", _prepare_sketch_merge),
+    # data_loader
+    BenchmarkCase(
+        "data_loader.load_data_patients[csv]",
+        lambda ctx: lambda: data_loader.load_data_patients(str(ctx.csv_path)),
+        reset=_drop_sidecar,
+    ),
+    BenchmarkCase(
+        "data_loader.load_data_patients[sidecar]", _prepare_load, reset=_drop_dataset_cache
+    ),
+    BenchmarkCase("data_loader.load_data_patients[cached]", _prepare_load),
+    BenchmarkCase(
+        "data_loader.rebuild_sidecar_cache",
+        lambda ctx: lambda: data_loader.rebuild_sidecar_cache(str(ctx.csv_path)),
+    ),
+    BenchmarkCase(
+        "data_loader.get_date_index", _prepare_date_index, reset=_drop_dataset_cache
+    ),
+    BenchmarkCase("data_loader.load_data_with_date_filter", _prepare_date_filter),
+    BenchmarkCase(
+        "data_loader.get_patient_index", _prepare_patient_index, reset=_drop_dataset_cache
+    ),
+    BenchmarkCase("data_loader.PatientIndex.history[1000]", _prepare_history_lookups),
+    BenchmarkCase(
+        "data_loader.iter_data_chunks",
+        lambda ctx: lambda: sum(
+            len(chunk) for chunk in data_loader.iter_data_chunks(
+                str(ctx.csv_path), chunksize=max(ctx.rows // 10, 1)
+            )
+        ),
+    ),
+    BenchmarkCase("data_loader.read_csv_tail", _prepare_csv_tail),
+    BenchmarkCase(
+        "data_loader.get_memory_footprint",
+        lambda ctx: lambda: data_loader.get_memory_footprint(ctx.df),
+    ),
+    BenchmarkCase(
+        "data_loader.get_unique_patients_count",
+        lambda ctx: lambda: data_loader.get_unique_patients_count(ctx.df),
+    ),
+    BenchmarkCase(
+        "data_loader.write_partitioned_dataset",
+        lambda ctx: lambda: data_loader.write_partitioned_dataset(
+            ctx.df, str(ctx.path("partitions_bench"))
+        ),
+        reset=_drop_path("partitions_bench"),
+    ),
+    BenchmarkCase("data_loader.list_partitions", _prepare_list_partitions),
+    # data_quality (validation overhead per load or chunk)
+    BenchmarkCase(
+        "data_quality.validate_patient_data",
+        lambda ctx: lambda: data_quality.validate_patient_data(ctx.df),
+    ),
+    BenchmarkCase("data_quality.validate_patient_data[teks]", _validate_text()),
+    BenchmarkCase(
+        "data_quality.validate_patient_data[teks, 1% rusak]", _validate_text(bad_every=100)
+    ),
+    BenchmarkCase("data_quality.DataValidator.validate[10 potongan]", _prepare_validate_chunks),
+    # sqlite_backend (aggregations pushed down to SQL)
+    BenchmarkCase(
+        "sqlite_backend.import_csv",
+        lambda ctx: lambda: sqlite_backend.import_csv(
+            str(ctx.csv_path), str(ctx.path("import.db"))
+        ),
+    ),
+    BenchmarkCase(
+        "data_loader.load_data_with_date_filter[sqlite]", _prepare_sqlite_date_filter
+    ),
+    BenchmarkCase("sqlite_backend.SQLiteStore.history[100]", _prepare_sqlite_history),
+    BenchmarkCase("sqlite_backend.SQLiteStore.statistics", _sqlite_query("statistics")),
+    BenchmarkCase("sqlite_backend.SQLiteStore.describe", _sqlite_query("describe")),
+    BenchmarkCase(
+        "sqlite_backend.SQLiteStore.risk_distribution", _sqlite_query("risk_distribution")
+    ),
+    BenchmarkCase(
+        "sqlite_backend.SQLiteStore.period_averages[D]", _sqlite_query("period_averages", "D")
+    ),
+    BenchmarkCase(
+        "sqlite_backend.SQLiteStore.top_risk_patients", _sqlite_query("top_risk_patients")
+    ),
+    # column_store (health_analyzer on memory-mapped arrays)
+    BenchmarkCase(
+        "column_store.build_column_store",
+        lambda ctx: lambda: column_store.build_column_store(
+            str(ctx.csv_path), str(ctx.path("build.columns"))
+        ),
+    ),
+    BenchmarkCase(
+        "health_analyzer.calculate_statistics[column_store]",
+        _on_column_store(health_analyzer.calculate_statistics),
+    ),
+    BenchmarkCase(
+        "health_analyzer.get_patient_summary[column_store]",
+        _on_column_store(health_analyzer.get_patient_summary),
+    ),
+    BenchmarkCase(
+        "health_analyzer.compute_risk_codes[column_store]",
+        _on_column_store(health_analyzer.compute_risk_codes),
+    ),
+    *(
+        BenchmarkCase(
+            f"health_analyzer.get_period_averages[column_store {freq}]",
+            _on_column_store(health_analyzer.get_period_averages, freq),
+        )
+        for freq in cfg.TREND_FREQUENCIES
+    ),
+    # visualizer (off-screen, saved to scratch files)
+    _plot("plot_blood_pressure_trend", lambda ctx: (ctx.daily,)),
+    _plot("plot_blood_sugar_trend", lambda ctx: (ctx.daily,)),
+    _plot("plot_cholesterol_trend", lambda ctx: (ctx.daily,)),
+    _plot("plot_comparison", lambda ctx: (ctx.daily,)),
+    _plot(
+        "plot_risk_categories",
+        lambda ctx: (health_analyzer.get_risk_distribution(ctx.risk_df),),
+    ),
+    _plot("plot_average_indicators", _average_args),
+    _plot("plot_high_risk_patients", lambda ctx: (ctx.top_patients,)),
+    *(
+        BenchmarkCase(f"visualizer.downsample_series[{method}]", _downsample(method))
+        for method in ("lttb", "minmax")
+    ),
+    BenchmarkCase("visualizer.render_chart", _prepare_render_chart),
+    BenchmarkCase("visualizer.render_charts", _prepare_render_charts),
+)
+
+
+def find_uncovered_functions() -> List[str]:
+    """
+    List public functions of the benchmarked modules without a case.
+    
+    Returns:
+        List[str]: ``module.function`` names neither benchmarked nor
+        listed in ``NOT_BENCHMARKED``.
+    """
+    covered = {case.name.split("[")[0] for case in CASES} | set(NOT_BENCHMARKED)
+    return [
+        f"{module.__name__}.{name}"
+        for module in BENCHMARK_MODULES
+        for name, func in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith("_")
+        and func.__module__ == module.__name__
+        and f"{module.__name__}.{name}" not in covered
+    ]
+
+
+def _reset(case: BenchmarkCase, ctx: BenchmarkContext) -> None:
+    # Memoized analysis results would turn every repeat into a cache hit
+    health_analyzer.clear_analysis_cache()
+    if case.reset is not None:
+        case.reset(ctx)
+
+
+def run_case(case: BenchmarkCase, ctx: BenchmarkContext, repeat: int) -> BenchmarkResult:
+    """
+    Time a case ``repeat`` times, then measure its peak memory once.
+    
+    Peak memory is the tracemalloc peak of one extra call, i.e. Python
+    and NumPy allocations; Arrow buffers are not included. It is
+    measured separately because tracing slows the call down.
+    
+    Args:
+        case: Case to run.
+        ctx: Inputs for the dataset size.
+        repeat: Number of timed calls.
+        
+    Returns:
+        BenchmarkResult: Timings and peak memory.
+    """
+    call = case.prepare(ctx)
+    timings = []
+    for _ in range(repeat):
+        _reset(case, ctx)
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    
+    _reset(case, ctx)
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return BenchmarkResult(
+        case=case.name,
+        rows=ctx.rows,
+        repeat=repeat,
+        min_s=min(timings),
+        median_s=statistics.median(timings),
+        peak_bytes=peak,
+    )
+
+
+def ensure_dataset(rows: int, seed: int, data_dir: Path) -> Path:
+    """
+    Get the synthetic CSV for a size, generating it on first use.
+    
+    Args:
+        rows: Number of rows.
+        seed: Generator seed.
+        data_dir: Directory holding the generated datasets.
+        
+    Returns:
+        Path: Path of the CSV file.
+    """
+    path = data_dir / f"synthetic_{rows}_{seed}_v{GENERATOR_VERSION}.csv"
+    if not path.exists():
+        write_patient_csv(path, rows, seed)
+    return path
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    patterns: Sequence[str] = ("*",),
+    repeat: int = 3,
+    seed: int = 0,
+    results_dir: Path = RESULTS_DIR
+) -> List[BenchmarkResult]:
+    """
+    Run the selected cases at every dataset size.
+    
+    Args:
+        sizes: Dataset sizes in rows.
+        patterns: Glob patterns selecting cases by name.
+        repeat: Number of timed calls per case.
+        seed: Generator seed.
+        results_dir: Directory for generated data and scratch files.
+        
+    Returns:
+        List[BenchmarkResult]: One result per case and size.
+    """
+    cases = [
+        case for case in CASES
+        if any(fnmatch.fnmatch(case.name, pattern) for pattern in patterns)
+    ]
+    results = []
+    print(f"{'Kasus':<46}{'Baris':>12}{'Median':>15}{'Puncak':>14}")
+    for rows in sizes:
+        csv_path = ensure_dataset(rows, seed, results_dir / "data")
+        work_dir = results_dir / "scratch" / str(rows)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        work_dir.mkdir(parents=True)
+        data_loader.clear_cache()
+        ctx = BenchmarkContext(rows, csv_path, work_dir)
+        for case in cases:
+            if case.max_rows is not None and rows > case.max_rows:
+                continue
+            result = run_case(case, ctx, repeat)
+            results.append(result)
+            print(
+                f"{result.case:<46}{rows:>12,}{result.median_s * 1000:>12.2f} ms"
+                f"{result.peak_bytes / 1024 ** 2:>10.1f} MiB"
+            )
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def save_results(results: List[BenchmarkResult], path: Path) -> Path:
+    """
+    Store results with the environment they were measured in.
+    
+    Args:
+        results: Benchmark results.
+        path: Target JSON file.
+        
+    Returns:
+        Path: The written file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(payload, output, indent=2)
+    return path
+
+
+def load_results(path: Path) -> List[BenchmarkResult]:
+    """
+    Load results written by ``save_results``.
+    
+    Args:
+        path: JSON file.
+        
+    Returns:
+        List[BenchmarkResult]: Stored results.
+    """
+    with open(path, encoding="utf-8") as source:
+        return [BenchmarkResult(**result) for result in json.load(source)["results"]]
+
+
+def compare_results(
+    current: List[BenchmarkResult],
+    baseline: List[BenchmarkResult],
+    tolerance: float = 0.25
+) -> List[str]:
+    """
+    Compare median times and peak memory against a baseline.
+    
+    Args:
+        current: Results of this run.
+        baseline: Stored baseline results.
+        tolerance: Allowed relative slowdown or memory growth.
+        
+    Returns:
+        List[str]: Regressions beyond the tolerance.
+    """
+    reference: Dict[Tuple[str, int], BenchmarkResult] = {
+        (result.case, result.rows): result for result in baseline
+    }
+    regressions = []
+    print(f"\n{'Kasus':<46}{'Baris':>12}{'Waktu':>10}{'Memori':>10}")
+    for result in current:
+        base = reference.get((result.case, result.rows))
+        if base is None:
+            continue
+        time_ratio = result.median_s / base.median_s if base.median_s else 1.0
+        memory_ratio = result.peak_bytes / base.peak_bytes if base.peak_bytes else 1.0
+        print(f"{result.case:<46}{result.rows:>12,}{time_ratio:>9.2f}x{memory_ratio:>9.2f}x")
+        if time_ratio > 1 + tolerance:
+            regressions.append(f"{result.case} @ {result.rows:,}: waktu {time_ratio:.2f}x")
+        if memory_ratio > 1 + tolerance:
+            regressions.append(f"{result.case} @ {result.rows:,}: memori {memory_ratio:.2f}x")
+    return regressions
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark fungsi analisis data pasien")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=lambda s: int(float(s)),
+        default=list(DEFAULT_SIZES),
+        help="Ukuran dataset dalam baris, misalnya 1e3 1e6 1e8",
+    )
+    parser.add_argument(
+        "--cases", nargs="+", default=["*"], help="Pola nama kasus, misalnya 'data_loader.*'"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah pengukuran per kasus")
+    parser.add_argument("--seed", type=int, default=0, help="Seed data sintetis")
+    parser.add_argument(
+        "--results-dir", type=Path, default=RESULTS_DIR, help="Folder data dan hasil benchmark"
+    )
+    parser.add_argument("--save", type=Path, help="Simpan hasil ke file JSON ini")
+    parser.add_argument("--baseline", type=Path, help="Bandingkan dengan hasil JSON ini")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Batas kenaikan relatif waktu/memori terhadap baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the benchmark suite from the command line.
+    
+    Returns:
+        int: 0 on success, 1 on regressions against the baseline.
+    """
+    args = parse_args(argv)
+    for name in find_uncovered_functions():
+        print(f"Peringatan: {name} belum memiliki kasus benchmark")
+    
+    results = run_benchmarks(args.sizes, args.cases, args.repeat, args.seed, args.results_dir)
+    save_path = args.save or args.results_dir / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    print(f"\nHasil disimpan ke: {save_results(results, save_path)}")
+    
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+        if regressions:
+            print("\nREGRESI:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
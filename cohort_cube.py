@@ -0,0 +1,461 @@
+"""
+Aggregate cube for cohort slicing.
+Pre-aggregates patient exams into cells keyed by exam month, gender, age
+band and final risk category. Each cell holds the exam count, the count,
+sum and sum of squares of every health indicator and the indicator
+category counts, so means, standard deviations and category counts of
+any slice or roll-up are computed from the cells instead of the rows.
+
+Cubes are additive: they can be merged, updated with new exams and
+saved to / loaded from an Arrow IPC file.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import config as cfg
+from health_analyzer import HealthStatistics, compute_risk_codes, memoize_by_dataset
+from instrumentation import instrument
+
+_META_AGE_BANDS = b"age_band_edges"
+
+# HealthStatistics field suffix of each indicator
+_STAT_NAMES = {
+    cfg.COLUMN_TEKANAN_DARAH: "tekanan",
+    cfg.COLUMN_GULA_DARAH: "gula",
+    cfg.COLUMN_KOLESTEROL: "kolesterol",
+}
+
+
+def age_band_labels(edges: Sequence[int] = cfg.AGE_BAND_EDGES) -> List[str]:
+    """
+    Labels of the age bands, e.g. ``["0-17", ..., "70+"]``.
+    
+    Args:
+        edges: Ascending lower bounds of the bands in years.
+        
+    Returns:
+        List[str]: One label per band.
+    """
+    labels = [f"{low}-{high - 1}" for low, high in zip(edges[:-1], edges[1:])]
+    return labels + [f"{edges[-1]}+"]
+
+
+def _measure_columns() -> List[str]:
+    """Names of the additive columns of a cell, after the dimensions."""
+    columns = [cfg.COLUMN_JUMLAH_PEMERIKSAAN]
+    for column in cfg.HEALTH_COLUMNS:
+        columns += [f"{column}_n", f"{column}_sum", f"{column}_sumsq"]
+    for column in cfg.HEALTH_COLUMNS:
+        category_column = cfg.INDICATOR_CATEGORY_COLUMNS[column]
+        columns += [f"{category_column}:{level}" for level in cfg.RISK_LEVELS]
+    return columns
+
+
+MEASURES = tuple(_measure_columns())
+
+
+def _empty_cells() -> pd.DataFrame:
+    cells = pd.DataFrame({
+        cfg.COLUMN_BULAN: pd.Series(dtype="datetime64[ns]"),
+        cfg.COLUMN_JENIS_KELAMIN: pd.Series(dtype=object),
+        cfg.COLUMN_KELOMPOK_UMUR: pd.Series(dtype=object),
+        cfg.CAT_AKHIR: pd.Series(dtype=object),
+    })
+    for column in MEASURES:
+        is_sum = column.endswith(("_sum", "_sumsq"))
+        cells[column] = pd.Series(dtype=np.float64 if is_sum else np.int64)
+    return cells
+
+
+def _cells_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate exam rows into cube cells.
+    
+    Every row gets one integer key from its month, gender, age band and
+    risk codes; each measure is then a single ``np.bincount`` over the
+    dense key space (months x genders x age bands x risk levels, each
+    with a slot for missing values), and only non-empty cells are kept.
+    """
+    if not len(df):
+        return _empty_cells()
+    n_levels = len(cfg.RISK_LEVELS)
+    
+    months = df[cfg.COLUMN_TANGGAL_PERIKSA].to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    dated = ~np.isnat(months)
+    month_numbers = months.astype(np.int64)
+    first_month = int(month_numbers[dated].min()) if dated.any() else 0
+    n_months = int(month_numbers[dated].max()) - first_month + 1 if dated.any() else 0
+    month_codes = np.where(dated, month_numbers - first_month, n_months)
+    
+    gender_codes, genders = pd.factorize(df[cfg.COLUMN_JENIS_KELAMIN])
+    genders = np.asarray(genders, dtype=object)
+    gender_codes = np.where(gender_codes < 0, len(genders), gender_codes)
+    
+    edges = np.asarray(cfg.AGE_BAND_EDGES)
+    ages = df[cfg.COLUMN_UMUR].to_numpy(dtype=np.float64, na_value=np.nan)
+    band_codes = np.searchsorted(edges, ages, side="right") - 1
+    band_codes[np.isnan(ages) | (band_codes < 0)] = len(edges)
+    
+    risk_codes = compute_risk_codes(df)
+    final_codes = np.maximum(risk_codes.max(axis=1), cfg.RISK_CODE_NORMAL)
+    
+    shape = (n_months + 1, len(genders) + 1, len(edges) + 1, n_levels)
+    keys = np.ravel_multi_index((month_codes, gender_codes, band_codes, final_codes), shape)
+    size = int(np.prod(shape))
+    
+    values = df[cfg.HEALTH_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    measures: Dict[str, np.ndarray] = {
+        cfg.COLUMN_JUMLAH_PEMERIKSAAN: np.bincount(keys, minlength=size),
+    }
+    for i, column in enumerate(cfg.HEALTH_COLUMNS):
+        measures[f"{column}_n"] = np.bincount(keys, present[:, i], size).astype(np.int64)
+        measures[f"{column}_sum"] = np.bincount(keys, filled[:, i], size)
+        measures[f"{column}_sumsq"] = np.bincount(keys, filled[:, i] ** 2, size)
+    for i, column in enumerate(cfg.HEALTH_COLUMNS):
+        category_column = cfg.INDICATOR_CATEGORY_COLUMNS[column]
+        counts = np.bincount(
+            keys * n_levels + risk_codes[:, i], minlength=size * n_levels
+        ).reshape(size, n_levels)
+        for level_code, level in enumerate(cfg.RISK_LEVELS):
+            measures[f"{category_column}:{level}"] = counts[:, level_code]
+    
+    occupied = np.flatnonzero(measures[cfg.COLUMN_JUMLAH_PEMERIKSAAN])
+    month, gender, band, risk = np.unravel_index(occupied, shape)
+    month_values = np.where(
+        month < n_months, (first_month + month).astype("datetime64[M]"), np.datetime64("NaT", "M")
+    )
+    cells = pd.DataFrame({
+        cfg.COLUMN_BULAN: month_values.astype("datetime64[ns]"),
+        cfg.COLUMN_JENIS_KELAMIN: np.append(genders, None)[gender],
+        cfg.COLUMN_KELOMPOK_UMUR: np.array(age_band_labels() + [None], dtype=object)[band],
+        cfg.CAT_AKHIR: np.array(cfg.RISK_LEVELS, dtype=object)[risk],
+    })
+    for column in MEASURES:
+        cells[column] = measures[column][occupied]
+    # Same cell order as a merge (genders are numbered by first appearance)
+    return cells.sort_values(list(cfg.CUBE_DIMENSIONS), ignore_index=True)
+
+
+def _month_start(value: Any) -> pd.Timestamp:
+    """First day of the month of a date or a "YYYY-MM" string."""
+    return pd.Timestamp(value).to_period("M").start_time
+
+
+class AggregateCube:
+    """
+    Exam aggregates per (month, gender, age band, final risk category) cell.
+    
+    Results mirror ``calculate_statistics``, ``get_risk_distribution``
+    and ``get_indicator_counts`` and can be grouped by any of
+    ``cfg.CUBE_DIMENSIONS``; their cost depends on the number of cells,
+    not on the number of exams. Cells with a missing month, gender or
+    age keep that dimension as missing.
+    """
+    
+    def __init__(self, cells: Optional[pd.DataFrame] = None) -> None:
+        self.cells = _empty_cells() if cells is None else cells
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "AggregateCube":
+        """
+        Build a cube from patient data in one pass.
+        
+        Args:
+            df: Patient DataFrame.
+            
+        Returns:
+            AggregateCube: Cube of every exam in ``df``.
+        """
+        return cls(_cells_from_frame(df))
+    
+    def __len__(self) -> int:
+        """Number of non-empty cells."""
+        return len(self.cells)
+    
+    @property
+    def total_examinations(self) -> int:
+        """Number of exams aggregated into the cube."""
+        return int(self.cells[cfg.COLUMN_JUMLAH_PEMERIKSAAN].sum())
+    
+    @instrument
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Add new exam rows.
+        
+        Args:
+            df: Patient DataFrame with the new exams.
+        """
+        self.merge(AggregateCube.from_frame(df))
+    
+    def merge(self, other: "AggregateCube") -> None:
+        """
+        Merge another cube (e.g. from another chunk or worker) into this one.
+        
+        Args:
+            other: Cube to merge.
+        """
+        if not len(other):
+            return
+        if not len(self):
+            self.cells = other.cells.copy()
+            return
+        self.cells = (
+            pd.concat([self.cells, other.cells], ignore_index=True)
+            .groupby(list(cfg.CUBE_DIMENSIONS), dropna=False, sort=True)[list(MEASURES)]
+            .sum()
+            .reset_index()
+        )
+    
+    def select(self, **criteria: Any) -> "AggregateCube":
+        """
+        Keep the cells matching every criterion.
+        
+        Each keyword is a dimension of ``cfg.CUBE_DIMENSIONS`` and its
+        value a label, a list of labels or, for ``bulan``, a ``slice``
+        of months (bounds inclusive). Months may be given as dates or
+        "YYYY-MM" strings, e.g.
+        ``cube.select(jenis_kelamin="P", bulan=slice("2024-01", "2024-06"))``.
+        
+        Returns:
+            AggregateCube: Cube of the matching cells.
+            
+        Raises:
+            ValueError: If a keyword is not a dimension, or a slice is
+                given for another dimension than ``bulan``.
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dimension, value in criteria.items():
+            if dimension not in cfg.CUBE_DIMENSIONS:
+                raise ValueError(
+                    f"Unknown dimension {dimension!r}, expected one of {list(cfg.CUBE_DIMENSIONS)}"
+                )
+            column = self.cells[dimension]
+            is_month = dimension == cfg.COLUMN_BULAN
+            if isinstance(value, slice):
+                if not is_month:
+                    raise ValueError(f"Ranges are only supported for {cfg.COLUMN_BULAN!r}")
+                if value.start is not None:
+                    mask &= (column >= _month_start(value.start)).to_numpy()
+                if value.stop is not None:
+                    mask &= (column <= _month_start(value.stop)).to_numpy()
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            if is_month:
+                values = [_month_start(v) for v in values]
+            mask &= column.isin(values).to_numpy()
+        return AggregateCube(self.cells.loc[mask].reset_index(drop=True))
+    
+    def rollup(self, by: Sequence[str] = ()) -> pd.DataFrame:
+        """
+        Sum the cell measures per group.
+        
+        Args:
+            by: Dimensions to group by; empty for the grand total.
+            
+        Returns:
+            pd.DataFrame: Measures (``MEASURES``) per group, indexed by
+            ``by`` with age bands and risk categories in their natural
+            order; a single row labelled "total" when ``by`` is empty.
+            
+        Raises:
+            ValueError: If ``by`` contains an unknown dimension.
+        """
+        by = list(by)
+        unknown = set(by) - set(cfg.CUBE_DIMENSIONS)
+        if unknown:
+            raise ValueError(
+                f"Unknown dimensions {sorted(unknown)}, expected some of {list(cfg.CUBE_DIMENSIONS)}"
+            )
+        if not by:
+            return self.cells[list(MEASURES)].sum().to_frame("total").T
+        
+        keys = self.cells[by].copy()
+        ordered = {
+            cfg.COLUMN_KELOMPOK_UMUR: age_band_labels(),
+            cfg.CAT_AKHIR: list(cfg.RISK_LEVELS),
+        }
+        for dimension, labels in ordered.items():
+            if dimension in keys:
+                keys[dimension] = pd.Categorical(keys[dimension], categories=labels, ordered=True)
+        measures = self.cells[list(MEASURES)]
+        return measures.groupby(
+            [keys[dimension] for dimension in by], dropna=False, observed=True, sort=True
+        ).sum()
+    
+    def statistics(self, by: Sequence[str] = ()) -> Union[HealthStatistics, pd.DataFrame]:
+        """
+        Indicator means and sample standard deviations.
+        
+        Args:
+            by: Dimensions to group by.
+            
+        Returns:
+            HealthStatistics like ``calculate_statistics`` when ``by`` is
+            empty, otherwise a DataFrame with the same fields as columns
+            and one row per group.
+        """
+        sums = self.rollup(by)
+        columns = {}
+        for column, name in _STAT_NAMES.items():
+            n = sums[f"{column}_n"].to_numpy(dtype=np.float64)
+            total = sums[f"{column}_sum"].to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = total / n
+                variance = (sums[f"{column}_sumsq"].to_numpy() - total * mean) / (n - 1)
+            columns[f"mean_{name}"] = mean
+            columns[f"std_{name}"] = np.where(n >= 2, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+        stats = pd.DataFrame(columns, index=sums.index)[list(HealthStatistics.__dataclass_fields__)]
+        if not by:
+            return HealthStatistics(**{name: float(value) for name, value in stats.iloc[0].items()})
+        return stats
+    
+    def indicator_counts(
+        self,
+        category_column: str,
+        by: Sequence[str] = ()
+    ) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Exam counts per category of one indicator (or of the final category).
+        
+        Args:
+            category_column: A value of ``cfg.INDICATOR_CATEGORY_COLUMNS``
+                or ``cfg.CAT_AKHIR``.
+            by: Dimensions to group by.
+            
+        Returns:
+            Counts in the same shape as ``get_indicator_counts`` when
+            ``by`` is empty, otherwise a DataFrame with one column per
+            risk level and one row per group.
+            
+        Raises:
+            ValueError: If ``category_column`` is unknown.
+        """
+        by = list(by)
+        levels = list(cfg.RISK_LEVELS)
+        if category_column == cfg.CAT_AKHIR and cfg.CAT_AKHIR in by:
+            # Each group holds exams of a single final category
+            totals = self.rollup(by)[cfg.COLUMN_JUMLAH_PEMERIKSAAN]
+            group_levels = totals.index.get_level_values(cfg.CAT_AKHIR)
+            counts = pd.DataFrame(
+                {level: np.where(group_levels == level, totals, 0) for level in levels},
+                index=totals.index,
+            )
+        elif category_column == cfg.CAT_AKHIR:
+            counts = self.rollup([*by, cfg.CAT_AKHIR])[cfg.COLUMN_JUMLAH_PEMERIKSAAN]
+            if by:
+                counts = counts.unstack(cfg.CAT_AKHIR, fill_value=0)
+            else:
+                counts = counts.to_frame().T
+            counts = counts.reindex(columns=levels, fill_value=0)
+        elif category_column in cfg.INDICATOR_CATEGORY_COLUMNS.values():
+            counts = self.rollup(by)[[f"{category_column}:{level}" for level in levels]]
+            counts.columns = levels
+        else:
+            raise ValueError(f"Unknown category column {category_column!r}")
+        counts = counts.astype(np.int64)
+        counts.columns = pd.CategoricalIndex(
+            levels, categories=levels, ordered=True, name=category_column
+        )
+        if by:
+            return counts
+        
+        totals = counts.iloc[0]
+        return totals[totals.to_numpy() > 0].rename(cfg.COLUMN_ID_PASIEN)
+    
+    def risk_distribution(self, by: Sequence[str] = ()) -> Union[pd.Series, pd.DataFrame]:
+        """Final risk category counts, like ``get_risk_distribution`` (see ``indicator_counts``)."""
+        return self.indicator_counts(cfg.CAT_AKHIR, by)
+    
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Write the cube to an Arrow IPC file, replacing it atomically.
+        
+        Args:
+            path: Destination file.
+            
+        Returns:
+            Path: The written file.
+            
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        path = Path(path)
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _META_AGE_BANDS: json.dumps(list(cfg.AGE_BAND_EDGES)),
+        })
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with pa.OSFile(str(temp_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return path
+    
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "AggregateCube":
+        """
+        Read a cube written by ``save``.
+        
+        Args:
+            path: Cube file.
+            
+        Returns:
+            AggregateCube: The loaded cube.
+            
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a cube or was built with other
+                age bands than ``cfg.AGE_BAND_EDGES``.
+        """
+        try:
+            with pa.memory_map(str(path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+        except pa.ArrowInvalid as e:
+            raise ValueError(f"{path} is not an aggregate cube file: {e}") from e
+        
+        metadata = table.schema.metadata or {}
+        if _META_AGE_BANDS not in metadata:
+            raise ValueError(f"{path} is not an aggregate cube file")
+        edges = tuple(json.loads(metadata[_META_AGE_BANDS]))
+        if edges != tuple(cfg.AGE_BAND_EDGES):
+            raise ValueError(
+                f"{path} was built with age bands {list(edges)}, "
+                f"expected {list(cfg.AGE_BAND_EDGES)}"
+            )
+        cells = table.to_pandas()
+        missing = set(cfg.CUBE_DIMENSIONS) | set(MEASURES)
+        missing -= set(cells.columns)
+        if missing:
+            raise ValueError(f"{path} is missing cube columns {sorted(missing)}")
+        return cls(cells)
+
+
+@instrument
+@memoize_by_dataset
+def get_aggregate_cube(df: pd.DataFrame) -> AggregateCube:
+    """
+    Get the aggregate cube of a dataset, built once per DataFrame.
+    
+    The cube is shared between callers; build one with
+    ``AggregateCube.from_frame`` to ``update`` it with new exams.
+    
+    Args:
+        df: Patient DataFrame.
+        
+    Returns:
+        AggregateCube: Cube of every exam in ``df``.
+    """
+    return AggregateCube.from_frame(df)
@@ -0,0 +1,267 @@
+"""
+Memory-mapped column store for the numeric patient data.
+Keeps ``umur``, the exam date and every health indicator as a raw typed
+array file, and ``id_pasien`` as int32 codes into a dictionary of the
+distinct ids. The files are opened with ``np.memmap``: opening a store
+reads no data, a computation only pages in the columns it touches, and
+worker processes that open the same store share those pages through the
+OS page cache instead of each holding a copy.
+
+``health_analyzer`` accepts a ``ColumnStore`` in place of a DataFrame in
+its numeric hot paths (statistics, categorization, daily and period
+averages).
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+from data_loader import DataLoadError, iter_data_chunks
+from data_quality import DataValidator
+from instrumentation import instrument
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+# Column -> dtype of its raw array file ("<column>.bin"); id_pasien holds
+# dictionary codes, -1 for a missing id
+COLUMN_FILE_DTYPES = {
+    cfg.COLUMN_ID_PASIEN: "int32",
+    cfg.COLUMN_UMUR: cfg.COLUMN_DTYPES[cfg.COLUMN_UMUR],
+    cfg.COLUMN_TANGGAL_PERIKSA: "datetime64[D]",
+    **{column: cfg.COLUMN_DTYPES[column] for column in cfg.HEALTH_COLUMNS},
+}
+_LABELS_FILE = f"{cfg.COLUMN_ID_PASIEN}.labels.npy"
+
+
+def get_column_store_path(file_path: Optional[str] = None) -> Path:
+    """
+    Get the default column store directory of a CSV file.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        Path: Store directory, e.g. ``data_pasien.csv.columns``.
+    """
+    path = Path(file_path) if file_path else cfg.DATA_FILE_PATH
+    return path.with_name(path.name + cfg.COLUMN_STORE_SUFFIX)
+
+
+@instrument
+def write_column_store(
+    chunks: Iterable[pd.DataFrame],
+    root: Union[str, Path]
+) -> "ColumnStore":
+    """
+    Write patient data chunks as a column store.
+    
+    Each chunk is appended to the array files, so memory use depends on
+    the chunk size and the number of distinct patient ids only. The
+    manifest is written last; an interrupted write leaves no store that
+    ``ColumnStore`` would open.
+    
+    Args:
+        chunks: Patient DataFrames with the schema dtypes (or one frame
+            in a list).
+        root: Store directory; existing store files are replaced.
+        
+    Returns:
+        ColumnStore: The written store, opened.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / MANIFEST_FILE).unlink(missing_ok=True)
+    
+    patient_codes: Dict[str, int] = {}
+    rows = 0
+    files = {column: open(root / f"{column}.bin", "wb") for column in COLUMN_FILE_DTYPES}
+    try:
+        for chunk in chunks:
+            codes, uniques = pd.factorize(chunk[cfg.COLUMN_ID_PASIEN])
+            # Chunk codes -> store codes; the appended -1 maps missing ids
+            mapping = np.array(
+                [patient_codes.setdefault(patient_id, len(patient_codes)) for patient_id in uniques]
+                + [-1],
+                dtype=np.int32,
+            )
+            files[cfg.COLUMN_ID_PASIEN].write(mapping[codes].tobytes())
+            for column, dtype in COLUMN_FILE_DTYPES.items():
+                if column != cfg.COLUMN_ID_PASIEN:
+                    files[column].write(chunk[column].to_numpy(dtype=dtype).tobytes())
+            rows += len(chunk)
+    finally:
+        for file in files.values():
+            file.close()
+    
+    np.save(root / _LABELS_FILE, np.array(list(patient_codes), dtype=str))
+    manifest = {"format": FORMAT_VERSION, "rows": rows, "columns": COLUMN_FILE_DTYPES}
+    (root / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return ColumnStore(root)
+
+
+@instrument
+def build_column_store(
+    file_path: Optional[str] = None,
+    root: Optional[str] = None,
+    chunksize: int = cfg.STREAM_CHUNK_SIZE
+) -> "ColumnStore":
+    """
+    Build the column store of a CSV file by streaming it in chunks.
+    
+    Args:
+        file_path: Optional path to the CSV file or partitioned dataset
+            directory. Defaults to DATA_FILE_PATH.
+        root: Optional store directory. Defaults to
+            ``get_column_store_path(file_path)``.
+        chunksize: Number of CSV rows parsed and written at a time.
+        
+    Returns:
+        ColumnStore: The written store, opened.
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+    """
+    target = Path(root) if root else get_column_store_path(file_path)
+    # The store holds the rows of a full load, without repeated exams
+    chunks = iter_data_chunks(file_path, chunksize, validator=DataValidator())
+    return write_column_store(chunks, target)
+
+
+def _open_rows(root: str, start: int, stop: int) -> "ColumnStore":
+    """Re-open a store (or a row range of it), e.g. in a worker process."""
+    return ColumnStore(root).slice(start, stop)
+
+
+class ColumnStore:
+    """
+    Read-only, memory-mapped view of a column store directory.
+    
+    Columns are NumPy memmaps (``id_pasien`` is returned as a
+    Categorical over the id dictionary), so column access and ``slice``
+    never copy data. A store pickles as its directory and row range:
+    passing it to worker processes re-opens the same files there instead
+    of sending the arrays.
+    
+    Args:
+        root: Store directory written by ``write_column_store``.
+        
+    Raises:
+        DataLoadError: If the directory holds no complete store.
+    """
+    
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        try:
+            manifest = json.loads((self.root / MANIFEST_FILE).read_text())
+        except FileNotFoundError:
+            raise DataLoadError(f"Column store not found: {self.root}")
+        if manifest.get("format") != FORMAT_VERSION:
+            raise DataLoadError(f"Unsupported column store format: {self.root}")
+        
+        rows = manifest["rows"]
+        self._arrays: Dict[str, np.ndarray] = {
+            column: (
+                np.memmap(self.root / f"{column}.bin", dtype=dtype, mode="r", shape=(rows,))
+                if rows else np.empty(0, dtype=dtype)
+            )
+            for column, dtype in manifest["columns"].items()
+        }
+        self.patient_labels: np.ndarray = np.load(self.root / _LABELS_FILE)
+        self._range = (0, rows)
+    
+    def __reduce__(self) -> Tuple:
+        return _open_rows, (str(self.root), *self._range)
+    
+    def __len__(self) -> int:
+        """Number of rows."""
+        return self._range[1] - self._range[0]
+    
+    def __getitem__(self, column: str) -> Union[np.ndarray, pd.Categorical]:
+        """
+        Get one column without copying it.
+        
+        Args:
+            column: Column name, see ``columns``.
+            
+        Returns:
+            The column's memmap, or a Categorical of patient ids for
+            ``id_pasien``.
+            
+        Raises:
+            KeyError: If the store has no such column.
+        """
+        if column == cfg.COLUMN_ID_PASIEN:
+            return pd.Categorical.from_codes(self.patient_codes, categories=self.patient_labels)
+        return self._arrays[column]
+    
+    @property
+    def columns(self) -> List[str]:
+        """Names of the stored columns."""
+        return list(self._arrays)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Number of rows and columns, like ``DataFrame.shape``."""
+        return len(self), len(self._arrays)
+    
+    @property
+    def index(self) -> pd.RangeIndex:
+        """Row positions in the whole store."""
+        return pd.RangeIndex(*self._range)
+    
+    @property
+    def patient_codes(self) -> np.ndarray:
+        """Dictionary codes of ``id_pasien`` (-1 for a missing id)."""
+        return self._arrays[cfg.COLUMN_ID_PASIEN]
+    
+    @property
+    def unique_patients(self) -> int:
+        """Number of distinct patient ids in these rows."""
+        codes = self.patient_codes
+        present = np.bincount(codes[codes >= 0], minlength=len(self.patient_labels))
+        return int(np.count_nonzero(present))
+    
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the mapped columns and the id dictionary."""
+        return sum(array.nbytes for array in self._arrays.values()) + self.patient_labels.nbytes
+    
+    def slice(self, start: int, stop: int) -> "ColumnStore":
+        """
+        Get rows ``start:stop`` as a store sharing the same memory maps.
+        
+        Args:
+            start: First row (0-based, relative to this store).
+            stop: Row after the last one.
+            
+        Returns:
+            ColumnStore: View of the row range.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        view = object.__new__(ColumnStore)
+        view.__dict__.update(self.__dict__)
+        view._arrays = {column: array[start:stop] for column, array in self._arrays.items()}
+        view._range = (self._range[0] + start, self._range[0] + stop)
+        return view
+    
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Copy columns into a DataFrame with the schema dtypes.
+        
+        Args:
+            columns: Columns to copy. Defaults to all.
+            
+        Returns:
+            pd.DataFrame: Patient data indexed by row position.
+        """
+        data = {}
+        for column in columns or self.columns:
+            values = self[column]
+            data[column] = pd.Series(values, index=self.index).astype(cfg.COLUMN_DTYPES[column])
+        return pd.DataFrame(data, index=self.index)
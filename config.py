@@ -9,6 +9,43 @@ from typing import Final
 # File Paths
 DATA_FILE_PATH: Final = Path("data_pasien.csv")
 
+# In-Process Dataset Cache (total bytes of loaded datasets kept in memory)
+DATASET_CACHE_MAX_BYTES: Final = 2 * 1024 ** 3
+
+# Binary Sidecar Cache (Arrow IPC file written next to the CSV)
+USE_SIDECAR_CACHE: Final = True
+SIDECAR_CACHE_SUFFIX: Final = ".arrow"
+HASH_CHUNK_SIZE: Final = 1024 * 1024
+
+# Partitioned Datasets (directory of <column>=<period>/*.csv partitions)
+PARTITION_FILE_PATTERN: Final = "*.csv"
+PARTITION_MAX_WORKERS: Final = 4
+
+# Memory-Mapped Column Store (directory next to the CSV with one raw array
+# file per numeric column, opened with np.memmap; see column_store.py)
+COLUMN_STORE_SUFFIX: Final = ".columns"
+
+# Streaming Analysis
+STREAM_CHUNK_SIZE: Final = 1_000_000
+
+# SQLite Storage Backend (indexed database imported from the CSV; data
+# paths with one of these suffixes are read through sqlite_backend.py)
+SQLITE_DB_PATH: Final = Path("data_pasien.db")
+SQLITE_TABLE: Final = "pemeriksaan"
+SQLITE_SUFFIXES: Final = (".db", ".sqlite", ".sqlite3")
+SQLITE_IMPORT_CHUNK_SIZE: Final = 200_000
+
+# HTTP Analysis Service (server.py)
+SERVER_HOST: Final = "127.0.0.1"
+SERVER_PORT: Final = 8000
+SERVER_WORKERS: Final = 4  # Threads running analyses and chart rendering
+SERVER_LATENCY_WINDOW: Final = 10_000  # Latest request durations kept per endpoint
+
+# Synthetic Data (benchmarks and load tests)
+SYNTHETIC_VISITS_PER_PATIENT: Final = 4
+SYNTHETIC_START_DATE: Final = "2024-01-01"
+SYNTHETIC_DATE_SPAN_DAYS: Final = 365
+
 # Column Names
 COLUMN_ID_PASIEN: Final = "id_pasien"
 COLUMN_NAMA: Final = "nama"
@@ -19,6 +56,19 @@ COLUMN_TEKANAN_DARAH: Final = "tekanan_darah"
 COLUMN_GULA_DARAH: Final = "gula_darah"
 COLUMN_KOLESTEROL: Final = "kolesterol"
 
+# Column Schema (dtype applied at parse time)
+DATE_FORMAT: Final = "%Y-%m-%d"
+COLUMN_DTYPES: Final = {
+    COLUMN_ID_PASIEN: "string[pyarrow]",
+    COLUMN_NAMA: "string[pyarrow]",
+    COLUMN_UMUR: "uint8",
+    COLUMN_JENIS_KELAMIN: "category",
+    COLUMN_TANGGAL_PERIKSA: "datetime64[ns]",
+    COLUMN_TEKANAN_DARAH: "int16",
+    COLUMN_GULA_DARAH: "int16",
+    COLUMN_KOLESTEROL: "int16",
+}
+
 # Health Indicator Columns
 HEALTH_COLUMNS: Final = [
     COLUMN_TEKANAN_DARAH,
@@ -49,11 +99,88 @@ CAT_GULA: Final = "kategori_gula"
 CAT_KOLESTEROL: Final = "kategori_kolesterol"
 CAT_AKHIR: Final = "kategori_akhir"
 
+# Composite Risk Score (per indicator: 0 at the Normal limit, 1 at the
+# Risiko Tinggi limit; averaged over the indicators)
+COLUMN_SKOR_RISIKO: Final = "skor_risiko"
+
+# Per-Patient Features (visits, exam dates, latest value and trend per
+# year of each indicator, e.g. tekanan_darah_terakhir, tren_tekanan_darah)
+COLUMN_JUMLAH_KUNJUNGAN: Final = "jumlah_kunjungan"
+COLUMN_PERIKSA_PERTAMA: Final = "periksa_pertama"
+COLUMN_PERIKSA_TERAKHIR: Final = "periksa_terakhir"
+FEATURE_LATEST_SUFFIX: Final = "_terakhir"
+FEATURE_TREND_PREFIX: Final = "tren_"
+
+# Ordinal Risk Codes (position in RISK_LEVELS, higher is worse)
+RISK_CODE_NORMAL: Final = 0
+RISK_CODE_PERLU_WASPADA: Final = 1
+RISK_CODE_RISIKO_TINGGI: Final = 2
+RISK_LEVELS: Final = (RISK_NORMAL, RISK_PERLU_WASPADA, RISK_RISIKO_TINGGI)
+
+# Indicator Thresholds: column -> (normal max, risiko tinggi max)
+INDICATOR_THRESHOLDS: Final = {
+    COLUMN_TEKANAN_DARAH: (TEKANAN_NORMAL_MAX, TEKANAN_RISIKO_TINGGI_MAX),
+    COLUMN_GULA_DARAH: (GULA_NORMAL_MAX, GULA_RISIKO_TINGGI_MAX),
+    COLUMN_KOLESTEROL: (KOLESTEROL_NORMAL_MAX, KOLESTEROL_RISIKO_TINGGI_MAX),
+}
+
+# Indicator Column -> Category Column
+INDICATOR_CATEGORY_COLUMNS: Final = {
+    COLUMN_TEKANAN_DARAH: CAT_TEKANAN,
+    COLUMN_GULA_DARAH: CAT_GULA,
+    COLUMN_KOLESTEROL: CAT_KOLESTEROL,
+}
+
+# Data Quality (see data_quality.py): rows failing a check are written to a
+# quarantine CSV next to the data file, with the failed checks as
+# "<column>:<reason>" codes in COLUMN_ALASAN, instead of failing the load
+QUARANTINE_SUFFIX: Final = ".quarantine.csv"
+COLUMN_ALASAN: Final = "alasan"
+COLUMN_BARIS: Final = "baris"
+REQUIRED_COLUMNS: Final = (COLUMN_ID_PASIEN, COLUMN_TANGGAL_PERIKSA, COLUMN_UMUR, *HEALTH_COLUMNS)
+VALID_RANGES: Final = {  # column -> plausible (min, max), inclusive
+    COLUMN_UMUR: (0, 120),
+    COLUMN_TEKANAN_DARAH: (40, 300),
+    COLUMN_GULA_DARAH: (10, 1000),
+    COLUMN_KOLESTEROL: (50, 1000),
+}
+REASON_KOSONG: Final = "kosong"  # missing required value
+REASON_BUKAN_ANGKA: Final = "bukan_angka"  # text or a fraction in an integer column
+REASON_DI_LUAR_RENTANG: Final = "di_luar_rentang"  # outside VALID_RANGES
+REASON_TANGGAL_TIDAK_VALID: Final = "tanggal_tidak_valid"  # not a DATE_FORMAT date
+REASON_DUPLIKAT: Final = "duplikat"  # repeats an earlier (id_pasien, tanggal_periksa) pair
+
 # Visualization Settings
 DEFAULT_FIGURE_SIZE: Final = (12, 6)
 COMPARISON_FIGURE_SIZE: Final = (15, 7)
 TOP_PATIENTS_COUNT: Final = 5
+TOP_PATIENTS_RANK_BY: Final = COLUMN_TEKANAN_DARAH
 BAR_WIDTH: Final = 0.25
+CHART_DPI: Final = 100
+RENDER_MAX_WORKERS: Final = 4  # Worker processes for off-screen chart batches
+
+# Trend Charts: averaging period ("D" daily, "W" weekly, "M" monthly) and
+# downsampling of long series to the axes' pixel width ("lttb" keeps the
+# visual shape, "minmax" keeps every bucket's extremes, None disables)
+TREND_FREQUENCIES: Final = {"D": "Harian", "W": "Mingguan", "M": "Bulanan"}
+TREND_DOWNSAMPLE_METHOD: Final = "lttb"
+
+# Time-Series Engine: rolling windows in calendar days (days without exams
+# count as empty) and the extra columns of its trend tables
+TREND_ROLLING_WINDOWS: Final = (7, 30)
+TREND_STD_SUFFIX: Final = "_std"
+COLUMN_JUMLAH_PEMERIKSAAN: Final = "jumlah_pemeriksaan"
+
+# Aggregate Cube (cohort slicing): cell dimensions and the lower bounds in
+# years of the age bands (the last band is open-ended, e.g. "70+")
+COLUMN_BULAN: Final = "bulan"
+COLUMN_KELOMPOK_UMUR: Final = "kelompok_umur"
+AGE_BAND_EDGES: Final = (0, 18, 30, 40, 50, 60, 70)
+CUBE_DIMENSIONS: Final = (COLUMN_BULAN, COLUMN_JENIS_KELAMIN, COLUMN_KELOMPOK_UMUR, CAT_AKHIR)
+
+# Quantile Sketches (streaming describe): normalized rank error of the
+# approximate quartiles, e.g. 0.01 = within 1% of the exam count
+QUANTILE_SKETCH_EPSILON: Final = 0.01
 
 # Colors
 COLOR_TEKANAN: Final = "red"
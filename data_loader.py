@@ -3,12 +3,47 @@ Data loading module for patient data analysis system.
 Provides caching, error handling, and type-safe data loading.
 """
 
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-from functools import lru_cache
+import pyarrow as pa
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from config import (
+    COLUMN_BARIS,
+    COLUMN_DTYPES,
+    COLUMN_ID_PASIEN,
+    COLUMN_TANGGAL_PERIKSA,
+    DATA_FILE_PATH,
+    DATASET_CACHE_MAX_BYTES,
+    DATE_FORMAT,
+    HASH_CHUNK_SIZE,
+    PARTITION_FILE_PATTERN,
+    PARTITION_MAX_WORKERS,
+    QUARANTINE_SUFFIX,
+    SIDECAR_CACHE_SUFFIX,
+    SQLITE_SUFFIXES,
+    STREAM_CHUNK_SIZE,
+    USE_SIDECAR_CACHE,
+)
+from data_quality import DataValidator, rules_fingerprint
+from instrumentation import instrument
 
-from config import DATA_FILE_PATH
+# Schema metadata keys identifying the CSV a sidecar was built from, and
+# the validation rules its rows passed
+_META_SOURCE_SIZE = b"source_size"
+_META_SOURCE_MTIME = b"source_mtime_ns"
+_META_SOURCE_HASH = b"source_blake2b"
+_META_VALIDATION_RULES = b"validation_rules"
 
 
 class DataLoadError(Exception):
@@ -16,13 +51,343 @@ class DataLoadError(Exception):
     pass
 
 
-@lru_cache(maxsize=1)
+class DateIndex:
+    """
+    Rows of a dataset stably sorted by exam date for range queries.
+    
+    Date ranges are resolved with binary search into a positional slice
+    of the sorted rows, so each query costs O(log n) and returns a view
+    instead of a boolean-mask copy. Data that is already in date order
+    (the usual case for exam exports) is not copied at all. Rows without
+    a date sort last and are excluded from every bounded query.
+    """
+    
+    def __init__(self, df: pd.DataFrame) -> None:
+        dates = df[COLUMN_TANGGAL_PERIKSA]
+        if dates.is_monotonic_increasing:
+            self.data = df
+        else:
+            order = np.argsort(dates.to_numpy(), kind="stable")
+            self.data = df.take(order)
+        self._dates = self.data[COLUMN_TANGGAL_PERIKSA].to_numpy()
+        self._dated_rows = len(self._dates) - int(np.isnat(self._dates).sum())
+    
+    def slice(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get the rows with an exam date within [start_date, end_date].
+        
+        Args:
+            start_date: Inclusive lower bound (YYYY-MM-DD format).
+            end_date: Inclusive upper bound (YYYY-MM-DD format).
+            
+        Returns:
+            pd.DataFrame: Date-sorted slice of the dataset.
+            
+        Raises:
+            ValueError: If a bound is malformed or start is after end.
+        """
+        if not start_date and not end_date:
+            return self.data
+        
+        start, end = _parse_date_range(start_date, end_date)
+        lo = 0 if start is None else int(np.searchsorted(self._dates, start, side="left"))
+        hi = self._dated_rows if end is None else int(np.searchsorted(
+            self._dates[:self._dated_rows], end, side="right"
+        ))
+        return self.data.iloc[lo:max(lo, hi)]
+
+
+def _parse_date_range(
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> Tuple[Optional[np.datetime64], Optional[np.datetime64]]:
+    """
+    Validate and parse date range bounds once per query.
+    
+    Args:
+        start_date: Inclusive lower bound (YYYY-MM-DD format) or None.
+        end_date: Inclusive upper bound (YYYY-MM-DD format) or None.
+        
+    Returns:
+        Tuple of parsed bounds, None where no bound was given.
+        
+    Raises:
+        ValueError: If a bound is malformed or start is after end.
+    """
+    bounds = []
+    for name, value in (("start_date", start_date), ("end_date", end_date)):
+        if not value:
+            bounds.append(None)
+            continue
+        # Parsed like the exam dates (see _read_csv_options), so a bound
+        # is accepted exactly when the same text in the data would be
+        try:
+            parsed = pd.to_datetime(value, format=DATE_FORMAT)
+        except (TypeError, ValueError):
+            parsed = pd.NaT
+        if pd.isna(parsed):
+            raise ValueError(f"Invalid {name} {value!r}, expected {DATE_FORMAT}")
+        bounds.append(parsed.to_datetime64().astype("datetime64[ns]"))
+    
+    start, end = bounds
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"start_date {start_date} is after end_date {end_date}")
+    return start, end
+
+
+class PatientIndex:
+    """
+    Rows of a dataset grouped by patient for history lookups.
+    
+    Rows are stably grouped by ``id_pasien`` (patients in order of first
+    appearance) and sorted by exam date within each patient, so every
+    patient's history is one contiguous row range. A lookup is a hash
+    probe of the patient id plus a positional slice, i.e. O(1) and a view
+    rather than a boolean scan of the whole frame. Within a patient,
+    rows without a date sort last.
+    
+    Attributes:
+        data: The rows in patient/date order (original index kept).
+        patient_ids: Unique patient ids; patient ``i`` owns rows
+            ``offsets[i]:offsets[i + 1]`` of ``data``.
+        offsets: Start row of every patient plus the total row count.
+    """
+    
+    def __init__(self, df: pd.DataFrame) -> None:
+        codes, uniques = pd.factorize(df[COLUMN_ID_PASIEN])
+        if (codes < 0).any():
+            raise ValueError(f"Column {COLUMN_ID_PASIEN!r} contains missing ids")
+        
+        dates = df[COLUMN_TANGGAL_PERIKSA].to_numpy()
+        if df[COLUMN_TANGGAL_PERIKSA].is_monotonic_increasing:
+            order = np.argsort(codes, kind="stable")
+        else:
+            date_keys = dates.view(np.int64).copy()
+            date_keys[np.isnat(dates)] = np.iinfo(np.int64).max
+            order = np.lexsort((date_keys, codes))
+        
+        self.data = df.take(order)
+        self.patient_ids = pd.Index(np.asarray(uniques, dtype=object), name=COLUMN_ID_PASIEN)
+        if len(self.patient_ids):
+            # Build the id hash table now rather than on the first lookup
+            self.patient_ids.get_loc(self.patient_ids[0])
+        counts = np.bincount(codes, minlength=len(uniques))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+    
+    def __len__(self) -> int:
+        """Number of patients."""
+        return len(self.patient_ids)
+    
+    def __contains__(self, patient_id: object) -> bool:
+        return patient_id in self.patient_ids
+    
+    def row_range(self, patient_id: str) -> slice:
+        """
+        Get the rows of ``data`` holding a patient's history.
+        
+        Args:
+            patient_id: Value of ``id_pasien``.
+            
+        Returns:
+            slice: Positional row range of the patient.
+            
+        Raises:
+            KeyError: If the patient is not in the dataset.
+        """
+        code = self.patient_ids.get_loc(patient_id)
+        return slice(int(self.offsets[code]), int(self.offsets[code + 1]))
+    
+    def history(self, patient_id: str) -> pd.DataFrame:
+        """
+        Get one patient's exams in date order.
+        
+        Args:
+            patient_id: Value of ``id_pasien``.
+            
+        Returns:
+            pd.DataFrame: The patient's rows (a view of ``data``).
+            
+        Raises:
+            KeyError: If the patient is not in the dataset.
+        """
+        return self.data.iloc[self.row_range(patient_id)]
+
+
+@dataclass
+class _CachedDataset:
+    """A loaded dataset together with the file state it was loaded from."""
+    data: pd.DataFrame
+    fingerprint: Tuple[int, int]
+    nbytes: int
+    date_index: Optional[DateIndex] = None
+    patient_index: Optional[PatientIndex] = None
+
+
+class DatasetCache:
+    """
+    In-process cache of loaded datasets with LRU eviction.
+    
+    Entries are keyed by resolved file path and remember the file's
+    (mtime, size) at load time, so a file changed on disk is reloaded
+    instead of served stale. Several datasets are kept under a total
+    byte budget; the least recently used ones are evicted first, but
+    the most recently loaded dataset is always kept even if it alone
+    exceeds the budget.
+    """
+    
+    def __init__(self, max_bytes: int = DATASET_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Path, _CachedDataset]" = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def get(self, path: Path) -> pd.DataFrame:
+        """
+        Get a dataset, loading it if missing or changed on disk.
+        
+        Args:
+            path: Path to the data file.
+            
+        Returns:
+            pd.DataFrame: Loaded patient data.
+        """
+        return self._get_entry(path).data
+    
+    def get_date_index(self, path: Path) -> DateIndex:
+        """
+        Get the date index of a dataset, building it on first use.
+        
+        The index lives with the cache entry, so it is dropped together
+        with the dataset when the file changes or the entry is evicted.
+        
+        Args:
+            path: Path to the data file.
+            
+        Returns:
+            DateIndex: Date index of the current version of the dataset.
+        """
+        with self._lock:
+            entry = self._get_entry(path)
+            if entry.date_index is None:
+                entry.date_index = DateIndex(entry.data)
+                if entry.date_index.data is not entry.data:
+                    entry.nbytes *= 2
+                    self._evict()
+            return entry.date_index
+    
+    def get_patient_index(self, path: Path) -> PatientIndex:
+        """
+        Get the patient index of a dataset, building it on first use.
+        
+        Like the date index, it is dropped together with the dataset.
+        
+        Args:
+            path: Path to the data file.
+            
+        Returns:
+            PatientIndex: Patient index of the current version of the dataset.
+        """
+        with self._lock:
+            entry = self._get_entry(path)
+            if entry.patient_index is None:
+                entry.patient_index = PatientIndex(entry.data)
+                entry.nbytes += int(entry.data.memory_usage(deep=True).sum())
+                self._evict()
+            return entry.patient_index
+    
+    def _get_entry(self, path: Path) -> _CachedDataset:
+        """Get the cache entry of a dataset, (re)loading it when needed."""
+        key = path.resolve()
+        fingerprint = _fingerprint(key)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            
+            self.misses += 1
+            df = _load_dataset(path)
+            entry = _CachedDataset(
+                data=df,
+                fingerprint=fingerprint,
+                nbytes=int(df.memory_usage(deep=True).sum()),
+            )
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+            return entry
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries until within the byte budget."""
+        while len(self._entries) > 1 and self.current_bytes > self.max_bytes:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    @property
+    def current_bytes(self) -> int:
+        """Total in-memory size of all cached datasets."""
+        return sum(entry.nbytes for entry in self._entries.values())
+    
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """
+        Drop one cached dataset, or all of them.
+        
+        Args:
+            path: Data file to drop. Drops every entry when None.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path.resolve(), None)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters and current usage.
+        
+        Returns:
+            Dict with hits, misses, evictions, entries and bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+            }
+
+
+_dataset_cache = DatasetCache()
+
+
+@instrument
 def load_data_patients(file_path: Optional[str] = None) -> pd.DataFrame:
     """
     Load patient data from CSV file with caching support.
     
-    Uses LRU cache to avoid reloading the same file multiple times.
-    This improves performance when the data is accessed frequently.
+    ``file_path`` may also be a partitioned dataset directory (see
+    ``list_partitions``), whose partitions are read concurrently, or an
+    SQLite database (see ``is_sqlite_path``).
+    
+    Uses an in-process dataset cache (see ``DatasetCache``) to avoid
+    reloading the same file multiple times; the file is reloaded
+    automatically when it changes on disk.
+    Columns are parsed straight into the compact dtypes declared in
+    ``config.COLUMN_DTYPES``. Across processes, a binary sidecar cache
+    next to the CSV is memory-mapped instead of re-parsing the text
+    (see ``USE_SIDECAR_CACHE``).
+    Parsed rows are validated (see ``data_quality``); rows failing a
+    check are left out and written to the file's quarantine CSV (see
+    ``get_quarantine_path``) instead of failing the load.
     
     Args:
         file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
@@ -35,10 +400,251 @@ def load_data_patients(file_path: Optional[str] = None) -> pd.DataFrame:
     """
     path = Path(file_path) if file_path else DATA_FILE_PATH
     
+    with _translate_load_errors(path):
+        return _dataset_cache.get(path)
+
+
+def _fingerprint(path: Path) -> Tuple[int, int]:
+    """
+    Get the (mtime, size) state of a data file or partitioned dataset.
+    
+    For a directory, the newest mtime and total size over all partition
+    files are used, so changes inside any partition are detected.
+    """
+    if not path.is_dir():
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    stats = [
+        file.stat()
+        for partition in list_partitions(str(path))
+        for file in partition.files
+    ]
+    return (
+        max((stat.st_mtime_ns for stat in stats), default=0),
+        sum(stat.st_size for stat in stats),
+    )
+
+
+def _load_dataset(path: Path) -> pd.DataFrame:
+    """
+    Load a dataset from its sidecar cache or by parsing the CSV.
+    
+    Args:
+        path: Path to the CSV file or partitioned dataset directory.
+        
+    Returns:
+        pd.DataFrame: Loaded patient data.
+    """
+    if is_sqlite_path(str(path)):
+        # Imported here: sqlite_backend builds on this module
+        from sqlite_backend import SQLiteStore
+        
+        return SQLiteStore(path).load()
+    if path.is_dir():
+        files = [f for partition in list_partitions(str(path)) for f in partition.files]
+        return _read_partition_files(files)
+    
+    df = _read_sidecar(path) if USE_SIDECAR_CACHE else None
+    if df is None:
+        df = _read_patient_csv(path)
+        if USE_SIDECAR_CACHE:
+            _write_sidecar(path, df)
+    return df
+
+
+@instrument
+def iter_data_chunks(
+    file_path: Optional[str] = None,
+    chunksize: int = STREAM_CHUNK_SIZE,
+    end: Optional[int] = None,
+    validator: Optional[DataValidator] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream patient data from CSV file in bounded-size chunks.
+    
+    Each chunk is parsed with the same column schema as
+    ``load_data_patients``, so peak memory depends on ``chunksize``
+    rather than on the size of the file. Each chunk is validated as it is
+    read; rows failing a check are left out of the chunk and appended to
+    the file's quarantine CSV. Repeated (id_pasien, tanggal_periksa) pairs
+    are only detected when a ``DataValidator()`` is passed, since tracking
+    them across chunks keeps 8 bytes per accepted row.
+    Partitioned dataset directories are streamed partition by partition
+    in date order, SQLite databases in import order.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        chunksize: Number of rows per chunk.
+        end: Optional byte offset to stop reading a CSV file at, e.g. its
+            size recorded before reading, so rows appended meanwhile are
+            left for ``read_csv_tail``.
+        validator: Optional validator to continue, e.g. one that later
+            validates the file's tail. Defaults to a new one without the
+            duplicate check, so memory does not grow with the file.
+            
+    Yields:
+        pd.DataFrame: Consecutive chunks of patient data.
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+        ValueError: If ``end`` is given for a directory or database.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    if end is not None and (path.is_dir() or is_sqlite_path(str(path))):
+        raise ValueError(f"end applies to a single CSV file, not {path}")
+    if is_sqlite_path(str(path)):
+        from sqlite_backend import SQLiteStore
+        
+        yield from SQLiteStore(path).iter_chunks(chunksize)
+        return
+    files = (
+        [f for partition in list_partitions(str(path)) for f in partition.files]
+        if path.is_dir() else [path]
+    )
+    
+    validator = validator or DataValidator(check_duplicates=False)
+    for file in files:
+        with _translate_load_errors(file):
+            get_quarantine_path(str(file)).unlink(missing_ok=True)
+            for chunk in _iter_csv_chunks(file, chunksize, end):
+                yield _validate_rows(chunk, file, validator, append=True)
+
+
+class _FilePrefix(io.RawIOBase):
+    """Raw binary reader of the first ``size`` bytes of a file."""
+    
+    def __init__(self, path: Path, size: int) -> None:
+        super().__init__()
+        self._file = open(path, "rb")
+        self._remaining = size
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer: Any) -> int:
+        read = self._file.readinto(memoryview(buffer)[:self._remaining])
+        self._remaining -= read
+        return read
+    
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+@contextmanager
+def _open_csv(path: Path, end: Optional[int]) -> Iterator[Union[Path, io.BufferedReader]]:
+    """Open a CSV file for ``pd.read_csv``, limited to its first ``end`` bytes if given."""
+    if end is None:
+        yield path
+        return
+    with io.BufferedReader(_FilePrefix(path, end)) as source:
+        yield source
+
+
+def _iter_csv_chunks(
+    path: Path,
+    chunksize: int,
+    end: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Parse a patient CSV in chunks, falling back to text integer columns.
+    
+    If a chunk holds a value that is not a number at all, the rest of the
+    file is re-read with ``_read_csv_options(lenient=True)`` from that
+    chunk on, keeping the row labels of a single read. With ``end``, only
+    the bytes before that offset are read.
+    """
+    consumed = 0
+    try:
+        with _open_csv(path, end) as source, pd.read_csv(
+            source, chunksize=chunksize, **_read_csv_options()
+        ) as reader:
+            for chunk in reader:
+                yield chunk
+                consumed += len(chunk)
+        return
+    except ValueError:
+        pass
+    
+    with _open_csv(path, end) as source, pd.read_csv(
+        source,
+        chunksize=chunksize,
+        skiprows=range(1, consumed + 1),
+        **_read_csv_options(lenient=True),
+    ) as reader:
+        for chunk in reader:
+            chunk.index += consumed
+            yield chunk
+
+
+@instrument
+def read_csv_tail(
+    file_path: Optional[str],
+    offset: int,
+    validator: Optional[DataValidator] = None
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Read the rows appended to a CSV file after a byte offset.
+    
+    Only complete (newline-terminated) lines are consumed, so a row that
+    is still being written is picked up by the next call instead of
+    being parsed half-way. The new rows are validated, and failing rows
+    are appended to the file's quarantine CSV. Pass the validator that
+    read the rows before ``offset`` (see ``iter_data_chunks``) so that a
+    new row repeating an already accepted (id_pasien, tanggal_periksa)
+    pair is quarantined too; without it, duplicates are only detected
+    among the new rows.
+    
+    Args:
+        file_path: Path to the CSV file, or None for DATA_FILE_PATH.
+        offset: Byte offset just past the last consumed row (must be > 0,
+            i.e. after the header line).
+        validator: Optional validator of the rows read so far.
+        
+    Returns:
+        Tuple of the new rows (schema dtypes) and the new offset.
+        
+    Raises:
+        DataLoadError: If the file cannot be read or shrank below offset.
+        ValueError: If ``offset`` is not positive.
+    """
+    if offset <= 0:
+        raise ValueError(f"Tail offset must be past the header line, got {offset}")
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    
+    with _translate_load_errors(path):
+        columns = list(pd.read_csv(path, nrows=0).columns)
+        with open(path, "rb") as source:
+            source.seek(0, os.SEEK_END)
+            if source.tell() < offset:
+                raise DataLoadError(
+                    f"Data file shrank below the last read position: {path}"
+                )
+            source.seek(offset)
+            tail = source.read()
+        
+        end = tail.rfind(b"\n") + 1
+        if not tail[:end].strip():
+            schema = {c: COLUMN_DTYPES[c] for c in columns if c in COLUMN_DTYPES}
+            return pd.DataFrame(columns=columns).astype(schema), offset + end
+        
+        rows = _parse_patient_rows(io.BytesIO(tail[:end]), header=None, names=columns)
+        valid = _validate_rows(rows, path, validator, append=True, first_line=None)
+        return valid, offset + end
+
+
+@contextmanager
+def _translate_load_errors(path: Path) -> Iterator[None]:
+    """
+    Re-raise errors from reading a data file as DataLoadError.
+    
+    Args:
+        path: Path of the file being read, used in error messages.
+    """
     try:
-        df = pd.read_csv(path)
-        _validate_dataframe(df)
-        return df
+        yield
+    except DataLoadError:
+        raise
     except FileNotFoundError:
         raise DataLoadError(f"Data file not found: {path}")
     except pd.errors.EmptyDataError:
@@ -49,6 +655,332 @@ def load_data_patients(file_path: Optional[str] = None) -> pd.DataFrame:
         raise DataLoadError(f"Unexpected error loading data: {e}")
 
 
+def _read_patient_csv(path: Path) -> pd.DataFrame:
+    """
+    Parse and validate a patient CSV file using the column schema.
+    
+    Args:
+        path: Path to the CSV file.
+        
+    Returns:
+        pd.DataFrame: Valid rows, renumbered if any were quarantined.
+    """
+    df = _parse_patient_rows(path)
+    valid = _validate_rows(df, path)
+    return valid if len(valid) == len(df) else valid.reset_index(drop=True)
+
+
+def _parse_patient_rows(source: Union[Path, io.BytesIO], **kwargs: Any) -> pd.DataFrame:
+    """
+    Parse patient rows, re-reading integer columns as text if needed.
+    
+    Args:
+        source: CSV file path or buffer.
+        **kwargs: Extra ``pd.read_csv`` arguments.
+        
+    Returns:
+        pd.DataFrame: Rows ready for ``_validate_rows``.
+    """
+    try:
+        return pd.read_csv(source, **kwargs, **_read_csv_options())
+    except ValueError:
+        # Some integer value is not a number at all
+        if isinstance(source, io.IOBase):
+            source.seek(0)
+        return pd.read_csv(source, **kwargs, **_read_csv_options(lenient=True))
+
+
+def _validate_rows(
+    df: pd.DataFrame,
+    path: Path,
+    validator: Optional[DataValidator] = None,
+    append: bool = False,
+    first_line: Optional[int] = 2
+) -> pd.DataFrame:
+    """
+    Validate parsed rows and quarantine the ones failing a check.
+    
+    Args:
+        df: Rows parsed with ``_read_csv_options``.
+        path: Data file the rows were read from.
+        validator: Validator of the ongoing stream. Defaults to a new one.
+        append: Add to the quarantine CSV instead of replacing it.
+        first_line: File line of the row labelled 0 (the header is line 1),
+            or None when unknown.
+            
+    Returns:
+        pd.DataFrame: Valid rows with the schema dtypes.
+        
+    Raises:
+        DataLoadError: If required columns are missing.
+    """
+    _validate_dataframe(df)
+    result = (validator or DataValidator()).validate(df)
+    if len(result.quarantine) or not append:
+        _write_quarantine(path, result.quarantine, append, first_line)
+    return _enforce_schema(result.valid)
+
+
+def _write_quarantine(
+    path: Path,
+    rows: pd.DataFrame,
+    append: bool,
+    first_line: Optional[int]
+) -> None:
+    """
+    Write quarantined rows to the quarantine CSV of a data file.
+    
+    Rows are written as read (integer columns parsed as float64 without a
+    trailing ".0"), after a ``COLUMN_BARIS`` column with their line in the
+    data file. Replacing with no rows removes the file.
+    """
+    target = get_quarantine_path(str(path))
+    if not len(rows) and not append:
+        target.unlink(missing_ok=True)
+        return
+    lines = rows.index + first_line if first_line is not None else pd.NA
+    rows.insert(0, COLUMN_BARIS, lines)
+    rows.to_csv(
+        target,
+        mode="a" if append else "w",
+        header=not (append and target.exists()),
+        index=False,
+        date_format=DATE_FORMAT,
+        float_format="%.15g",
+    )
+
+
+def _read_csv_options(lenient: bool = False) -> Dict[str, Any]:
+    """
+    Build ``pd.read_csv`` keyword arguments from the column schema.
+    
+    Datetime columns are parsed with ``DATE_FORMAT`` (unparseable dates
+    leave the column as text for validation). Integer columns are read
+    as float64, so missing, fractional or overflowing values reach
+    validation instead of failing the parse or wrapping around, and cast
+    to their declared dtype afterwards; other columns get their declared
+    dtype directly.
+    
+    Args:
+        lenient: Read integer columns as text, for data where some value
+            is not a number at all.
+            
+    Returns:
+        Dict of keyword arguments for ``pd.read_csv``.
+    """
+    date_columns = _schema_date_columns()
+    dtypes = {}
+    for column, dtype in COLUMN_DTYPES.items():
+        if column in date_columns:
+            continue
+        if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(dtype)):
+            dtype = "string[pyarrow]" if lenient else "float64"
+        dtypes[column] = dtype
+    return {
+        "dtype": dtypes,
+        "parse_dates": date_columns,
+        "date_format": DATE_FORMAT,
+    }
+
+
+def _schema_date_columns() -> List[str]:
+    """Get the schema columns declared as datetimes."""
+    return [
+        column for column, dtype in COLUMN_DTYPES.items()
+        if dtype.startswith("datetime64")
+    ]
+
+
+def is_sqlite_path(file_path: Optional[str] = None) -> bool:
+    """
+    Check whether a data path is an SQLite database (see ``sqlite_backend``).
+    
+    Args:
+        file_path: Optional data path. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        bool: True if the suffix is one of ``SQLITE_SUFFIXES``.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    return path.suffix.lower() in SQLITE_SUFFIXES
+
+
+def get_quarantine_path(file_path: Optional[str] = None) -> Path:
+    """
+    Get the quarantine CSV path of a data file.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        Path: Quarantine path, e.g. ``data_pasien.csv.quarantine.csv``.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    return path.with_name(path.name + QUARANTINE_SUFFIX)
+
+
+def get_sidecar_path(file_path: Optional[str] = None) -> Path:
+    """
+    Get the path of the binary sidecar cache for a CSV file.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        Path: Sidecar path, e.g. ``data_pasien.csv.arrow``.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    return path.with_name(path.name + SIDECAR_CACHE_SUFFIX)
+
+
+def _hash_file(path: Path) -> str:
+    """Compute the BLAKE2b digest of a file's content in fixed-size chunks."""
+    digest = hashlib.blake2b()
+    with open(path, "rb") as source:
+        while chunk := source.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_sidecar(path: Path) -> Optional[pd.DataFrame]:
+    """
+    Load a CSV's sidecar cache if it is still fresh.
+    
+    The sidecar is keyed by the source file's size, mtime and content
+    hash. A size mismatch means the CSV changed; an mtime-only mismatch
+    (e.g. the file was touched or copied) is resolved by re-hashing the
+    CSV, and the sidecar is re-stamped when the content is unchanged.
+    
+    Args:
+        path: Path to the source CSV file.
+        
+    Returns:
+        Optional[pd.DataFrame]: Cached data, or None if the sidecar is
+        missing, stale or unreadable.
+    """
+    stat = path.stat()
+    sidecar_path = get_sidecar_path(str(path))
+    if not sidecar_path.exists():
+        return None
+    
+    try:
+        with pa.memory_map(str(sidecar_path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    except (pa.ArrowException, OSError):
+        return None
+    
+    metadata = table.schema.metadata or {}
+    if (
+        metadata.get(_META_SOURCE_SIZE) != str(stat.st_size).encode()
+        or metadata.get(_META_VALIDATION_RULES) != rules_fingerprint().encode()
+    ):
+        return None
+    
+    df = _table_to_frame(table)
+    if metadata.get(_META_SOURCE_MTIME) != str(stat.st_mtime_ns).encode():
+        content_hash = _hash_file(path)
+        if metadata.get(_META_SOURCE_HASH) != content_hash.encode():
+            return None
+        _write_sidecar(path, df, content_hash)
+    return df
+
+
+def _table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """
+    Convert a cached Arrow table back to a DataFrame with the schema dtypes.
+    
+    Numeric columns are converted without copying where Arrow allows it
+    and strings stay Arrow-backed, so the memory map is shared.
+    """
+    string_dtype = pd.StringDtype("pyarrow")
+    df = table.to_pandas(
+        split_blocks=True,
+        types_mapper={
+            pa.string(): string_dtype,
+            pa.large_string(): string_dtype,
+        }.get,
+    )
+    return _enforce_schema(df)
+
+
+def _enforce_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast only the columns whose dtype differs from the column schema.
+    
+    Args:
+        df: Patient DataFrame.
+        
+    Returns:
+        pd.DataFrame: ``df`` itself if it already matches, else a cast copy.
+    """
+    mismatched = {
+        column: dtype for column, dtype in COLUMN_DTYPES.items()
+        if column in df.columns
+        and df[column].dtype != pd.api.types.pandas_dtype(dtype)
+    }
+    return df.astype(mismatched) if mismatched else df
+
+
+def _write_sidecar(
+    path: Path,
+    df: pd.DataFrame,
+    content_hash: Optional[str] = None
+) -> None:
+    """
+    Write the sidecar cache for a CSV file.
+    
+    The Arrow IPC file is written uncompressed so it can be memory-mapped,
+    and atomically replaced so concurrent readers never see a partial file.
+    Failures (e.g. a read-only directory) are ignored; the cache is only
+    an optimization.
+    
+    Args:
+        path: Path to the source CSV file.
+        df: Parsed data of the CSV file.
+        content_hash: Precomputed content hash of the CSV file.
+    """
+    stat = path.stat()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_SOURCE_SIZE: str(stat.st_size),
+        _META_SOURCE_MTIME: str(stat.st_mtime_ns),
+        _META_SOURCE_HASH: content_hash or _hash_file(path),
+        _META_VALIDATION_RULES: rules_fingerprint(),
+    })
+    
+    sidecar_path = get_sidecar_path(str(path))
+    temp_path = sidecar_path.with_name(f"{sidecar_path.name}.{os.getpid()}.tmp")
+    try:
+        with pa.OSFile(str(temp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, sidecar_path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+
+
+@instrument
+def rebuild_sidecar_cache(file_path: Optional[str] = None) -> Path:
+    """
+    Force a rebuild of the sidecar cache from the CSV file.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        Path: Path of the rebuilt sidecar.
+        
+    Raises:
+        DataLoadError: If the CSV file cannot be loaded.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    get_sidecar_path(str(path)).unlink(missing_ok=True)
+    clear_cache(str(path))
+    load_data_patients(file_path)
+    return get_sidecar_path(str(path))
+
+
 def _validate_dataframe(df: pd.DataFrame) -> None:
     """
     Validate that the DataFrame contains required columns.
@@ -59,40 +991,219 @@ def _validate_dataframe(df: pd.DataFrame) -> None:
     Raises:
         DataLoadError: If required columns are missing.
     """
-    required_columns = {
-        "id_pasien", "nama", "umur", "jenis_kelamin",
-        "tanggal_periksa", "tekanan_darah", "gula_darah", "kolesterol"
-    }
+    required_columns = set(COLUMN_DTYPES)
     
     missing_columns = required_columns - set(df.columns)
     if missing_columns:
         raise DataLoadError(f"Missing required columns: {missing_columns}")
 
 
+@instrument
 def load_data_with_date_filter(
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    file_path: Optional[str] = None
 ) -> pd.DataFrame:
     """
     Load patient data with optional date filtering.
     
+    Uses the dataset's cached ``DateIndex``, so repeated date-window
+    queries against the same data are binary searches returning slices
+    of the date-sorted rows. For a partitioned dataset directory, only
+    the partitions overlapping the range are read; for an SQLite
+    database, the range is a WHERE clause on its exam date index.
+    
     Args:
         start_date: Filter records from this date (YYYY-MM-DD format).
         end_date: Filter records until this date (YYYY-MM-DD format).
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
         
     Returns:
-        pd.DataFrame: Filtered patient data.
+        pd.DataFrame: Filtered patient data, ordered by exam date.
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+        ValueError: If a date bound is malformed or start is after end.
     """
-    df = load_data_patients()
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    if is_sqlite_path(str(path)):
+        from sqlite_backend import SQLiteStore
+        
+        return SQLiteStore(path).load_date_range(start_date, end_date)
+    if path.is_dir():
+        return _load_partitioned_range(path, start_date, end_date)
+    return get_date_index(file_path).slice(start_date, end_date)
+
+
+@dataclass
+class Partition:
+    """One date partition of a partitioned dataset directory."""
+    start: pd.Timestamp
+    end: pd.Timestamp
+    files: List[Path]
+
+
+@instrument
+def list_partitions(root: Optional[str] = None) -> List[Partition]:
+    """
+    List the date partitions of a partitioned dataset directory.
     
-    if start_date:
-        df = df[df["tanggal_periksa"] >= start_date]
-    if end_date:
-        df = df[df["tanggal_periksa"] <= end_date]
+    Partitions are subdirectories named ``tanggal_periksa=<period>``,
+    where the period is a year (``2024``), month (``2024-01``) or day
+    (``2024-01-05``), each holding one or more CSV files. Quarantine
+    files written next to a partition file are not partition files.
     
-    return df
+    Args:
+        root: Dataset directory. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        List[Partition]: Partitions sorted by start date.
+        
+    Raises:
+        DataLoadError: If a partition name is not a valid period.
+    """
+    root_path = Path(root) if root else DATA_FILE_PATH
+    partitions = []
+    for directory in root_path.glob(f"{COLUMN_TANGGAL_PERIKSA}=*"):
+        if not directory.is_dir():
+            continue
+        value = directory.name.split("=", 1)[1]
+        try:
+            period = pd.Period(value)
+        except ValueError:
+            raise DataLoadError(f"Invalid partition name: {directory}")
+        partitions.append(Partition(
+            start=period.start_time,
+            end=period.end_time,
+            files=sorted(
+                file for file in directory.glob(PARTITION_FILE_PATTERN)
+                if not file.name.endswith(QUARANTINE_SUFFIX)
+            ),
+        ))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def _load_partitioned_range(
+    root: Path,
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> pd.DataFrame:
+    """
+    Load the rows of a partitioned dataset within a date range.
+    
+    Partitions entirely outside the range are pruned before any file is
+    opened; the surviving files are read concurrently and trimmed to the
+    exact bounds with a ``DateIndex``.
+    """
+    start, end = _parse_date_range(start_date, end_date)
+    files = [
+        file
+        for partition in list_partitions(str(root))
+        if (start is None or partition.end >= start)
+        and (end is None or partition.start <= end)
+        for file in partition.files
+    ]
+    with _translate_load_errors(root):
+        df = _read_partition_files(files)
+    return DateIndex(df).slice(start_date, end_date)
+
+
+def _read_partition_files(
+    files: List[Path],
+    max_workers: int = PARTITION_MAX_WORKERS
+) -> pd.DataFrame:
+    """
+    Read partition files, in parallel worker processes when several.
+    
+    Each worker loads its file through the sidecar cache where possible.
+    
+    Args:
+        files: Partition CSV files in date order.
+        max_workers: Maximum number of worker processes.
+        
+    Returns:
+        pd.DataFrame: Concatenated data with the schema dtypes.
+    """
+    if not files:
+        return _enforce_schema(pd.DataFrame(columns=list(COLUMN_DTYPES)))
+    if len(files) == 1 or max_workers <= 1:
+        frames = [_load_dataset(file) for file in files]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(files))) as pool:
+            frames = list(pool.map(_load_dataset, files))
+    return _enforce_schema(pd.concat(frames, ignore_index=True))
+
+
+@instrument
+def write_partitioned_dataset(
+    df: pd.DataFrame,
+    root: str,
+    freq: str = "M"
+) -> List[Path]:
+    """
+    Write patient data as a partitioned dataset directory.
+    
+    Args:
+        df: Patient DataFrame with a datetime exam date.
+        root: Destination directory.
+        freq: Partition period: "Y" (year), "M" (month) or "D" (day).
+        
+    Returns:
+        List[Path]: Written partition files.
+    """
+    formats = {"Y": "%Y", "M": "%Y-%m", "D": DATE_FORMAT}
+    dates = pd.to_datetime(df[COLUMN_TANGGAL_PERIKSA], format=DATE_FORMAT)
+    written = []
+    for value, partition in df.groupby(dates.dt.strftime(formats[freq]), sort=True):
+        directory = Path(root) / f"{COLUMN_TANGGAL_PERIKSA}={value}"
+        directory.mkdir(parents=True, exist_ok=True)
+        file = directory / "part-0.csv"
+        partition.to_csv(file, index=False, date_format=DATE_FORMAT)
+        written.append(file)
+    return written
+
+
+@instrument
+def get_date_index(file_path: Optional[str] = None) -> DateIndex:
+    """
+    Get the cached date index of a dataset.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        DateIndex: Date index built once per loaded dataset version.
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    
+    with _translate_load_errors(path):
+        return _dataset_cache.get_date_index(path)
 
 
+@instrument
+def get_patient_index(file_path: Optional[str] = None) -> PatientIndex:
+    """
+    Get the cached patient index of a dataset.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        
+    Returns:
+        PatientIndex: Patient index built once per loaded dataset version.
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+    """
+    path = Path(file_path) if file_path else DATA_FILE_PATH
+    
+    with _translate_load_errors(path):
+        return _dataset_cache.get_patient_index(path)
+
+
+@instrument
 def get_unique_patients_count(df: pd.DataFrame) -> int:
     """
     Get the count of unique patients in the dataset.
@@ -106,7 +1217,47 @@ def get_unique_patients_count(df: pd.DataFrame) -> int:
     return df["id_pasien"].nunique()
 
 
-def clear_cache() -> None:
-    """Clear the data cache to allow reloading from file."""
-    load_data_patients.cache_clear()
+@instrument
+def get_memory_footprint(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Report the in-memory footprint of each column.
+    
+    Args:
+        df: Patient DataFrame.
+        
+    Returns:
+        pd.DataFrame: dtype, total bytes and bytes per million rows for
+        every column, plus a ``total`` row.
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    rows = max(len(df), 1)
+    footprint = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": usage,
+        "bytes_per_million_rows": usage * 1_000_000 / rows,
+    })
+    footprint.loc["total"] = [
+        "", usage.sum(), usage.sum() * 1_000_000 / rows
+    ]
+    return footprint
+
+
+def clear_cache(file_path: Optional[str] = None) -> None:
+    """
+    Clear the data cache to allow reloading from file.
+    
+    Args:
+        file_path: Only drop this file's dataset. Clears everything when None.
+    """
+    _dataset_cache.invalidate(Path(file_path) if file_path else None)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss/eviction counters of the dataset cache.
+    
+    Returns:
+        Dict with hits, misses, evictions, entries and bytes.
+    """
+    return _dataset_cache.stats()
 
@@ -0,0 +1,229 @@
+"""
+Data-quality validation for patient data.
+Checks every row of a parsed frame, or of each streamed chunk, in one
+vectorized pass: missing required values, indicator values that are not
+whole numbers, values outside ``config.VALID_RANGES``, unparseable exam
+dates and repeated (id_pasien, tanggal_periksa) pairs. Offending rows are
+split off into a quarantine frame with reason codes, so a few bad rows
+neither abort a load nor flow into the statistics.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from itertools import compress
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import config as cfg
+from instrumentation import instrument
+
+# A decimal number with optional sign and exponent; any other text in an
+# integer column is not a number
+_NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+
+@dataclass
+class ValidationResult:
+    """
+    Outcome of validating one frame.
+    
+    ``valid`` holds the rows that passed, with integer columns as numbers
+    and dates as datetimes (not yet cast to the schema dtypes).
+    ``quarantine`` holds the other rows with their values as read plus a
+    ``COLUMN_ALASAN`` column of ``;``-separated ``<column>:<reason>``
+    codes; both keep the index labels of the validated frame.
+    """
+    valid: pd.DataFrame
+    quarantine: pd.DataFrame
+
+
+def rules_fingerprint() -> str:
+    """
+    Get a fingerprint of the validation rules in ``config``.
+    
+    Caches of validated data store it, so that changing a rule (e.g. a
+    range) invalidates them.
+    
+    Returns:
+        str: Hex digest of the rules.
+    """
+    rules = {
+        "required": cfg.REQUIRED_COLUMNS,
+        "ranges": cfg.VALID_RANGES,
+        "date_format": cfg.DATE_FORMAT,
+    }
+    return hashlib.blake2b(json.dumps(rules).encode(), digest_size=8).hexdigest()
+
+
+class DataValidator:
+    """
+    Validate consecutive chunks of one dataset.
+    
+    Duplicate pairs are tracked across chunks: patient ids get stable
+    integer codes in order of first appearance, and the accepted pairs
+    are kept as ``code << 32 | day`` int64 keys (no hash collisions), so
+    the first occurrence in file order is kept whether the data is
+    validated whole or streamed. Rows failing another check do not count
+    as an occurrence. The keys are stored as sorted runs, one per chunk,
+    and equal-sized runs are merged like a binary counter, so a chunk
+    costs amortized O(chunk log rows) and a lookup probes O(log rows)
+    runs. Memory therefore grows with the data: 8 bytes per accepted row
+    plus the patient id dictionary; pass ``check_duplicates=False`` to
+    validate a stream in constant memory.
+    
+    Args:
+        check_duplicates: Quarantine repeated (id_pasien, tanggal_periksa)
+            pairs.
+    """
+    
+    def __init__(self, check_duplicates: bool = True) -> None:
+        self.check_duplicates = check_duplicates
+        self._patient_codes: Dict[str, int] = {}
+        self._runs: List[np.ndarray] = []
+    
+    def validate(self, df: pd.DataFrame) -> ValidationResult:
+        """
+        Validate the next chunk.
+        
+        Args:
+            df: Parsed rows with the ``REQUIRED_COLUMNS``; integer columns
+                may be numeric or text, dates datetimes or text.
+                
+        Returns:
+            ValidationResult: Valid and quarantined rows. When every row
+            passes and nothing needed converting, ``valid`` is ``df``.
+        """
+        checks: Dict[str, np.ndarray] = {}
+        converted: Dict[str, pd.Series] = {}
+        
+        def check(column: str, reason: str, mask: np.ndarray) -> None:
+            if mask.any():
+                checks[f"{column}:{reason}"] = mask
+        
+        missing = {column: df[column].isna().to_numpy() for column in cfg.REQUIRED_COLUMNS}
+        for column, mask in missing.items():
+            check(column, cfg.REASON_KOSONG, mask)
+        
+        raw_dates = df[cfg.COLUMN_TANGGAL_PERIKSA]
+        dates = raw_dates
+        if not pd.api.types.is_datetime64_dtype(raw_dates.dtype):
+            dates = pd.to_datetime(raw_dates, format=cfg.DATE_FORMAT, errors="coerce")
+            converted[cfg.COLUMN_TANGGAL_PERIKSA] = dates
+        check(
+            cfg.COLUMN_TANGGAL_PERIKSA,
+            cfg.REASON_TANGGAL_TIDAK_VALID,
+            dates.isna().to_numpy() & ~missing[cfg.COLUMN_TANGGAL_PERIKSA],
+        )
+        
+        for column, (low, high) in cfg.VALID_RANGES.items():
+            raw = df[column]
+            values = raw
+            if not pd.api.types.is_numeric_dtype(raw.dtype):
+                values = _parse_numbers(raw)
+                converted[column] = values
+            numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            not_number = np.isnan(numbers) & ~raw.isna().to_numpy()
+            with np.errstate(invalid="ignore"):
+                not_number |= np.isfinite(numbers) & (numbers != np.floor(numbers))
+            check(column, cfg.REASON_BUKAN_ANGKA, not_number)
+            check(column, cfg.REASON_DI_LUAR_RENTANG, (numbers < low) | (numbers > high))
+        
+        bad = np.zeros(len(df), dtype=bool)
+        for mask in checks.values():
+            bad |= mask
+        if self.check_duplicates:
+            duplicates = self._duplicates(df[cfg.COLUMN_ID_PASIEN], dates, bad)
+            check(
+                f"{cfg.COLUMN_ID_PASIEN}+{cfg.COLUMN_TANGGAL_PERIKSA}",
+                cfg.REASON_DUPLIKAT,
+                duplicates,
+            )
+            bad |= duplicates
+        
+        valid = df.assign(**converted) if converted else df
+        if not checks:
+            return ValidationResult(valid, df.iloc[:0].assign(**{cfg.COLUMN_ALASAN: ""}))
+        
+        labels = list(checks)
+        flags = np.column_stack([checks[label][bad] for label in labels])
+        quarantine = df[bad].assign(**{
+            cfg.COLUMN_ALASAN: [";".join(compress(labels, row)) for row in flags]
+        })
+        return ValidationResult(valid[~bad], quarantine)
+    
+    def _duplicates(
+        self,
+        patient_ids: pd.Series,
+        dates: pd.Series,
+        rejected: np.ndarray
+    ) -> np.ndarray:
+        """Flag the rows not otherwise rejected whose pair was accepted before."""
+        candidates = np.flatnonzero(~rejected)
+        if len(candidates) < len(rejected):
+            patient_ids, dates = patient_ids.iloc[candidates], dates.iloc[candidates]
+        codes, uniques = pd.factorize(patient_ids)
+        known = self._patient_codes
+        patient_codes = np.fromiter(
+            (known.setdefault(patient_id, len(known)) for patient_id in uniques.tolist()),
+            dtype=np.int64,
+            count=len(uniques),
+        )
+        days = dates.to_numpy().astype("datetime64[D]").astype(np.int64)
+        keys = (patient_codes[codes] << 32) | (days + 2 ** 31)
+        
+        repeated = pd.Series(keys).duplicated().to_numpy()
+        for run in self._runs:
+            positions = np.searchsorted(run, keys).clip(max=len(run) - 1)
+            repeated |= run[positions] == keys
+        self._remember(np.sort(keys[~repeated]))
+        
+        duplicates = np.zeros(len(rejected), dtype=bool)
+        duplicates[candidates[repeated]] = True
+        return duplicates
+    
+    def _remember(self, keys: np.ndarray) -> None:
+        """Add sorted new keys as a run, merging runs no longer than it."""
+        if not len(keys):
+            return
+        runs = self._runs
+        runs.append(keys)
+        while len(runs) > 1 and len(runs[-2]) <= len(runs[-1]):
+            # Two sorted runs: the stable sort merges them in linear time
+            merged = np.concatenate(runs[-2:])
+            merged.sort(kind="stable")
+            runs[-2:] = [merged]
+
+
+def _parse_numbers(text: pd.Series) -> pd.Series:
+    """
+    Parse a text column to float64 with Arrow kernels.
+    
+    Args:
+        text: Column of strings.
+        
+    Returns:
+        pd.Series: Numbers, NaN where the text is missing or not a number.
+    """
+    strings = pc.utf8_trim_whitespace(pa.array(text.astype("string[pyarrow]").array))
+    numeric = pc.match_substring_regex(strings, _NUMBER_PATTERN)
+    numbers = pc.cast(pc.if_else(numeric, strings, pa.scalar(None, strings.type)), pa.float64())
+    return pd.Series(numbers.to_numpy(zero_copy_only=False), index=text.index, name=text.name)
+
+
+@instrument
+def validate_patient_data(df: pd.DataFrame) -> ValidationResult:
+    """
+    Validate a whole patient dataset in one pass.
+    
+    Args:
+        df: Parsed patient rows (see ``DataValidator.validate``).
+        
+    Returns:
+        ValidationResult: Valid and quarantined rows.
+    """
+    return DataValidator().validate(df)
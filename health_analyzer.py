@@ -3,11 +3,28 @@ Health analysis module for patient data.
 Provides functions for analyzing patient health indicators and risk categories.
 """
 
+import functools
+import inspect
+import threading
+import weakref
+
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple, TypeVar, Union
 from dataclasses import dataclass
 
 import config as cfg
+from column_store import ColumnStore
+from data_loader import PatientIndex
+from instrumentation import instrument
+from quantile_sketch import KLLSketch, describe_table
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Memoized results per dataset: id(DataFrame or ColumnStore) -> {(function, params): result}
+_memo: Dict[int, Dict[Hashable, Any]] = {}
+_memo_lock = threading.Lock()
+_memo_counters = {"hits": 0, "misses": 0}
 
 
 @dataclass
@@ -21,6 +38,86 @@ class HealthStatistics:
     std_kolesterol: float
 
 
+def memoize_by_dataset(func: F) -> F:
+    """
+    Memoize an analysis function per dataset object and parameters.
+    
+    Results are keyed by the identity of the DataFrame (or ColumnStore)
+    argument plus the normalized remaining arguments, and are dropped
+    automatically when that dataset is garbage-collected, e.g. after the
+    data loader reloads a changed file. Datasets are therefore treated as
+    immutable: do not modify a DataFrame, or a memoized result, in place.
+    
+    Args:
+        func: Function taking a dataset as its first argument.
+        
+    Returns:
+        Wrapped function; the original is available as ``__wrapped__``.
+    """
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if not isinstance(df, (pd.DataFrame, ColumnStore)):
+            return func(df, *args, **kwargs)
+        bound = signature.bind(df, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__qualname__, *list(bound.arguments.items())[1:])
+        try:
+            hash(key)
+        except TypeError:
+            return func(df, *args, **kwargs)
+        
+        dataset_id = id(df)
+        with _memo_lock:
+            results = _memo.get(dataset_id)
+            if results is not None and key in results:
+                _memo_counters["hits"] += 1
+                return results[key]
+            _memo_counters["misses"] += 1
+        
+        result = func(df, *args, **kwargs)
+        with _memo_lock:
+            if dataset_id not in _memo:
+                _memo[dataset_id] = {}
+                weakref.finalize(df, _forget_dataset, dataset_id)
+            _memo[dataset_id][key] = result
+        return result
+    
+    return wrapper
+
+
+def _forget_dataset(dataset_id: int) -> None:
+    """
+    Drop the memoized results of a garbage-collected dataset.
+    
+    Runs as a finalizer, possibly while ``_memo_lock`` is held by the
+    same thread, so it relies on ``dict.pop`` being atomic instead.
+    """
+    _memo.pop(dataset_id, None)
+
+
+def clear_analysis_cache() -> None:
+    """Drop all memoized analysis results."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def get_analysis_cache_stats() -> Dict[str, int]:
+    """
+    Get hit/miss counters of the memoized analysis functions.
+    
+    Returns:
+        Dict with hits, misses, datasets and results.
+    """
+    with _memo_lock:
+        return {
+            **_memo_counters,
+            "datasets": len(_memo),
+            "results": sum(len(results) for results in list(_memo.values())),
+        }
+
+
 def categorize_tekanan_darah(value: float) -> str:
     """
     Categorize blood pressure value into risk level.
@@ -72,16 +169,178 @@ def categorize_kolesterol(value: float) -> str:
     return cfg.RISK_NORMAL
 
 
-def calculate_statistics(df: pd.DataFrame) -> HealthStatistics:
+def _to_numeric_array(data: Union[pd.Series, pd.DataFrame]) -> np.ndarray:
+    """
+    Convert numeric pandas data to a NumPy array without needless copies.
+    
+    Plain NumPy-backed columns are returned as-is; nullable or mixed
+    columns are converted to float64 with missing values as NaN so that
+    every comparison against a threshold evaluates to False, exactly like
+    the scalar categorize functions.
+    
+    Args:
+        data: Series or DataFrame with numeric values.
+        
+    Returns:
+        np.ndarray: Numeric array (1-D for Series, 2-D for DataFrame).
+    """
+    dtypes = [data.dtype] if isinstance(data, pd.Series) else list(data.dtypes)
+    if all(
+        isinstance(dtype, np.dtype) and pd.api.types.is_numeric_dtype(dtype)
+        for dtype in dtypes
+    ):
+        return data.to_numpy()
+    return data.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+@instrument
+def categorize_values(
+    values: Union[pd.Series, np.ndarray],
+    normal_max: float,
+    risiko_tinggi_max: float
+) -> np.ndarray:
+    """
+    Vectorized categorization of indicator values into ordinal risk codes.
+    
+    Applies the same rules as the scalar categorize functions
+    (``> risiko_tinggi_max`` → Risiko Tinggi, ``>= normal_max`` →
+    Perlu Waspada, otherwise Normal) to a whole array at once.
+    
+    Args:
+        values: Indicator values.
+        normal_max: Lower bound (inclusive) of the Perlu Waspada range.
+        risiko_tinggi_max: Upper bound (inclusive) of the Perlu Waspada range.
+        
+    Returns:
+        np.ndarray: int8 codes indexing into ``cfg.RISK_LEVELS``.
+    """
+    arr = _to_numeric_array(values) if isinstance(values, pd.Series) else np.asarray(values)
+    codes = (arr >= normal_max).astype(np.int8)
+    codes[arr > risiko_tinggi_max] = cfg.RISK_CODE_RISIKO_TINGGI
+    return codes
+
+
+@instrument
+def compute_risk_codes(
+    df: Union[pd.DataFrame, ColumnStore],
+    columns: Sequence[str] = tuple(cfg.HEALTH_COLUMNS)
+) -> np.ndarray:
+    """
+    Bin several health indicators in a single NumPy pass.
+    
+    The indicator columns are compared as one 2-D block against
+    per-column threshold vectors from ``cfg.INDICATOR_THRESHOLDS``. A
+    ColumnStore is binned column by column straight from its memory
+    maps, so its columns are never stacked into a copy.
+    
+    Args:
+        df: Patient DataFrame or ColumnStore.
+        columns: Indicator columns to categorize.
+        
+    Returns:
+        np.ndarray: int8 array of shape (len(df), len(columns)).
+    """
+    columns = list(columns)
+    if isinstance(df, ColumnStore):
+        codes = np.empty((len(df), len(columns)), dtype=np.int8)
+        for i, column in enumerate(columns):
+            codes[:, i] = categorize_values(df[column], *cfg.INDICATOR_THRESHOLDS[column])
+        return codes
+    normal_max = np.array([cfg.INDICATOR_THRESHOLDS[c][0] for c in columns])
+    risiko_tinggi_max = np.array([cfg.INDICATOR_THRESHOLDS[c][1] for c in columns])
+    return categorize_values(_to_numeric_array(df[columns]), normal_max, risiko_tinggi_max)
+
+
+@instrument
+def codes_to_categorical(codes: np.ndarray) -> pd.Categorical:
+    """
+    Wrap ordinal risk codes in an ordered pandas Categorical.
+    
+    Args:
+        codes: Codes indexing into ``cfg.RISK_LEVELS``.
+        
+    Returns:
+        pd.Categorical: Ordered categorical of risk category labels.
+    """
+    return pd.Categorical.from_codes(
+        codes, categories=list(cfg.RISK_LEVELS), ordered=True
+    )
+
+
+@instrument
+def categorize_indicators(
+    df: Union[pd.DataFrame, ColumnStore],
+    as_codes: bool = False
+) -> Dict[str, Union[np.ndarray, pd.Categorical]]:
+    """
+    Categorize all health indicators at once.
+    
+    Args:
+        df: Patient DataFrame or ColumnStore.
+        as_codes: Return raw int8 codes instead of Categoricals.
+        
+    Returns:
+        Dict mapping category column name to codes or Categorical.
+    """
+    codes = compute_risk_codes(df, cfg.HEALTH_COLUMNS)
+    return {
+        cfg.INDICATOR_CATEGORY_COLUMNS[column]: (
+            codes[:, i] if as_codes else codes_to_categorical(codes[:, i])
+        )
+        for i, column in enumerate(cfg.HEALTH_COLUMNS)
+    }
+
+
+def _array_mean_std(values: np.ndarray, block_rows: int = 1 << 20) -> Tuple[float, float]:
+    """
+    Mean and sample standard deviation of a (memory-mapped) array.
+    
+    Two passes like pandas, with the squared deviations summed block by
+    block so that no float64 copy of the whole column is made.
+    
+    Args:
+        values: Numeric values without missing entries.
+        block_rows: Rows per block of the second pass.
+        
+    Returns:
+        Tuple of mean and std (ddof=1); NaN where undefined.
+    """
+    if not len(values):
+        return np.nan, np.nan
+    mean = float(np.mean(values, dtype=np.float64))
+    if len(values) < 2:
+        return mean, np.nan
+    squares = 0.0
+    for start in range(0, len(values), block_rows):
+        deviations = values[start:start + block_rows] - mean
+        squares += float(np.dot(deviations, deviations))
+    return mean, float(np.sqrt(squares / (len(values) - 1)))
+
+
+@instrument
+@memoize_by_dataset
+def calculate_statistics(df: Union[pd.DataFrame, ColumnStore]) -> HealthStatistics:
     """
     Calculate statistics for all health indicators.
     
     Args:
-        df: Patient DataFrame.
+        df: Patient DataFrame or ColumnStore.
         
     Returns:
         HealthStatistics: Object containing mean and std values.
     """
+    if isinstance(df, ColumnStore):
+        (mean_tekanan, std_tekanan), (mean_gula, std_gula), (mean_kolesterol, std_kolesterol) = (
+            _array_mean_std(df[column]) for column in cfg.HEALTH_COLUMNS
+        )
+        return HealthStatistics(
+            mean_tekanan=mean_tekanan,
+            mean_gula=mean_gula,
+            mean_kolesterol=mean_kolesterol,
+            std_tekanan=std_tekanan,
+            std_gula=std_gula,
+            std_kolesterol=std_kolesterol,
+        )
     return HealthStatistics(
         mean_tekanan=df[cfg.COLUMN_TEKANAN_DARAH].mean(),
         mean_gula=df[cfg.COLUMN_GULA_DARAH].mean(),
@@ -92,18 +351,24 @@ def calculate_statistics(df: pd.DataFrame) -> HealthStatistics:
     )
 
 
-def get_patient_summary(df: pd.DataFrame) -> Dict[str, int]:
+@instrument
+@memoize_by_dataset
+def get_patient_summary(df: Union[pd.DataFrame, ColumnStore]) -> Dict[str, int]:
     """
     Get summary statistics about the patient dataset.
     
     Args:
-        df: Patient DataFrame.
+        df: Patient DataFrame or ColumnStore.
         
     Returns:
         Dict containing patient summary statistics.
     """
+    if isinstance(df, ColumnStore):
+        unique_patients = df.unique_patients
+    else:
+        unique_patients = df[cfg.COLUMN_ID_PASIEN].nunique()
     return {
-        "unique_patients": df[cfg.COLUMN_ID_PASIEN].nunique(),
+        "unique_patients": unique_patients,
         "min_age": df[cfg.COLUMN_UMUR].min(),
         "max_age": df[cfg.COLUMN_UMUR].max(),
         "mean_age": df[cfg.COLUMN_UMUR].mean(),
@@ -112,10 +377,14 @@ def get_patient_summary(df: pd.DataFrame) -> Dict[str, int]:
     }
 
 
+@instrument
 def add_risk_categories(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add risk category columns to the DataFrame without modifying original.
     
+    Categories are computed with the vectorized engine and stored as
+    ordered Categoricals of ``cfg.RISK_LEVELS``.
+    
     Args:
         df: Patient DataFrame.
         
@@ -124,19 +393,13 @@ def add_risk_categories(df: pd.DataFrame) -> pd.DataFrame:
     """
     result_df = df.copy()
     
-    result_df[cfg.CAT_TEKANAN] = result_df[cfg.COLUMN_TEKANAN_DARAH].apply(
-        categorize_tekanan_darah
-    )
-    result_df[cfg.CAT_GULA] = result_df[cfg.COLUMN_GULA_DARAH].apply(
-        categorize_gula_darah
-    )
-    result_df[cfg.CAT_KOLESTEROL] = result_df[cfg.COLUMN_KOLESTEROL].apply(
-        categorize_kolesterol
-    )
+    for column, categories in categorize_indicators(result_df).items():
+        result_df[column] = categories
     
     return result_df
 
 
+@instrument
 def calculate_final_risk_category(df: pd.DataFrame) -> pd.DataFrame:
     """
     Calculate overall risk category based on all indicators.
@@ -146,34 +409,97 @@ def calculate_final_risk_category(df: pd.DataFrame) -> pd.DataFrame:
     - If any indicator is "Perlu Waspada" → Perlu Waspada
     - Otherwise → Normal
     
+    Computed as the row-wise maximum of the ordinal codes; prefer
+    ``compute_risk_pipeline`` when starting from raw indicator values.
+    
     Args:
         df: Patient DataFrame with risk category columns.
         
     Returns:
         pd.DataFrame: DataFrame with final risk category added.
     """
-    result_df = df.copy()
-    result_df[cfg.CAT_AKHIR] = cfg.RISK_NORMAL
+    codes = np.column_stack([
+        _category_codes(df[column])
+        for column in (cfg.CAT_TEKANAN, cfg.CAT_GULA, cfg.CAT_KOLESTEROL)
+    ])
     
-    # Check for high risk first (takes priority)
-    kondisi_tinggi = (
-        (result_df[cfg.CAT_TEKANAN] == cfg.RISK_RISIKO_TINGGI) |
-        (result_df[cfg.CAT_GULA] == cfg.RISK_RISIKO_TINGGI) |
-        (result_df[cfg.CAT_KOLESTEROL] == cfg.RISK_RISIKO_TINGGI)
+    result_df = df.copy()
+    result_df[cfg.CAT_AKHIR] = codes_to_categorical(
+        np.maximum(codes.max(axis=1), cfg.RISK_CODE_NORMAL)
     )
-    result_df.loc[kondisi_tinggi, cfg.CAT_AKHIR] = cfg.RISK_RISIKO_TINGGI
+    return result_df
+
+
+def _category_codes(categories: pd.Series) -> np.ndarray:
+    """
+    Get ordinal risk codes from a category column.
     
-    # Check for warning
-    kondisi_waspada = (
-        (result_df[cfg.CAT_TEKANAN] == cfg.RISK_PERLU_WASPADA) |
-        (result_df[cfg.CAT_GULA] == cfg.RISK_PERLU_WASPADA) |
-        (result_df[cfg.CAT_KOLESTEROL] == cfg.RISK_PERLU_WASPADA)
-    )
-    result_df.loc[kondisi_waspada, cfg.CAT_AKHIR] = cfg.RISK_PERLU_WASPADA
+    Columns produced by the vectorized engine already carry the codes;
+    plain string columns are encoded against ``cfg.RISK_LEVELS``, with
+    unknown labels mapped to -1.
     
-    return result_df
+    Args:
+        categories: Risk category column.
+        
+    Returns:
+        np.ndarray: Ordinal codes.
+    """
+    if (
+        isinstance(categories.dtype, pd.CategoricalDtype)
+        and tuple(categories.cat.categories) == cfg.RISK_LEVELS
+    ):
+        return categories.cat.codes.to_numpy()
+    return pd.Categorical(categories, categories=list(cfg.RISK_LEVELS)).codes
+
+
+@instrument
+def compute_risk_pipeline(
+    df: Union[pd.DataFrame, ColumnStore],
+    columns_only: bool = False
+) -> pd.DataFrame:
+    """
+    Compute per-indicator and final risk categories in one fused pass.
+    
+    Indicator codes come from a single NumPy pass and the final category
+    is their row-wise ordinal maximum, so no string comparisons or
+    intermediate DataFrame copies are made. The category columns are
+    memoized per dataset; the copy of ``df`` with them added is not, so
+    it is freed as soon as the caller drops it.
+    
+    Args:
+        df: Patient DataFrame, or a ColumnStore with ``columns_only``.
+        columns_only: Return only the four category columns (sharing the
+            index of ``df``) instead of a copy of ``df`` with them added.
+            
+    Returns:
+        pd.DataFrame: Category columns, optionally alongside the original data.
+        
+    Raises:
+        ValueError: If ``df`` is a ColumnStore and ``columns_only`` is False.
+    """
+    if isinstance(df, ColumnStore) and not columns_only:
+        raise ValueError("A ColumnStore can only be categorized with columns_only=True")
+    categories = _risk_category_columns(df)
+    if columns_only:
+        return categories
+    return df.assign(**{column: categories[column] for column in categories.columns})
+
+
+@memoize_by_dataset
+def _risk_category_columns(df: Union[pd.DataFrame, ColumnStore]) -> pd.DataFrame:
+    """Get the four category columns of ``compute_risk_pipeline``, indexed like ``df``."""
+    codes = compute_risk_codes(df, cfg.HEALTH_COLUMNS)
+    
+    columns = {
+        cfg.INDICATOR_CATEGORY_COLUMNS[column]: codes_to_categorical(codes[:, i])
+        for i, column in enumerate(cfg.HEALTH_COLUMNS)
+    }
+    columns[cfg.CAT_AKHIR] = codes_to_categorical(codes.max(axis=1))
+    return pd.DataFrame(columns, index=df.index)
 
 
+@instrument
+@memoize_by_dataset
 def get_risk_distribution(df: pd.DataFrame) -> pd.Series:
     """
     Get the distribution of risk categories.
@@ -184,9 +510,11 @@ def get_risk_distribution(df: pd.DataFrame) -> pd.Series:
     Returns:
         pd.Series: Count of patients in each risk category.
     """
-    return df.groupby(cfg.CAT_AKHIR)[cfg.COLUMN_ID_PASIEN].count()
+    return _count_patients(df, cfg.CAT_AKHIR)
 
 
+@instrument
+@memoize_by_dataset
 def get_indicator_counts(
     df: pd.DataFrame, 
     category_column: str
@@ -201,57 +529,354 @@ def get_indicator_counts(
     Returns:
         pd.Series: Count of patients in each category.
     """
-    return df.groupby(category_column)[cfg.COLUMN_ID_PASIEN].count()
+    return _count_patients(df, category_column)
+
+
+def _count_patients(df: pd.DataFrame, category_column: str) -> pd.Series:
+    """
+    Count the ``id_pasien`` values per category.
+    
+    Frames from ``compute_risk_pipeline(columns_only=True)`` carry no
+    ``id_pasien``; their rows are counted instead, which is the same for
+    loaded data since validation never lets a missing ``id_pasien`` through.
+    """
+    grouped = df.groupby(category_column, observed=True)
+    if cfg.COLUMN_ID_PASIEN in df:
+        return grouped[cfg.COLUMN_ID_PASIEN].count()
+    return grouped.size().rename(cfg.COLUMN_ID_PASIEN)
 
 
-def get_daily_averages(df: pd.DataFrame) -> pd.DataFrame:
+@instrument
+@memoize_by_dataset
+def get_daily_averages(df: Union[pd.DataFrame, ColumnStore]) -> pd.DataFrame:
     """
     Calculate daily averages for all health indicators.
     
     Args:
-        df: Patient DataFrame.
+        df: Patient DataFrame or ColumnStore.
         
     Returns:
         pd.DataFrame: Daily averages indexed by date.
     """
+    if isinstance(df, ColumnStore):
+        return _store_period_averages(df, "D")
     return df.groupby(cfg.COLUMN_TANGGAL_PERIKSA)[
         [cfg.COLUMN_TEKANAN_DARAH, cfg.COLUMN_GULA_DARAH, cfg.COLUMN_KOLESTEROL]
     ].mean()
 
 
+@instrument
+@memoize_by_dataset
+def get_period_averages(df: Union[pd.DataFrame, ColumnStore], freq: str = "D") -> pd.DataFrame:
+    """
+    Calculate health indicator averages per day, week or month.
+    
+    Each period's average is taken over all of its exams, not over the
+    daily averages, so busy days weigh more than quiet ones.
+    
+    Args:
+        df: Patient DataFrame or ColumnStore.
+        freq: "D" (daily), "W" (weekly, Monday-Sunday) or "M" (monthly).
+        
+    Returns:
+        pd.DataFrame: Averages indexed by the first date of each period.
+        
+    Raises:
+        ValueError: If ``freq`` is not one of ``cfg.TREND_FREQUENCIES``.
+    """
+    if freq not in cfg.TREND_FREQUENCIES:
+        raise ValueError(
+            f"Unsupported frequency {freq!r}, "
+            f"expected one of {list(cfg.TREND_FREQUENCIES)}"
+        )
+    if freq == "D":
+        return get_daily_averages(df)
+    if isinstance(df, ColumnStore):
+        return _store_period_averages(df, freq)
+    dates = df[cfg.COLUMN_TANGGAL_PERIKSA]
+    periods = dates.dt.to_period(freq).dt.start_time.rename(cfg.COLUMN_TANGGAL_PERIKSA)
+    return df.groupby(periods)[cfg.HEALTH_COLUMNS].mean()
+
+
+def _store_period_averages(store: ColumnStore, freq: str) -> pd.DataFrame:
+    """
+    Period averages of a ColumnStore via per-day bincounts.
+    
+    One O(n) pass reduces the rows to an exam count and indicator sums
+    per calendar day; days are then grouped into periods, so nothing is
+    sorted and only the day arrays are materialized.
+    
+    Args:
+        store: Patient ColumnStore.
+        freq: One of ``cfg.TREND_FREQUENCIES``.
+        
+    Returns:
+        pd.DataFrame: Same result as the DataFrame path.
+    """
+    dates = store[cfg.COLUMN_TANGGAL_PERIKSA]
+    dated = ~np.isnat(dates)
+    everything_dated = bool(dated.all())
+    if not everything_dated:
+        dates = dates[dated]
+    if not len(dates):
+        return pd.DataFrame(
+            columns=cfg.HEALTH_COLUMNS,
+            index=pd.DatetimeIndex([], name=cfg.COLUMN_TANGGAL_PERIKSA),
+            dtype=np.float64,
+        )
+    
+    first = dates.min()
+    days = (dates - first).astype(np.intp)
+    n_days = int(days.max()) + 1
+    counts = np.bincount(days, minlength=n_days)
+    sums = np.column_stack([
+        np.bincount(
+            days,
+            weights=store[column] if everything_dated else store[column][dated],
+            minlength=n_days,
+        )
+        for column in cfg.HEALTH_COLUMNS
+    ])
+    
+    starts = pd.DatetimeIndex((first + np.arange(n_days)).astype("datetime64[ns]"))
+    if freq != "D":
+        starts = starts.to_period(freq).start_time
+        keys, groups = np.unique(starts.to_numpy(), return_inverse=True)
+        counts = np.bincount(groups, weights=counts)
+        sums = np.column_stack([
+            np.bincount(groups, weights=sums[:, i]) for i in range(sums.shape[1])
+        ])
+        starts = pd.DatetimeIndex(keys)
+    
+    observed = counts > 0
+    return pd.DataFrame(
+        sums[observed] / counts[observed, None],
+        index=starts[observed].rename(cfg.COLUMN_TANGGAL_PERIKSA),
+        columns=cfg.HEALTH_COLUMNS,
+    )
+
+
+def compute_risk_score(values: pd.DataFrame) -> pd.Series:
+    """
+    Composite risk score across the health indicators.
+    
+    Each indicator is scaled so that its Normal limit maps to 0 and its
+    Risiko Tinggi limit to 1; the score is the mean over the available
+    indicators, so higher is worse and values above 1 are beyond the
+    Risiko Tinggi range on average.
+    
+    Args:
+        values: DataFrame with the ``cfg.HEALTH_COLUMNS`` (rows or means).
+        
+    Returns:
+        pd.Series: Score per row, named ``cfg.COLUMN_SKOR_RISIKO``.
+    """
+    normal_max = np.array([cfg.INDICATOR_THRESHOLDS[c][0] for c in cfg.HEALTH_COLUMNS])
+    risiko_tinggi_max = np.array([cfg.INDICATOR_THRESHOLDS[c][1] for c in cfg.HEALTH_COLUMNS])
+    scaled = (
+        values[cfg.HEALTH_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan) - normal_max
+    ) / (risiko_tinggi_max - normal_max)
+    with np.errstate(invalid="ignore"):
+        score = np.nanmean(scaled, axis=1) if len(scaled) else np.empty(0)
+    return pd.Series(score, index=values.index, name=cfg.COLUMN_SKOR_RISIKO)
+
+
+def select_top_patients(
+    patients: pd.DataFrame,
+    n: int = cfg.TOP_PATIENTS_COUNT,
+    by: str = cfg.TOP_PATIENTS_RANK_BY
+) -> pd.DataFrame:
+    """
+    Select the n highest-ranked rows of a per-patient table.
+    
+    Uses partial selection (``nlargest``, O(P) for P patients) instead of
+    sorting every patient. Ties are broken by patient ID, so the result
+    does not depend on the row order of ``patients``; patients without a
+    value for ``by`` are never selected.
+    
+    Args:
+        patients: Per-patient means indexed by ``id_pasien``.
+        n: Number of patients to return.
+        by: A health indicator column or ``cfg.COLUMN_SKOR_RISIKO``.
+        
+    Returns:
+        pd.DataFrame: Top n patients, highest first.
+        
+    Raises:
+        ValueError: If ``by`` is not a rankable column.
+    """
+    if by not in (*cfg.HEALTH_COLUMNS, cfg.COLUMN_SKOR_RISIKO):
+        raise ValueError(f"Cannot rank patients by {by!r}")
+    if by == cfg.COLUMN_SKOR_RISIKO and by not in patients.columns:
+        patients = patients.assign(**{by: compute_risk_score(patients)})
+    
+    # keep="all" returns every row tied with the n-th one; only those few
+    # rows are then ordered by value and patient ID
+    candidates = patients.nlargest(n, by, keep="all")
+    return candidates.sort_index().sort_values(by, ascending=False, kind="stable").head(n)
+
+
+@instrument
+@memoize_by_dataset
+def get_patient_means(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Get the mean health indicators of every patient.
+    
+    Patients are identified by ``id_pasien``, so different patients who
+    share a name are kept apart.
+    
+    Args:
+        df: Patient DataFrame.
+        
+    Returns:
+        pd.DataFrame: Name and indicator means indexed by ``id_pasien``,
+        in order of first appearance.
+    """
+    grouped = df.groupby(cfg.COLUMN_ID_PASIEN, sort=False, observed=True)
+    means = grouped[cfg.HEALTH_COLUMNS].mean()
+    means.insert(0, cfg.COLUMN_NAMA, grouped[cfg.COLUMN_NAMA].first())
+    return means
+
+
+@instrument
+@memoize_by_dataset
 def get_top_risk_patients(
     df: pd.DataFrame, 
-    n: int = cfg.TOP_PATIENTS_COUNT
+    n: int = cfg.TOP_PATIENTS_COUNT,
+    by: str = cfg.TOP_PATIENTS_RANK_BY
 ) -> pd.DataFrame:
     """
-    Get top N patients with highest blood pressure.
+    Get top N patients with the highest mean of an indicator.
     
     Args:
         df: Patient DataFrame.
         n: Number of patients to return.
-        
+        by: Health indicator column to rank by (blood pressure by
+            default) or ``cfg.COLUMN_SKOR_RISIKO`` for the composite score.
+            
     Returns:
-        pd.DataFrame: Top N patients sorted by blood pressure.
+        pd.DataFrame: Top N patients indexed by ``id_pasien`` with name
+        and indicator means, highest first.
+        
+    Raises:
+        ValueError: If ``by`` is not a rankable column.
     """
-    pasien_stats = df.groupby(cfg.COLUMN_NAMA)[
-        [cfg.COLUMN_TEKANAN_DARAH, cfg.COLUMN_GULA_DARAH, cfg.COLUMN_KOLESTEROL]
-    ].mean()
-    
-    return pasien_stats.sort_values(
-        cfg.COLUMN_TEKANAN_DARAH, 
-        ascending=False
-    ).head(n)
+    return select_top_patients(get_patient_means(df), n, by)
 
 
-def get_all_statistics(df: pd.DataFrame) -> pd.DataFrame:
+@instrument
+@memoize_by_dataset
+def get_all_statistics(df: pd.DataFrame, approximate: bool = False) -> pd.DataFrame:
     """
     Get complete statistics for health indicators.
     
     Args:
         df: Patient DataFrame.
-        
+        approximate: Estimate the quartiles with quantile sketches (one
+            pass, no sort) within ``cfg.QUANTILE_SKETCH_EPSILON`` of
+            their rank instead of computing them exactly.
+            
     Returns:
         pd.DataFrame: Descriptive statistics.
     """
-    return df[cfg.HEALTH_COLUMNS].describe()
+    values = df[cfg.HEALTH_COLUMNS]
+    if not approximate:
+        return values.describe()
+    sketches = {}
+    for column in cfg.HEALTH_COLUMNS:
+        sketches[column] = KLLSketch()
+        sketches[column].update(_to_numeric_array(values[column]))
+    moments = values.agg(["count", "mean", "std", "min", "max"]).astype("float64")
+    return describe_table(moments, sketches)
+
 
+def _segment_features(
+    data: pd.DataFrame,
+    starts: np.ndarray,
+    patient_ids: pd.Index
+) -> pd.DataFrame:
+    """Features of consecutive patient row ranges beginning at ``starts``."""
+    counts = np.diff(np.append(starts, len(data)))
+    dates = data[cfg.COLUMN_TANGGAL_PERIKSA].to_numpy(dtype="datetime64[ns]")
+    dated = ~np.isnat(dates)
+    n_dated = np.add.reduceat(dated.astype(np.int64), starts)
+    
+    # Undated rows sort last within a patient
+    nat = np.datetime64("NaT", "ns")
+    first = np.where(n_dated > 0, dates[starts], nat)
+    last = np.where(n_dated > 0, dates[starts + np.maximum(n_dated - 1, 0)], nat)
+    features: Dict[str, np.ndarray] = {
+        cfg.COLUMN_JUMLAH_KUNJUNGAN: counts,
+        cfg.COLUMN_PERIKSA_PERTAMA: first,
+        cfg.COLUMN_PERIKSA_TERAKHIR: last,
+    }
+    
+    # Days since the patient's first exam keep the slope sums well conditioned
+    days = (dates - np.repeat(first, counts)) / np.timedelta64(1, "D")
+    positions = np.arange(len(data))
+    for column in cfg.HEALTH_COLUMNS:
+        values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = dated & ~np.isnan(values)
+        
+        last_valid = np.maximum.reduceat(np.where(valid, positions, -1), starts)
+        features[column + cfg.FEATURE_LATEST_SUFFIX] = np.where(
+            last_valid >= 0, values[last_valid], np.nan
+        )
+        
+        # Least-squares slope from per-patient sums, scaled to change per year
+        t = np.where(valid, days, 0.0)
+        y = np.where(valid, values, 0.0)
+        n, sum_t, sum_y, sum_tt, sum_ty = (
+            np.add.reduceat(a, starts)
+            for a in (valid.astype(np.float64), t, y, t * t, t * y)
+        )
+        denominator = n * sum_tt - sum_t * sum_t
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (n * sum_ty - sum_t * sum_y) / denominator * 365.25
+        features[cfg.FEATURE_TREND_PREFIX + column] = np.where(
+            (n >= 2) & (denominator > 0), slope, np.nan
+        )
+    return pd.DataFrame(features, index=patient_ids)
+
+
+@instrument
+def get_patient_features(
+    index: PatientIndex,
+    patient_ids: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Longitudinal features per patient, computed in one vectorized pass.
+    
+    The patients' contiguous row ranges in ``index`` are reduced with
+    ``np.ufunc.reduceat`` instead of a groupby.
+    
+    Args:
+        index: Patient index of the dataset.
+        patient_ids: Only compute these patients, e.g. for a history
+            lookup. Defaults to every patient.
+            
+    Returns:
+        pd.DataFrame: Indexed by ``id_pasien``: visit count, first and last
+        exam date, the latest value of each indicator and its trend as the
+        least-squares change per year (NaN with fewer than two dated
+        values of the indicator).
+        
+    Raises:
+        KeyError: If a requested patient is not in the dataset.
+    """
+    if patient_ids is None:
+        return _segment_features(index.data, index.offsets[:-1], index.patient_ids)
+    
+    ranges = [index.row_range(patient_id) for patient_id in patient_ids]
+    lengths = np.array([r.stop - r.start for r in ranges], dtype=np.int64)
+    if len(ranges) == 1:
+        data = index.data.iloc[ranges[0]]
+    else:
+        data = index.data.iloc[np.concatenate(
+            [np.arange(r.start, r.stop) for r in ranges] or [np.empty(0, np.int64)]
+        )]
+    return _segment_features(
+        data,
+        np.cumsum(lengths) - lengths,
+        pd.Index(list(patient_ids), name=cfg.COLUMN_ID_PASIEN),
+    )
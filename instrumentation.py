@@ -0,0 +1,425 @@
+"""
+Opt-in instrumentation for the analysis hot paths.
+Records wall time, CPU time, rows processed and peak memory growth of
+each call to an ``@instrument``-ed function, optionally under cProfile,
+and exports them as JSON or in the Chrome trace event format
+(chrome://tracing, Perfetto).
+
+Instrumentation is off by default; a wrapped function then only pays
+for one flag check. This module imports nothing heavy so the CLI can
+load it before deciding whether pandas is needed.
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class CallRecord:
+    """Measurements of one instrumented call."""
+    name: str
+    start_us: float
+    wall_s: float
+    cpu_s: float
+    rows: Optional[int]
+    peak_memory_bytes: Optional[int]
+    thread_id: int
+    depth: int
+
+
+@dataclass(eq=False)
+class _Frame:
+    """An instrumented call in progress."""
+    base_memory: int = 0
+    peak_memory: int = 0
+
+
+@dataclass
+class _State:
+    enabled: bool = False
+    trace_memory: bool = False
+    started_tracemalloc: bool = False
+    profiler: Any = None
+    origin_ns: int = 0
+    records: List[CallRecord] = field(default_factory=list)
+
+
+_state = _State()
+_records_lock = threading.Lock()
+_local = threading.local()
+
+
+def _stack() -> List[_Frame]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    """Number of rows of a DataFrame, Series or array; None otherwise."""
+    shape = getattr(value, "shape", None)
+    if isinstance(shape, tuple) and shape:
+        return int(shape[0])
+    return None
+
+
+def _rows_processed(args: tuple, kwargs: dict, result: Any) -> Optional[int]:
+    """Rows of the first tabular argument, or of the result for loaders."""
+    for value in (*args, *kwargs.values()):
+        rows = _count_rows(value)
+        if rows is not None:
+            return rows
+    return _count_rows(result)
+
+
+def is_enabled() -> bool:
+    """Whether calls are currently being recorded."""
+    return _state.enabled
+
+
+def enable(memory: bool = True, profile: bool = False) -> None:
+    """
+    Start recording instrumented calls.
+    
+    Args:
+        memory: Track the peak memory growth of each call with
+            tracemalloc (Python and NumPy allocations). Slows down
+            allocation-heavy code.
+        profile: Also run cProfile over the calling thread.
+    """
+    if _state.enabled:
+        return
+    _state.origin_ns = _state.origin_ns or time.perf_counter_ns()
+    _state.trace_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _state.started_tracemalloc = True
+    if profile:
+        import cProfile
+        
+        _state.profiler = _state.profiler or cProfile.Profile()
+        _state.profiler.enable()
+    _state.enabled = True
+
+
+def disable() -> None:
+    """Stop recording; collected records and profile are kept."""
+    if not _state.enabled:
+        return
+    _state.enabled = False
+    if _state.profiler is not None:
+        _state.profiler.disable()
+    if _state.started_tracemalloc:
+        tracemalloc.stop()
+        _state.started_tracemalloc = False
+
+
+def reset() -> None:
+    """Drop all collected records and the cProfile data."""
+    with _records_lock:
+        _state.records.clear()
+    _state.origin_ns = time.perf_counter_ns() if _state.enabled else 0
+    if _state.profiler is not None and not _state.enabled:
+        _state.profiler = None
+
+
+@contextmanager
+def instrumented(memory: bool = True, profile: bool = False) -> Iterator[None]:
+    """Record instrumented calls made inside the ``with`` block."""
+    was_enabled = _state.enabled
+    enable(memory, profile)
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def get_records() -> List[CallRecord]:
+    """
+    Get the recorded calls.
+    
+    Returns:
+        List[CallRecord]: Records in completion order.
+    """
+    with _records_lock:
+        return list(_state.records)
+
+
+def _begin() -> _Frame:
+    frame = _Frame()
+    if _state.trace_memory and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        # The peak is reset below; carry it into the enclosing calls first
+        for outer in _stack():
+            outer.peak_memory = max(outer.peak_memory, peak)
+        tracemalloc.reset_peak()
+        frame.base_memory = frame.peak_memory = current
+    _stack().append(frame)
+    return frame
+
+
+def _end(
+    name: str,
+    frame: _Frame,
+    start_ns: int,
+    start_cpu: float,
+    rows: Optional[int]
+) -> None:
+    end_ns = time.perf_counter_ns()
+    cpu = time.thread_time() - start_cpu
+    stack = _stack()
+    # A generator closed late may not be the innermost call any more
+    if frame in stack:
+        stack.remove(frame)
+    
+    peak_memory = None
+    if _state.trace_memory and tracemalloc.is_tracing():
+        frame.peak_memory = max(frame.peak_memory, tracemalloc.get_traced_memory()[1])
+        peak_memory = frame.peak_memory - frame.base_memory
+        if stack:
+            stack[-1].peak_memory = max(stack[-1].peak_memory, frame.peak_memory)
+    
+    record = CallRecord(
+        name=name,
+        start_us=(start_ns - _state.origin_ns) / 1000,
+        wall_s=(end_ns - start_ns) / 1e9,
+        cpu_s=cpu,
+        rows=rows,
+        peak_memory_bytes=peak_memory,
+        thread_id=threading.get_ident(),
+        depth=len(stack),
+    )
+    with _records_lock:
+        _state.records.append(record)
+
+
+def instrument(func: F) -> F:
+    """
+    Record calls to ``func`` while instrumentation is enabled.
+    
+    Generator functions are measured from the first to the last item,
+    with rows summed over the yielded chunks.
+    
+    Args:
+        func: Function to wrap.
+        
+    Returns:
+        The wrapped function.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    
+    if inspect.isgeneratorfunction(func):
+    
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not _state.enabled:
+                yield from func(*args, **kwargs)
+                return
+            frame = _begin()
+            start_ns, start_cpu = time.perf_counter_ns(), time.thread_time()
+            rows = 0
+            try:
+                for item in func(*args, **kwargs):
+                    rows += _count_rows(item) or 0
+                    yield item
+            finally:
+                _end(name, frame, start_ns, start_cpu, rows)
+        
+        return generator_wrapper  # type: ignore[return-value]
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _state.enabled:
+            return func(*args, **kwargs)
+        frame = _begin()
+        start_ns, start_cpu = time.perf_counter_ns(), time.thread_time()
+        result = None
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            _end(name, frame, start_ns, start_cpu, _rows_processed(args, kwargs, result))
+    
+    return wrapper  # type: ignore[return-value]
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Record the ``with`` block as one call, e.g. a whole menu action.
+    
+    Args:
+        name: Name shown for the block.
+    """
+    if not _state.enabled:
+        yield
+        return
+    frame = _begin()
+    start_ns, start_cpu = time.perf_counter_ns(), time.thread_time()
+    try:
+        yield
+    finally:
+        _end(name, frame, start_ns, start_cpu, None)
+
+
+def summarize() -> List[Dict[str, Any]]:
+    """
+    Aggregate the records per function.
+    
+    Returns:
+        List[Dict[str, Any]]: Calls, total/max wall and CPU seconds,
+        rows and largest peak memory growth per name, slowest first.
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    for record in get_records():
+        entry = totals.setdefault(record.name, {
+            "name": record.name, "calls": 0, "wall_s": 0.0, "max_wall_s": 0.0,
+            "cpu_s": 0.0, "rows": 0, "max_peak_memory_bytes": None,
+        })
+        entry["calls"] += 1
+        entry["wall_s"] += record.wall_s
+        entry["max_wall_s"] = max(entry["max_wall_s"], record.wall_s)
+        entry["cpu_s"] += record.cpu_s
+        entry["rows"] += record.rows or 0
+        if record.peak_memory_bytes is not None:
+            entry["max_peak_memory_bytes"] = max(
+                entry["max_peak_memory_bytes"] or 0, record.peak_memory_bytes
+            )
+    return sorted(totals.values(), key=lambda entry: entry["wall_s"], reverse=True)
+
+
+def format_summary() -> str:
+    """
+    Format the per-function summary as a text table.
+    
+    Returns:
+        str: One line per function.
+    """
+    lines = [f"{'Fungsi':<46}{'Panggilan':>10}{'Wall (ms)':>12}{'CPU (ms)':>12}{'Baris':>12}{'Memori (MiB)':>14}"]
+    for entry in summarize():
+        memory = entry["max_peak_memory_bytes"]
+        memory_text = f"{memory / 1024 ** 2:.1f}" if memory is not None else "-"
+        lines.append(
+            f"{entry['name']:<46}{entry['calls']:>10}{entry['wall_s'] * 1000:>12.2f}"
+            f"{entry['cpu_s'] * 1000:>12.2f}{entry['rows']:>12,}{memory_text:>14}"
+        )
+    return "\n".join(lines)
+
+
+def export_json(path: Path) -> Path:
+    """
+    Write the records and per-function summary as JSON.
+    
+    Args:
+        path: Target file.
+        
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(
+            {
+                "summary": summarize(),
+                "records": [asdict(record) for record in get_records()],
+            },
+            output,
+            indent=2,
+        )
+    return path
+
+
+def export_chrome_trace(path: Path) -> Path:
+    """
+    Write the records as Chrome trace events.
+    
+    Each call becomes a complete ("X") event on its thread's track, so
+    nested calls show up as a flame chart.
+    
+    Args:
+        path: Target file, loadable in chrome://tracing or Perfetto.
+        
+    Returns:
+        Path: The written file.
+    """
+    pid = os.getpid()
+    events = [
+        {
+            "name": record.name.rsplit(".", 1)[-1],
+            "cat": record.name.rsplit(".", 1)[0],
+            "ph": "X",
+            "ts": record.start_us,
+            "dur": record.wall_s * 1e6,
+            "pid": pid,
+            "tid": record.thread_id,
+            "args": {
+                "cpu_ms": record.cpu_s * 1000,
+                "rows": record.rows,
+                "peak_memory_bytes": record.peak_memory_bytes,
+            },
+        }
+        for record in get_records()
+    ]
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, output)
+    return path
+
+
+def export_profile(path: Path) -> Path:
+    """
+    Write the cProfile data (``enable(profile=True)``) in pstats format.
+    
+    Args:
+        path: Target file, readable with ``pstats`` or snakeviz.
+        
+    Returns:
+        Path: The written file.
+        
+    Raises:
+        RuntimeError: If no profile was captured.
+    """
+    if _state.profiler is None:
+        raise RuntimeError("No cProfile data captured; enable(profile=True) first")
+    path = Path(path)
+    _state.profiler.dump_stats(str(path))
+    return path
+
+
+def export(
+    json_path: Optional[Path] = None,
+    trace_path: Optional[Path] = None,
+    profile_path: Optional[Path] = None
+) -> List[Path]:
+    """
+    Write every requested export format.
+    
+    Args:
+        json_path: Target of ``export_json``.
+        trace_path: Target of ``export_chrome_trace``.
+        profile_path: Target of ``export_profile``.
+        
+    Returns:
+        List[Path]: The written files.
+    """
+    written = []
+    if json_path:
+        written.append(export_json(json_path))
+    if trace_path:
+        written.append(export_chrome_trace(trace_path))
+    if profile_path:
+        written.append(export_profile(profile_path))
+    return written
@@ -1,34 +1,47 @@
 """
 Sistem Analisis Data Pasien dan Tren Kesehatan
 Menu utama untuk mengakses berbagai fitur analisis data pasien.
+
+Modul analisis (pandas) dan visualisasi (matplotlib) diimpor saat menu
+yang membutuhkannya dipilih, sehingga menu tampil tanpa menunggu impor
+tersebut dan menu teks tidak pernah memuat matplotlib. Jalankan
+``python startup_benchmark.py`` untuk memeriksa waktu mulai.
 """
 
-from config import MENU_BORDER_LENGTH
-from data_loader import (
-    load_data_patients, 
-    DataLoadError,
-)
-from health_analyzer import (
-    calculate_statistics,
-    get_patient_summary,
-    add_risk_categories,
-    calculate_final_risk_category,
-    get_risk_distribution,
-    get_indicator_counts,
-    get_daily_averages,
-    get_top_risk_patients,
-    get_all_statistics
-)
-from visualizer import (
-    plot_blood_pressure_trend,
-    plot_blood_sugar_trend,
-    plot_cholesterol_trend,
-    plot_comparison,
-    plot_risk_categories,
-    plot_average_indicators,
-    plot_high_risk_patients
+import argparse
+import math
+from contextlib import nullcontext
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+from config import (
+    CAT_GULA,
+    CAT_KOLESTEROL,
+    CAT_TEKANAN,
+    COLUMN_GULA_DARAH,
+    COLUMN_JUMLAH_KUNJUNGAN,
+    COLUMN_KOLESTEROL,
+    COLUMN_PERIKSA_PERTAMA,
+    COLUMN_PERIKSA_TERAKHIR,
+    COLUMN_TEKANAN_DARAH,
+    FEATURE_LATEST_SUFFIX,
+    FEATURE_TREND_PREFIX,
+    HEALTH_COLUMNS,
+    MENU_BORDER_LENGTH,
+    SQLITE_DB_PATH,
+    STREAM_CHUNK_SIZE,
+    TREND_FREQUENCIES,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+    
+    from health_analyzer import HealthStatistics
+    from sqlite_backend import SQLiteStore
+    from stream_analyzer import StreamingAnalysis
+    from time_series import TrendEngine
+
 
 def print_header(title: str, width: int = MENU_BORDER_LENGTH) -> None:
     """
@@ -68,15 +81,125 @@ def show_menu() -> None:
     print("7. Kategori Risiko")
     print("8. Rata-Rata Indikator")
     print("9. Pasien Risiko Tinggi")
-    print("10. Keluar")
+    print("10. Riwayat Pasien")
+    print("11. Keluar")
     print("=" * MENU_BORDER_LENGTH)
 
 
+# Rows per chunk when running in streaming mode (--stream); None loads the
+# whole dataset into memory.
+_stream_chunksize: Optional[int] = None
+
+# Whether the streaming mode quarantines repeated exams (--check-duplicates),
+# which keeps 8 bytes per row in memory.
+_stream_check_duplicates = False
+
+# SQLite database answering the analyses as SQL queries (--sqlite); takes
+# precedence over _stream_chunksize.
+_sqlite_path: Optional[Path] = None
+
+# Averaging period of the trend charts (--trend-freq), a TREND_FREQUENCIES key
+_trend_freq = "D"
+
+# Rolling window in days of the trend charts (--rolling-window); None plots
+# the averages per _trend_freq period instead.
+_rolling_window: Optional[int] = None
+
+# Whether menu actions are recorded by the instrumentation module
+# (--trace-out, --profile-out or --cprofile-out).
+_instrumented = False
+
+
+@lru_cache(maxsize=1)
+def _get_stream_analysis(chunksize: int, check_duplicates: bool) -> "StreamingAnalysis":
+    """Run the streaming analysis once per chunk size and duplicate check."""
+    from stream_analyzer import analyze_csv_stream
+    
+    return analyze_csv_stream(chunksize=chunksize, check_duplicates=check_duplicates)
+
+
+def _get_aggregates() -> Optional[Union["StreamingAnalysis", "SQLiteStore"]]:
+    """Get the SQLite store or streaming analysis, or None when analyzing in memory."""
+    if _sqlite_path:
+        from sqlite_backend import SQLiteStore
+        
+        return SQLiteStore(_sqlite_path)
+    if _stream_chunksize:
+        return _get_stream_analysis(_stream_chunksize, _stream_check_duplicates)
+    return None
+
+
+def _get_statistics() -> "HealthStatistics":
+    """Get health statistics from memory, SQLite or the streaming analysis."""
+    aggregates = _get_aggregates()
+    if aggregates is not None:
+        return aggregates.statistics()
+    from data_loader import load_data_patients
+    from health_analyzer import calculate_statistics
+    
+    return calculate_statistics(load_data_patients())
+
+
+def _get_daily_averages() -> "pd.DataFrame":
+    """Get trend averages per ``_trend_freq`` (or rolling) from memory, SQLite or streaming."""
+    if _rolling_window:
+        return _get_trend_engine().rolling(_rolling_window)[HEALTH_COLUMNS]
+    aggregates = _get_aggregates()
+    if aggregates is not None:
+        return aggregates.period_averages(_trend_freq)
+    from data_loader import load_data_patients
+    from health_analyzer import get_period_averages
+    
+    return get_period_averages(load_data_patients(), _trend_freq)
+
+
+def _get_trend_engine() -> "TrendEngine":
+    """Get the trend engine from memory, SQLite or the streaming analysis."""
+    aggregates = _get_aggregates()
+    if aggregates is not None:
+        return aggregates.trend_engine()
+    from data_loader import load_data_patients
+    from time_series import get_trend_engine
+    
+    return get_trend_engine(load_data_patients())
+
+
+def _get_risk_distribution() -> "pd.Series":
+    """Get final risk counts from memory, SQLite or the streaming analysis."""
+    aggregates = _get_aggregates()
+    if aggregates is not None:
+        return aggregates.risk_distribution()
+    from data_loader import load_data_patients
+    from health_analyzer import compute_risk_pipeline, get_risk_distribution
+    
+    risk_df = compute_risk_pipeline(load_data_patients(), columns_only=True)
+    return get_risk_distribution(risk_df)
+
+
+def _get_top_risk_patients() -> "pd.DataFrame":
+    """Get top-risk patients from memory, SQLite or the streaming analysis."""
+    aggregates = _get_aggregates()
+    if aggregates is not None:
+        return aggregates.top_risk_patients()
+    from data_loader import load_data_patients
+    from health_analyzer import get_top_risk_patients
+    
+    return get_top_risk_patients(load_data_patients())
+
+
 def option_summary() -> None:
     """Display patient data summary."""
+    from data_loader import DataLoadError, get_memory_footprint, load_data_patients
+    from health_analyzer import get_patient_summary
+    
     try:
-        df = load_data_patients()
-        summary = get_patient_summary(df)
+        aggregates = _get_aggregates()
+        if aggregates is not None:
+            df = None
+            summary = aggregates.patient_summary()
+        else:
+            df = load_data_patients()
+            summary = get_patient_summary(df)
         
         print_subheader("RINGKASAN DATA PASIEN")
         print_subheader("INFORMASI DATASET")
@@ -86,15 +209,37 @@ def option_summary() -> None:
         print(f"Rata-rata Umur: {summary['mean_age']:.1f} tahun")
         print(f"Total Pemeriksaan: {summary['total_examinations']} kali")
         print(f"Jumlah Kolom: {summary['total_columns']}")
+        
+        if df is not None:
+            footprint = get_memory_footprint(df)
+            print_subheader("PENGGUNAAN MEMORI PER KOLOM")
+            print(footprint)
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_health_analysis() -> None:
     """Display detailed health analysis."""
+    from data_loader import DataLoadError, load_data_patients
+    from health_analyzer import (
+        calculate_statistics,
+        compute_risk_pipeline,
+        get_all_statistics,
+        get_indicator_counts,
+    )
+    
     try:
-        df = load_data_patients()
-        stats = calculate_statistics(df)
+        aggregates = _get_aggregates()
+        if aggregates is not None:
+            stats = aggregates.statistics()
+            all_statistics = aggregates.describe()
+            indicator_counts = aggregates.indicator_counts
+        else:
+            df = load_data_patients()
+            stats = calculate_statistics(df)
+            all_statistics = get_all_statistics(df)
+            risk_df = compute_risk_pipeline(df, columns_only=True)
+            indicator_counts = partial(get_indicator_counts, risk_df)
         
         print_subheader("ANALISIS STATISTIK KESEHATAN")
         
@@ -103,80 +248,82 @@ def option_health_analysis() -> None:
         print(f"Rata-rata Kolesterol: {stats.mean_kolesterol:.2f} mg/dL")
         
         print_subheader("STATISTIK LENGKAP", 44)
-        print(get_all_statistics(df))
-        
-        # Categorize and display risk distributions
-        categorized_df = add_risk_categories(df)
+        print(all_statistics)
         
         print_subheader("KATEGORI RISIKO BERDASARKAN TEKANAN DARAH", 41)
-        print(get_indicator_counts(categorized_df, 'kategori_tekanan'))
+        print(indicator_counts(CAT_TEKANAN))
         
         print_subheader("KATEGORI RISIKO BERDASARKAN GULA DARAH", 38)
-        print(get_indicator_counts(categorized_df, 'kategori_gula'))
+        print(indicator_counts(CAT_GULA))
         
         print_subheader("KATEGORI RISIKO BERDASARKAN KOLESTEROL", 38)
-        print(get_indicator_counts(categorized_df, 'kategori_kolesterol'))
+        print(indicator_counts(CAT_KOLESTEROL))
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_blood_pressure_chart() -> None:
     """Display blood pressure trend chart."""
+    from data_loader import DataLoadError
+    from visualizer import plot_blood_pressure_trend
+    
     try:
-        df = load_data_patients()
-        daily_data = get_daily_averages(df)
-        plot_blood_pressure_trend(daily_data)
+        plot_blood_pressure_trend(_get_daily_averages())
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_blood_sugar_chart() -> None:
     """Display blood sugar trend chart."""
+    from data_loader import DataLoadError
+    from visualizer import plot_blood_sugar_trend
+    
     try:
-        df = load_data_patients()
-        daily_data = get_daily_averages(df)
-        plot_blood_sugar_trend(daily_data)
+        plot_blood_sugar_trend(_get_daily_averages())
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_cholesterol_chart() -> None:
     """Display cholesterol trend chart."""
+    from data_loader import DataLoadError
+    from visualizer import plot_cholesterol_trend
+    
     try:
-        df = load_data_patients()
-        daily_data = get_daily_averages(df)
-        plot_cholesterol_trend(daily_data)
+        plot_cholesterol_trend(_get_daily_averages())
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_comparison_chart() -> None:
     """Display comparison chart for all indicators."""
+    from data_loader import DataLoadError
+    from visualizer import plot_comparison
+    
     try:
-        df = load_data_patients()
-        daily_data = get_daily_averages(df)
-        plot_comparison(daily_data)
+        plot_comparison(_get_daily_averages())
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_risk_categories() -> None:
     """Display risk category pie chart."""
+    from data_loader import DataLoadError
+    from visualizer import plot_risk_categories
+    
     try:
-        df = load_data_patients()
-        categorized_df = add_risk_categories(df)
-        final_df = calculate_final_risk_category(categorized_df)
-        risk_counts = get_risk_distribution(final_df)
-        plot_risk_categories(risk_counts)
+        plot_risk_categories(_get_risk_distribution())
     except DataLoadError as e:
         print(f"Error: {e}")
 
 
 def option_average_indicators() -> None:
     """Display average indicators bar chart."""
+    from data_loader import DataLoadError
+    from visualizer import plot_average_indicators
+    
     try:
-        df = load_data_patients()
-        stats = calculate_statistics(df)
+        stats = _get_statistics()
         plot_average_indicators(stats.mean_tekanan, stats.mean_gula, stats.mean_kolesterol)
     except DataLoadError as e:
         print(f"Error: {e}")
@@ -184,10 +331,54 @@ def option_average_indicators() -> None:
 
 def option_high_risk_patients() -> None:
     """Display high-risk patients chart."""
+    from data_loader import DataLoadError
+    from visualizer import plot_high_risk_patients
+    
+    try:
+        plot_high_risk_patients(_get_top_risk_patients())
+    except DataLoadError as e:
+        print(f"Error: {e}")
+
+
+def option_patient_history() -> None:
+    """Display one patient's exam history and longitudinal features."""
+    if _stream_chunksize and not _sqlite_path:
+        print("Riwayat pasien membutuhkan data di memori; jalankan tanpa --stream.")
+        return
+    from data_loader import DataLoadError, PatientIndex, get_patient_index
+    from health_analyzer import get_patient_features
+    
+    patient_id = input("Masukkan ID pasien (contoh: P001): ").strip()
     try:
-        df = load_data_patients()
-        top_patients = get_top_risk_patients(df)
-        plot_high_risk_patients(top_patients)
+        if _sqlite_path:
+            from sqlite_backend import SQLiteStore
+            
+            # One lookup on the id_pasien index instead of loading every exam
+            index = PatientIndex(SQLiteStore(_sqlite_path).history(patient_id))
+        else:
+            index = get_patient_index()
+        if patient_id not in index:
+            print(f"Pasien dengan ID {patient_id} tidak ditemukan.")
+            return
+        history = index.history(patient_id)
+        features = get_patient_features(index, [patient_id]).iloc[0]
+        
+        print_subheader(f"RIWAYAT PEMERIKSAAN PASIEN {patient_id}")
+        print(history.to_string(index=False))
+        
+        print_subheader("RINGKASAN LONGITUDINAL")
+        print(f"Jumlah Kunjungan: {features[COLUMN_JUMLAH_KUNJUNGAN]} kali")
+        print(f"Pemeriksaan Pertama: {features[COLUMN_PERIKSA_PERTAMA]:%Y-%m-%d}")
+        print(f"Pemeriksaan Terakhir: {features[COLUMN_PERIKSA_TERAKHIR]:%Y-%m-%d}")
+        for column, label, unit in (
+            (COLUMN_TEKANAN_DARAH, "Tekanan Darah", "mmHg"),
+            (COLUMN_GULA_DARAH, "Gula Darah", "mg/dL"),
+            (COLUMN_KOLESTEROL, "Kolesterol", "mg/dL"),
+        ):
+            latest = features[column + FEATURE_LATEST_SUFFIX]
+            trend = features[FEATURE_TREND_PREFIX + column]
+            trend_text = "-" if math.isnan(trend) else f"{trend:+.1f} {unit}/tahun"
+            print(f"{label}: terakhir {latest:.0f} {unit}, tren {trend_text}")
     except DataLoadError as e:
         print(f"Error: {e}")
 
@@ -212,39 +403,155 @@ def handle_choice(choice: str) -> bool:
         '7': option_risk_categories,
         '8': option_average_indicators,
         '9': option_high_risk_patients,
+        '10': option_patient_history,
     }
     
     if choice in options:
-        options[choice]()
+        action = options[choice]
+        if _instrumented:
+            from instrumentation import span
+            
+            context = span(f"main.{action.__name__}")
+        else:
+            context = nullcontext()
+        with context:
+            action()
         input("\nTekan Enter untuk melanjutkan...")
         return True
-    elif choice == '10':
+    elif choice == '11':
         print("Terima kasih telah menggunakan sistem ini. Sampai jumpa!")
         return False
     else:
-        print("Pilihan tidak valid. Silakan pilih menu 1-10.")
+        print("Pilihan tidak valid. Silakan pilih menu 1-11.")
         return True
 
 
-def main() -> None:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Sistem Analisis Data Pasien dan Tren Kesehatan"
+    )
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Bangun ulang cache biner data pasien sebelum menu ditampilkan",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Analisis data per potongan (chunk) tanpa memuat seluruh file ke memori",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=STREAM_CHUNK_SIZE,
+        help="Jumlah baris per potongan pada mode --stream",
+    )
+    parser.add_argument(
+        "--check-duplicates",
+        action="store_true",
+        help=(
+            "Pada mode --stream, karantina juga pemeriksaan id_pasien + tanggal_periksa "
+            "yang berulang (memori bertambah 8 byte per baris)"
+        ),
+    )
+    parser.add_argument(
+        "--sqlite",
+        nargs="?",
+        type=Path,
+        const=SQLITE_DB_PATH,
+        help=(
+            "Baca data dari database SQLite (buat dengan: python sqlite_backend.py); "
+            f"analisis dijalankan sebagai query SQL. Default: {SQLITE_DB_PATH}"
+        ),
+    )
+    parser.add_argument(
+        "--trend-freq",
+        choices=list(TREND_FREQUENCIES),
+        default="D",
+        help="Periode rata-rata grafik tren: D (harian), W (mingguan), M (bulanan)",
+    )
+    parser.add_argument(
+        "--rolling-window",
+        type=int,
+        help="Tampilkan grafik tren sebagai rata-rata bergerak N hari (menggantikan --trend-freq)",
+    )
+    parser.add_argument(
+        "--profile-out",
+        type=Path,
+        help="Catat waktu, CPU, baris, dan memori tiap fungsi analisis ke file JSON ini",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        help="Tulis catatan yang sama dalam format Chrome trace (chrome://tracing, Perfetto)",
+    )
+    parser.add_argument(
+        "--cprofile-out",
+        type=Path,
+        help="Jalankan juga cProfile dan simpan hasilnya (format pstats) ke file ini",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
     """Main program loop."""
+    global _stream_chunksize, _stream_check_duplicates, _sqlite_path
+    global _trend_freq, _rolling_window, _instrumented
+    args = parse_args(argv)
+    _stream_chunksize = args.chunksize if args.stream else None
+    _stream_check_duplicates = args.check_duplicates
+    _sqlite_path = args.sqlite
+    _trend_freq = args.trend_freq
+    _rolling_window = args.rolling_window
+    _instrumented = bool(args.profile_out or args.trace_out or args.cprofile_out)
+    
+    if _instrumented:
+        import instrumentation
+        
+        instrumentation.enable(profile=bool(args.cprofile_out))
+    
+    if args.rebuild_cache:
+        from data_loader import DataLoadError, rebuild_sidecar_cache
+        
+        try:
+            sidecar_path = rebuild_sidecar_cache()
+            print(f"Cache data dibangun ulang: {sidecar_path}")
+        except DataLoadError as e:
+            print(f"Error: {e}")
+    
     while True:
         try:
             show_menu()
-            choice = input("Pilih menu (1-10): ").strip()
+            choice = input("Pilih menu (1-11): ").strip()
             
             if not choice:
                 continue
-                
+            
             if not handle_choice(choice):
                 break
-                
+        
         except KeyboardInterrupt:
             print("\n\nProgram dihentikan.")
             break
         except Exception as e:
             print(f"Terjadi kesalahan: {e}")
             input("\nTekan Enter untuk melanjutkan...")
+    
+    if _instrumented:
+        instrumentation.disable()
+        print_subheader("INSTRUMENTASI")
+        print(instrumentation.format_summary())
+        for path in instrumentation.export(args.profile_out, args.trace_out, args.cprofile_out):
+            print(f"Data instrumentasi ditulis ke: {path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+"""
+Mergeable quantile sketch for large or sharded data.
+Implements a KLL sketch (Karnin, Lang and Liberty): a stack of sorted
+compactors where level h holds items of weight 2**h. When a level
+exceeds its capacity, every other item (random offset) moves up one
+level, so memory stays O(k log(n / k)) however many values are added.
+Sketches of different chunks or workers can be merged, and quantiles
+come with a normalized rank error bound.
+
+Compaction is vectorized: values are added a chunk at a time and each
+compaction is one NumPy sort and strided slice.
+"""
+
+import math
+from typing import List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+
+# Normalized rank error of a single quantile query at 99% confidence as a
+# function of k, as measured for KLL sketches: eps ~= 2.296 / k**0.9723
+_ERROR_SCALE = 2.296
+_ERROR_EXPONENT = 0.9723
+_CAPACITY_RATIO = 2 / 3
+_MIN_LEVEL_CAPACITY = 8
+
+# Quantiles of ``DataFrame.describe`` and their row labels ("25%", ...)
+DESCRIBE_PERCENTILES = (0.25, 0.5, 0.75)
+
+
+def k_for_error(epsilon: float) -> int:
+    """
+    Smallest sketch size parameter ``k`` meeting a rank error bound.
+    
+    Args:
+        epsilon: Normalized rank error, e.g. 0.01 for 1% of the count.
+        
+    Returns:
+        int: Sketch size parameter.
+        
+    Raises:
+        ValueError: If ``epsilon`` is not between 0 and 1.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError(f"Rank error must be between 0 and 1, got {epsilon}")
+    return max(math.ceil((_ERROR_SCALE / epsilon) ** (1 / _ERROR_EXPONENT)), _MIN_LEVEL_CAPACITY)
+
+
+class KLLSketch:
+    """
+    Approximate quantiles of a stream of numbers.
+    
+    Count, minimum and maximum are exact. While fewer than ``k`` values
+    were added, every value is kept and quantiles are exact (linearly
+    interpolated like ``pandas.Series.quantile``); afterwards a quantile
+    is within ``error_bound`` of the requested rank with 99% confidence.
+    
+    Args:
+        epsilon: Target normalized rank error, see ``k_for_error``.
+        seed: Seed of the random compaction offsets.
+    """
+    
+    def __init__(
+        self,
+        epsilon: float = cfg.QUANTILE_SKETCH_EPSILON,
+        seed: Optional[int] = None
+    ) -> None:
+        self.k = k_for_error(epsilon)
+        self.count = 0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+    
+    @property
+    def error_bound(self) -> float:
+        """Normalized rank error of a quantile (0 while the sketch is exact)."""
+        if self.is_exact:
+            return 0.0
+        return _ERROR_SCALE / self.k ** _ERROR_EXPONENT
+    
+    @property
+    def is_exact(self) -> bool:
+        """Whether no value has been compacted away yet."""
+        return len(self._levels) == 1
+    
+    @property
+    def retained(self) -> int:
+        """Number of values held by the sketch."""
+        return sum(len(level) for level in self._levels)
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(math.ceil(self.k * _CAPACITY_RATIO ** depth), _MIN_LEVEL_CAPACITY)
+    
+    def update(self, values: Sequence[float]) -> None:
+        """
+        Add values; NaN values are ignored.
+        
+        Args:
+            values: Numbers (any array-like, e.g. a DataFrame column).
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+    
+    def merge(self, other: "KLLSketch") -> None:
+        """
+        Merge another sketch (e.g. from another chunk or worker) into this one.
+        
+        The merged sketch keeps the smaller ``k`` of the two.
+        
+        Args:
+            other: Sketch to merge.
+        """
+        if not other.count:
+            return
+        self.k = min(self.k, other.k)
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self._compress()
+    
+    def _compress(self) -> None:
+        """Compact the lowest over-full level until every level fits."""
+        while True:
+            level = next(
+                (h for h, items in enumerate(self._levels) if len(items) > self._capacity(h)),
+                None,
+            )
+            if level is None:
+                return
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+            items = np.sort(self._levels[level])
+            # An odd item stays behind so that the total weight is unchanged
+            kept, items = items[:len(items) % 2], items[len(items) % 2:]
+            promoted = items[self._rng.integers(2)::2]
+            self._levels[level] = kept
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+    
+    def quantiles(self, probabilities: Sequence[float]) -> np.ndarray:
+        """
+        Values at the given cumulative probabilities.
+        
+        Args:
+            probabilities: Numbers between 0 and 1.
+            
+        Returns:
+            np.ndarray: One value per probability (NaN for an empty sketch).
+            
+        Raises:
+            ValueError: If a probability is outside [0, 1].
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        if ((probabilities < 0) | (probabilities > 1)).any():
+            raise ValueError("Probabilities must be between 0 and 1")
+        if not self.count:
+            return np.full(probabilities.shape, np.nan)
+        if self.is_exact:
+            return np.quantile(self._levels[0], probabilities)
+        
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 2 ** level, dtype=np.int64)
+            for level, level_items in enumerate(self._levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        # 0-based rank of each probability, as in the exact case
+        positions = np.searchsorted(cumulative, probabilities * (self.count - 1), side="right")
+        result = items[np.minimum(positions, len(items) - 1)]
+        result[probabilities == 0] = self.minimum
+        result[probabilities == 1] = self.maximum
+        return np.clip(result, self.minimum, self.maximum)
+    
+    def quantile(self, probability: float) -> float:
+        """Value at one cumulative probability, see ``quantiles``."""
+        return float(self.quantiles([probability])[0])
+
+
+def describe_table(moments: pd.DataFrame, sketches: Mapping[str, KLLSketch]) -> pd.DataFrame:
+    """
+    Assemble a table shaped like ``DataFrame.describe``.
+    
+    Args:
+        moments: Rows "count", "mean", "std", "min" and "max" per column.
+        sketches: Sketch of every column of ``moments``.
+        
+    Returns:
+        pd.DataFrame: ``moments`` with the ``DESCRIBE_PERCENTILES`` rows
+        estimated by the sketches, in ``describe`` row order.
+    """
+    labels = [f"{p:.0%}" for p in DESCRIBE_PERCENTILES]
+    quartiles = pd.DataFrame(
+        {column: sketches[column].quantiles(DESCRIBE_PERCENTILES) for column in moments.columns},
+        index=labels,
+    )
+    table = pd.concat([moments, quartiles])
+    return table.loc[["count", "mean", "std", "min", *labels, "max"]]
@@ -0,0 +1,544 @@
+"""
+HTTP analysis service.
+Serves the ``health_analyzer`` analyses as JSON and the charts as PNG
+from a small asyncio HTTP/1.1 server. The dataset stays loaded between
+requests and each response is cached per dataset, so only the first
+request for an endpoint pays for the analysis; when the data file
+changes, the data loader reloads it and the cached responses are dropped.
+
+Analyses and chart rendering run on a thread pool (the warm DataFrame
+is shared, and the Agg canvases need no GUI thread), so the event loop
+keeps accepting and answering requests while they run. Use
+``server_benchmark.py`` for a loopback load test with latency
+percentiles.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+from cohort_cube import get_aggregate_cube
+from data_loader import DataLoadError, load_data_patients
+from health_analyzer import (
+    calculate_statistics,
+    compute_risk_pipeline,
+    get_all_statistics,
+    get_patient_summary,
+    get_period_averages,
+    get_risk_distribution,
+    get_top_risk_patients,
+)
+from visualizer import CHARTS, render_chart
+
+Params = Tuple[Tuple[str, str], ...]
+
+
+@dataclass(frozen=True)
+class Response:
+    """An HTTP response: status code, body and its content type."""
+    status: int
+    body: bytes
+    content_type: str = "application/json"
+    
+    def encode(self, keep_alive: bool) -> bytes:
+        """Serialize as an HTTP/1.1 response message."""
+        head = (
+            f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}\r\n"
+            f"Content-Type: {self.content_type}\r\n"
+            f"Content-Length: {len(self.body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        return head.encode("latin-1") + self.body
+
+
+def _to_json(value: Any) -> Any:
+    """Convert NumPy and pandas scalars for ``json.dumps``."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.strftime(cfg.DATE_FORMAT)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_response(data: Any, status: int = HTTPStatus.OK) -> Response:
+    """Build a JSON response."""
+    return Response(status, json.dumps(data, default=_to_json).encode("utf-8"))
+
+
+def error_response(status: int, message: str) -> Response:
+    """Build a JSON error response ``{"error": message}``."""
+    return json_response({"error": message}, status)
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a DataFrame (index included) to JSON-ready row dicts."""
+    frame = frame.reset_index()
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def _int_param(params: Dict[str, str], name: str, default: int) -> int:
+    """Read a positive integer query parameter."""
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise ValueError(f"Parameter {name!r} must be an integer") from None
+    if value < 1:
+        raise ValueError(f"Parameter {name!r} must be positive")
+    return value
+
+
+def _choice_param(
+    params: Dict[str, str],
+    name: str,
+    choices: Sequence[Any],
+    default: Any
+) -> Any:
+    """Read a query parameter restricted to ``choices``."""
+    value = params.get(name, default)
+    if value not in choices:
+        raise ValueError(f"Parameter {name!r} must be one of {list(choices)}")
+    return value
+
+
+def _freq_param(params: Dict[str, str]) -> str:
+    return _choice_param(params, "freq", list(cfg.TREND_FREQUENCIES), "D")
+
+
+def _top_params(params: Dict[str, str]) -> Tuple[int, str]:
+    n = _int_param(params, "n", cfg.TOP_PATIENTS_COUNT)
+    by = _choice_param(
+        params, "by", [*cfg.HEALTH_COLUMNS, cfg.COLUMN_SKOR_RISIKO], cfg.TOP_PATIENTS_RANK_BY
+    )
+    return n, by
+
+
+def _summary(df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    return json_response(get_patient_summary(df))
+
+
+def _statistics(df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    return json_response({
+        "indicators": asdict(calculate_statistics(df)),
+        "describe": get_all_statistics(df).to_dict(),
+    })
+
+
+def _risk_distribution(df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    risk_df = compute_risk_pipeline(df, columns_only=True)
+    counts = get_risk_distribution(risk_df)
+    return json_response({str(label): int(count) for label, count in counts.items()})
+
+
+def _daily_averages(df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    return json_response(_records(get_period_averages(df, _freq_param(params))))
+
+
+def _top_patients(df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    return json_response(_records(get_top_risk_patients(df, *_top_params(params))))
+
+
+def _cohorts(df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    """
+    Statistics and risk counts per cohort from the aggregate cube.
+    
+    ``by`` lists the grouping dimensions (comma-separated); any dimension
+    can also filter, e.g. ``jenis_kelamin=P`` or ``bulan=2024-01:2024-06``.
+    """
+    default_by = f"{cfg.COLUMN_JENIS_KELAMIN},{cfg.COLUMN_KELOMPOK_UMUR}"
+    by = [d for d in params.get("by", default_by).split(",") if d]
+    criteria: Dict[str, Any] = {}
+    for dimension in cfg.CUBE_DIMENSIONS:
+        value = params.get(dimension)
+        if value is None:
+            continue
+        if dimension == cfg.COLUMN_BULAN and ":" in value:
+            start, _, stop = value.partition(":")
+            criteria[dimension] = slice(start or None, stop or None)
+        else:
+            criteria[dimension] = value.split(",")
+    cube = get_aggregate_cube(df).select(**criteria)
+    if not by:
+        risk = cube.risk_distribution()
+        return json_response([{
+            **asdict(cube.statistics()),
+            **{level: int(risk.get(level, 0)) for level in cfg.RISK_LEVELS},
+        }])
+    cohorts = cube.statistics(by).join(cube.risk_distribution(by).rename(columns=str))
+    return json_response(_records(cohorts))
+
+
+def _chart_args(name: str, df: pd.DataFrame, params: Dict[str, str]) -> Tuple[Any, ...]:
+    """Data arguments of chart ``name``, computed like ``batch_report``."""
+    if name == "kategori_risiko":
+        return (get_risk_distribution(compute_risk_pipeline(df, columns_only=True)),)
+    if name == "rata_rata_indikator":
+        stats = calculate_statistics(df)
+        return (stats.mean_tekanan, stats.mean_gula, stats.mean_kolesterol)
+    if name == "pasien_risiko_tinggi":
+        return (get_top_risk_patients(df, *_top_params(params)),)
+    return (get_period_averages(df, _freq_param(params)),)
+
+
+def _chart(name: str, df: pd.DataFrame, params: Dict[str, str]) -> Response:
+    downsample = _choice_param(
+        params, "downsample", ["lttb", "minmax", "none"], cfg.TREND_DOWNSAMPLE_METHOD
+    )
+    options = {}
+    if name in ("tren_tekanan_darah", "tren_gula_darah", "tren_kolesterol", "perbandingan_indikator"):
+        options["downsample"] = None if downsample == "none" else downsample
+    fig = render_chart(name, *_chart_args(name, df, params), **options)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=cfg.CHART_DPI)
+    return Response(HTTPStatus.OK, buffer.getvalue(), "image/png")
+
+
+# Path -> handler computing the response from the dataset and query
+# parameters (run on the worker pool, responses cached per dataset)
+ENDPOINTS: Dict[str, Callable[[pd.DataFrame, Dict[str, str]], Response]] = {
+    "/summary": _summary,
+    "/statistics": _statistics,
+    "/risk-distribution": _risk_distribution,
+    "/daily-averages": _daily_averages,
+    "/top-patients": _top_patients,
+    "/cohorts": _cohorts,
+    **{f"/charts/{name}.png": partial(_chart, name) for name in CHARTS},
+}
+
+# Endpoints computed by ``AnalysisService.warm`` before serving
+WARM_ENDPOINTS: Tuple[str, ...] = (
+    "/summary", "/statistics", "/risk-distribution", "/daily-averages", "/top-patients"
+)
+
+
+def latency_percentiles(
+    seconds: Sequence[float],
+    percentiles: Sequence[int] = (50, 90, 99)
+) -> Dict[str, float]:
+    """
+    Summarize request durations.
+    
+    Args:
+        seconds: Request durations in seconds.
+        percentiles: Percentiles to report.
+        
+    Returns:
+        Dict[str, float]: Count plus ``p<N>`` and max in milliseconds.
+    """
+    summary: Dict[str, float] = {"count": len(seconds)}
+    if len(seconds):
+        values = np.asarray(seconds, dtype=np.float64) * 1000
+        for p, value in zip(percentiles, np.percentile(values, percentiles)):
+            summary[f"p{p}"] = float(value)
+        summary["max"] = float(values.max())
+    return summary
+
+
+class AnalysisService:
+    """
+    Warm analysis state plus the asyncio HTTP handler serving it.
+    
+    Endpoints are listed in ``ENDPOINTS``; ``/health`` and ``/metrics``
+    are answered on the event loop without touching the worker pool.
+    """
+    
+    def __init__(
+        self,
+        file_path: Optional[str] = None,
+        workers: int = cfg.SERVER_WORKERS,
+        latency_window: int = cfg.SERVER_LATENCY_WINDOW
+    ) -> None:
+        self.file_path = file_path
+        self.latency_window = latency_window
+        self.latencies: Dict[str, Deque[float]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        self._lock = threading.Lock()
+        self._df: Optional[pd.DataFrame] = None
+        self._responses: Dict[Tuple[str, Params], Response] = {}
+        self._inflight: Dict[Tuple[str, Params], asyncio.Future] = {}
+    
+    def _dataset(self) -> pd.DataFrame:
+        """Get the dataset, dropping cached responses if it was reloaded."""
+        df = load_data_patients(self.file_path)
+        with self._lock:
+            if df is not self._df:
+                self._df = df
+                self._responses.clear()
+        return df
+    
+    def compute(self, path: str, params: Params) -> Response:
+        """
+        Compute (or get the cached) response of an endpoint.
+        
+        Runs on a worker thread.
+        
+        Args:
+            path: Key of ``ENDPOINTS``.
+            params: Query parameters as sorted (name, value) pairs.
+            
+        Returns:
+            Response: The endpoint's response; invalid parameters give 400
+            and a failed data load 503.
+        """
+        try:
+            df = self._dataset()
+        except DataLoadError as e:
+            return error_response(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+        key = (path, params)
+        with self._lock:
+            cached = self._responses.get(key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = ENDPOINTS[path](df, dict(params))
+        except ValueError as e:
+            return error_response(HTTPStatus.BAD_REQUEST, str(e))
+        with self._lock:
+            if df is self._df:
+                self._responses[key] = response
+        return response
+    
+    async def _compute_async(self, path: str, params: Params) -> Response:
+        """Run ``compute`` on the pool, sharing one run between identical requests."""
+        key = (path, params)
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self.compute, path, params)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+    
+    async def warm(self, paths: Sequence[str] = WARM_ENDPOINTS) -> None:
+        """Load the dataset and compute the default response of ``paths``."""
+        await asyncio.gather(*(self._compute_async(path, ()) for path in paths))
+    
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Latency percentiles per endpoint over the latest requests."""
+        return {path: latency_percentiles(list(samples)) for path, samples in self.latencies.items()}
+    
+    async def dispatch(self, method: str, target: str) -> Tuple[str, Response]:
+        """
+        Route one request.
+        
+        Args:
+            method: HTTP method.
+            target: Request target (path and query string).
+            
+        Returns:
+            Tuple[str, Response]: Endpoint name for the latency metrics
+            and the response.
+        """
+        url = urlsplit(target)
+        if method != "GET":
+            return url.path, error_response(HTTPStatus.METHOD_NOT_ALLOWED, "Only GET is supported")
+        if url.path == "/health":
+            rows = None if self._df is None else len(self._df)
+            return url.path, json_response({"status": "ok", "rows": rows})
+        if url.path == "/metrics":
+            return url.path, json_response(self.metrics())
+        if url.path not in ENDPOINTS:
+            return "(not found)", error_response(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+        params = tuple(sorted(parse_qsl(url.query)))
+        return url.path, await self._compute_async(url.path, params)
+    
+    def _record_latency(self, path: str, seconds: float) -> None:
+        samples = self.latencies.get(path)
+        if samples is None:
+            samples = self.latencies[path] = deque(maxlen=self.latency_window)
+        samples.append(seconds)
+    
+    async def handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the requests of one (keep-alive) connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                start = time.perf_counter()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    writer.write(error_response(HTTPStatus.BAD_REQUEST, "Malformed request").encode(False))
+                    break
+                method, target, version = parts
+                if "content-length" in headers:
+                    await reader.readexactly(int(headers["content-length"]))
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                )
+                
+                path, response = await self.dispatch(method, target)
+                writer.write(response.encode(keep_alive))
+                await writer.drain()
+                self._record_latency(path, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    async def start(
+        self,
+        host: str = cfg.SERVER_HOST,
+        port: int = cfg.SERVER_PORT,
+        warm: bool = True
+    ) -> asyncio.Server:
+        """
+        Start listening, after warming the dataset if ``warm``.
+        
+        Args:
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free port.
+            warm: Load the data and compute ``WARM_ENDPOINTS`` first.
+            
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        if warm:
+            await self.warm()
+        return await asyncio.start_server(self.handle_connection, host, port)
+    
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def server_port(server: asyncio.Server) -> int:
+    """Port a started server is listening on."""
+    return server.sockets[0].getsockname()[1]
+
+
+@contextmanager
+def serve_in_background(
+    file_path: Optional[str] = None,
+    host: str = cfg.SERVER_HOST,
+    port: int = 0,
+    workers: int = cfg.SERVER_WORKERS,
+    warm: bool = True
+) -> Iterator[Tuple[AnalysisService, str, int]]:
+    """
+    Run the service on an event loop in a background thread.
+    
+    Args:
+        file_path: Optional path to the data. Defaults to DATA_FILE_PATH.
+        host: Interface to bind.
+        port: Port to bind; 0 picks a free port.
+        workers: Worker threads of the service.
+        warm: Warm the dataset before serving.
+        
+    Yields:
+        Tuple[AnalysisService, str, int]: The service, host and port.
+    """
+    service = AnalysisService(file_path, workers)
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(service.start(host, port, warm))
+    thread = threading.Thread(target=loop.run_forever, name="analysis-server", daemon=True)
+    thread.start()
+    try:
+        yield service, host, server_port(server)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        # wait_closed waits for every connection, including idle keep-alive ones
+        server.close_clients()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+        service.close()
+
+
+async def serve(
+    file_path: Optional[str] = None,
+    host: str = cfg.SERVER_HOST,
+    port: int = cfg.SERVER_PORT,
+    workers: int = cfg.SERVER_WORKERS,
+    warm: bool = True
+) -> None:
+    """Run the service until cancelled."""
+    service = AnalysisService(file_path, workers)
+    try:
+        server = await service.start(host, port, warm)
+        print(f"Server analisis berjalan di http://{host}:{server_port(server)}")
+        print(f"Endpoint: /health, /metrics, {', '.join(ENDPOINTS)}")
+        try:
+            # Serve until cancelled; serve_forever would then wait for idle
+            # keep-alive connections before the clients could be closed
+            await asyncio.get_running_loop().create_future()
+        finally:
+            server.close()
+            server.close_clients()
+            await server.wait_closed()
+    finally:
+        service.close()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Layanan HTTP analisis data pasien")
+    parser.add_argument(
+        "--data", help="Path file CSV, folder dataset berpartisi, atau database SQLite (.db)"
+    )
+    parser.add_argument("--host", default=cfg.SERVER_HOST, help="Alamat yang didengarkan")
+    parser.add_argument("--port", type=int, default=cfg.SERVER_PORT, help="Port yang didengarkan")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cfg.SERVER_WORKERS,
+        help="Jumlah thread untuk analisis dan pembuatan grafik",
+    )
+    parser.add_argument(
+        "--no-warm",
+        action="store_true",
+        help="Jangan memuat data dan menghitung analisis sebelum server siap",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the HTTP analysis service from the command line."""
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args.data, args.host, args.port, args.workers, not args.no_warm))
+    except KeyboardInterrupt:
+        print("\nServer dihentikan.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Loopback load test for the HTTP analysis service.
+Starts ``server.py`` in-process on a free port (or targets a running
+server with ``--port``), measures the first, cold request of each
+endpoint, then sends concurrent keep-alive requests and reports latency
+percentiles per endpoint. ``/health`` is mixed into the load to show
+that the event loop keeps answering while analyses and charts run.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import config as cfg
+from server import latency_percentiles, serve_in_background
+
+DEFAULT_PATHS: Tuple[str, ...] = (
+    "/health",
+    "/summary",
+    "/statistics",
+    "/risk-distribution",
+    "/daily-averages",
+    "/daily-averages?freq=M",
+    "/top-patients",
+    "/top-patients?by=skor_risiko",
+    "/charts/kategori_risiko.png",
+    "/charts/perbandingan_indikator.png",
+)
+
+
+class LoopbackClient:
+    """Minimal HTTP/1.1 client reusing one keep-alive connection."""
+    
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+    
+    async def get(self, path: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send a GET request.
+        
+        Args:
+            path: Request target, e.g. ``/summary``.
+            
+        Returns:
+            Tuple[int, Dict[str, str], bytes]: Status code, lower-cased
+            headers and body.
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1"))
+        await self._writer.drain()
+        
+        status = int((await self._reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, headers, body
+    
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader = self._writer = None
+
+
+async def measure_cold(host: str, port: int, paths: Sequence[str]) -> Dict[str, float]:
+    """
+    Time the first request of each path, one at a time.
+    
+    Returns:
+        Dict[str, float]: Seconds per path.
+    """
+    client = LoopbackClient(host, port)
+    timings = {}
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            await client.get(path)
+            timings[path] = time.perf_counter() - start
+    finally:
+        await client.close()
+    return timings
+
+
+async def run_load(
+    host: str,
+    port: int,
+    paths: Sequence[str],
+    requests: int,
+    concurrency: int
+) -> Tuple[Dict[str, List[float]], List[str], float]:
+    """
+    Send ``requests`` requests cycling over ``paths`` from concurrent clients.
+    
+    Args:
+        host: Server host.
+        port: Server port.
+        paths: Request targets.
+        requests: Total number of requests.
+        concurrency: Number of clients (connections) sending at once.
+        
+    Returns:
+        Tuple[Dict[str, List[float]], List[str], float]: Seconds per
+        request grouped by path, failed requests, and the total seconds.
+    """
+    queue = itertools.islice(itertools.cycle(paths), requests)
+    timings: Dict[str, List[float]] = {path: [] for path in paths}
+    failures: List[str] = []
+    
+    async def worker() -> None:
+        client = LoopbackClient(host, port)
+        try:
+            for path in queue:
+                start = time.perf_counter()
+                status, _, _ = await client.get(path)
+                timings[path].append(time.perf_counter() - start)
+                if status != 200:
+                    failures.append(f"{path}: HTTP {status}")
+        finally:
+            await client.close()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return timings, failures, time.perf_counter() - start
+
+
+def format_report(
+    timings: Dict[str, List[float]],
+    cold: Dict[str, float]
+) -> str:
+    """
+    Format latency percentiles per path as a text table.
+    
+    Returns:
+        str: One line per path.
+    """
+    lines = [
+        f"{'Endpoint':<38}{'Jumlah':>8}{'Pertama':>10}{'p50':>9}{'p90':>9}{'p99':>9}{'Maks':>9}"
+    ]
+    for path, seconds in timings.items():
+        summary = latency_percentiles(seconds)
+        first = f"{cold[path] * 1000:.2f}" if path in cold else "-"
+        lines.append(
+            f"{path:<38}{summary['count']:>8}{first:>10}"
+            + "".join(f"{summary.get(key, float('nan')):>9.2f}" for key in ("p50", "p90", "p99", "max"))
+        )
+    lines.append("(semua waktu dalam ms; Pertama = permintaan pertama sebelum ada cache)")
+    return "\n".join(lines)
+
+
+async def _benchmark(args: argparse.Namespace, host: str, port: int) -> int:
+    cold = await measure_cold(host, port, args.paths)
+    timings, failures, seconds = await run_load(
+        host, port, args.paths, args.requests, args.concurrency
+    )
+    print(format_report(timings, cold))
+    total = sum(len(samples) for samples in timings.values())
+    print(f"\n{total} permintaan dalam {seconds:.2f} detik ({total / seconds:.0f} permintaan/detik)")
+    for failure in failures[:10]:
+        print(f"Gagal: {failure}")
+    return 1 if failures else 0
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Uji beban layanan HTTP analisis (loopback)")
+    parser.add_argument("--data", help="Path file CSV atau folder dataset berpartisi")
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Uji server yang sudah berjalan di port ini (default: jalankan server sendiri)",
+    )
+    parser.add_argument("--host", default=cfg.SERVER_HOST, help="Alamat server")
+    parser.add_argument("--requests", type=int, default=500, help="Jumlah permintaan total")
+    parser.add_argument("--concurrency", type=int, default=8, help="Jumlah koneksi bersamaan")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cfg.SERVER_WORKERS,
+        help="Jumlah thread server yang dijalankan sendiri",
+    )
+    parser.add_argument(
+        "--paths", nargs="+", default=list(DEFAULT_PATHS), help="Endpoint yang diuji"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the load test from the command line.
+    
+    Returns:
+        int: Process exit code (1 if any request failed).
+    """
+    args = parse_args(argv)
+    if args.port is not None:
+        context = nullcontext((None, args.host, args.port))
+    else:
+        # Not warmed, so the first request of each endpoint shows the cold cost
+        context = serve_in_background(args.data, args.host, workers=args.workers, warm=False)
+    with context as (_, host, port):
+        return asyncio.run(_benchmark(args, host, port))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
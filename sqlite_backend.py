@@ -0,0 +1,634 @@
+"""
+SQLite storage backend for patient data.
+Imports the CSV once into an indexed SQLite database and answers the
+analyses with SQL aggregations, so only result-sized data (counts per
+category, averages per period, the top patients) is read into pandas
+instead of every exam row.
+
+``SQLiteStore`` offers the same result methods as
+``stream_analyzer.StreamingAnalysis``; ``data_loader`` reads data paths
+ending in one of ``config.SQLITE_SUFFIXES`` through it, and
+``load_data_with_date_filter`` pushes the date range down as a WHERE
+clause on the indexed exam date.
+"""
+
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+from cohort_cube import AggregateCube
+from data_loader import DataLoadError, iter_data_chunks
+from data_quality import DataValidator
+from health_analyzer import HealthStatistics, select_top_patients
+from instrumentation import instrument
+from quantile_sketch import DESCRIBE_PERCENTILES
+from stream_analyzer import CategoryCountAccumulator
+from time_series import TrendEngine
+
+TABLE = cfg.SQLITE_TABLE
+
+# Index name -> indexed columns. The exam date index also covers the
+# indicators, so per-period averages are answered from the index alone.
+INDEXES = {
+    f"idx_{TABLE}_{cfg.COLUMN_ID_PASIEN}": (cfg.COLUMN_ID_PASIEN,),
+    f"idx_{TABLE}_{cfg.COLUMN_TANGGAL_PERIKSA}": (
+        cfg.COLUMN_TANGGAL_PERIKSA, *cfg.HEALTH_COLUMNS
+    ),
+}
+
+# SQL expression of the first date of the period holding an exam date
+# (weeks run Monday-Sunday, like ``get_period_averages``)
+_PERIOD_EXPRESSIONS = {
+    "D": cfg.COLUMN_TANGGAL_PERIKSA,
+    "W": f"date({cfg.COLUMN_TANGGAL_PERIKSA}, 'weekday 0', '-6 days')",
+    "M": f"strftime('%Y-%m-01', {cfg.COLUMN_TANGGAL_PERIKSA})",
+}
+
+# Rows without a date sort last, ties keep the import (CSV) order
+_DATE_ORDER = (
+    f"{cfg.COLUMN_TANGGAL_PERIKSA} IS NULL, {cfg.COLUMN_TANGGAL_PERIKSA}, rowid"
+)
+
+
+def _sql_type(dtype: str) -> str:
+    """Get the SQLite column type storing a schema dtype."""
+    if dtype.startswith(("int", "uint")):
+        return "INTEGER"
+    if dtype.startswith("float"):
+        return "REAL"
+    return "TEXT"
+
+
+def _risk_code_expression(column: str) -> str:
+    """
+    SQL expression of an indicator's ordinal risk code.
+    
+    Applies the same rules as ``health_analyzer.categorize_values``; a
+    NULL value compares false everywhere and gets the Normal code.
+    """
+    normal_max, risiko_tinggi_max = cfg.INDICATOR_THRESHOLDS[column]
+    return (
+        f"CASE WHEN {column} > {risiko_tinggi_max} THEN {cfg.RISK_CODE_RISIKO_TINGGI} "
+        f"WHEN {column} >= {normal_max} THEN {cfg.RISK_CODE_PERLU_WASPADA} "
+        f"ELSE {cfg.RISK_CODE_NORMAL} END"
+    )
+
+
+def _chunk_rows(chunk: pd.DataFrame) -> Iterator[tuple]:
+    """
+    Convert a parsed CSV chunk to rows of Python values for executemany.
+    
+    Dates are stored as ISO text (``cfg.DATE_FORMAT``), which sorts in
+    date order and works with the SQLite date functions; missing values
+    become NULL.
+    """
+    columns = []
+    for column, dtype in cfg.COLUMN_DTYPES.items():
+        values = chunk[column]
+        if dtype.startswith("datetime64"):
+            values = values.dt.strftime(cfg.DATE_FORMAT)
+        columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return zip(*columns)
+
+
+def _date_bound(name: str, value: Optional[str]) -> Optional[str]:
+    """Validate a date bound (YYYY-MM-DD format) and normalize it to ISO text."""
+    if not value:
+        return None
+    try:
+        parsed = pd.to_datetime(value, format=cfg.DATE_FORMAT)
+    except (TypeError, ValueError):
+        parsed = pd.NaT
+    if pd.isna(parsed):
+        raise ValueError(f"Invalid {name} {value!r}, expected {cfg.DATE_FORMAT}")
+    return parsed.strftime(cfg.DATE_FORMAT)
+
+
+def _quantiles_from_counts(
+    values: np.ndarray,
+    counts: np.ndarray,
+    probabilities: Sequence[float]
+) -> np.ndarray:
+    """
+    Exact quantiles from a value histogram.
+    
+    Interpolates linearly between neighbouring ranks, like
+    ``pandas.Series.quantile``.
+    
+    Args:
+        values: Distinct values in ascending order.
+        counts: Number of occurrences of each value.
+        probabilities: Numbers between 0 and 1.
+        
+    Returns:
+        np.ndarray: One value per probability (NaN without values).
+    """
+    total = int(counts.sum())
+    if not total:
+        return np.full(len(probabilities), np.nan)
+    cumulative = np.cumsum(counts)
+    positions = np.asarray(probabilities, dtype=np.float64) * (total - 1)
+    lower = np.floor(positions)
+    upper = np.minimum(lower + 1, total - 1)
+    at_lower = values[np.searchsorted(cumulative, lower, side="right")]
+    at_upper = values[np.searchsorted(cumulative, upper, side="right")]
+    return at_lower + (at_upper - at_lower) * (positions - lower)
+
+
+@instrument
+def import_csv(
+    csv_path: Optional[str] = None,
+    db_path: Optional[str] = None,
+    chunksize: int = cfg.SQLITE_IMPORT_CHUNK_SIZE
+) -> Path:
+    """
+    Bulk-import a patient CSV file into an indexed SQLite database.
+    
+    The CSV is parsed in chunks with the column schema and inserted in
+    one transaction; the indexes are built after the load, followed by
+    ``ANALYZE`` for the query planner. The database is written next to
+    its destination and moved into place at the end, so readers never
+    see a half-imported file.
+    
+    Args:
+        csv_path: Optional path to the CSV file or partitioned dataset
+            directory. Defaults to DATA_FILE_PATH.
+        db_path: Optional database path. Defaults to SQLITE_DB_PATH; an
+            existing database is replaced.
+        chunksize: Number of CSV rows parsed and inserted at a time.
+        
+    Returns:
+        Path: The database path.
+        
+    Raises:
+        DataLoadError: If the CSV cannot be loaded or is invalid.
+    """
+    source = Path(csv_path) if csv_path else cfg.DATA_FILE_PATH
+    target = Path(db_path) if db_path else cfg.SQLITE_DB_PATH
+    staging = target.with_name(target.name + ".tmp")
+    staging.unlink(missing_ok=True)
+    
+    columns = ", ".join(
+        f"{column} {_sql_type(dtype)}" for column, dtype in cfg.COLUMN_DTYPES.items()
+    )
+    placeholders = ", ".join("?" for _ in cfg.COLUMN_DTYPES)
+    connection = sqlite3.connect(staging)
+    try:
+        # The staging file is discarded on failure, so no journal is needed
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute(f"CREATE TABLE {TABLE} ({columns})")
+        with connection:
+            # The database holds the rows of a full load, without repeated exams
+            chunks = iter_data_chunks(str(source), chunksize, validator=DataValidator())
+            for chunk in chunks:
+                connection.executemany(
+                    f"INSERT INTO {TABLE} VALUES ({placeholders})", _chunk_rows(chunk)
+                )
+            for name, indexed in INDEXES.items():
+                connection.execute(f"CREATE INDEX {name} ON {TABLE} ({', '.join(indexed)})")
+            connection.execute("ANALYZE")
+    except BaseException:
+        connection.close()
+        staging.unlink(missing_ok=True)
+        raise
+    connection.close()
+    os.replace(staging, target)
+    return target
+
+
+class SQLiteStore:
+    """
+    Patient data in an SQLite database created by ``import_csv``.
+    
+    Every method opens its own read-only connection, so one store can be
+    shared between threads (e.g. the HTTP service workers). Aggregations
+    run inside SQLite; results equal the ``health_analyzer`` functions on
+    the same data loaded into memory.
+    
+    Args:
+        path: Optional database path. Defaults to SQLITE_DB_PATH.
+    """
+    
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path else cfg.SQLITE_DB_PATH
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a read-only connection, raising DataLoadError on database errors."""
+        if not self.path.is_file():
+            raise DataLoadError(f"Database not found: {self.path}")
+        connection = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            yield connection
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            raise DataLoadError(f"Error reading SQLite database: {e}")
+        finally:
+            connection.close()
+    
+    def _read_frame(
+        self,
+        connection: sqlite3.Connection,
+        where: str = "",
+        params: Sequence[str] = (),
+        order: str = "rowid",
+        columns: Optional[Sequence[str]] = None,
+        chunksize: Optional[int] = None
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        Read exam rows with the schema dtypes, indexed by their CSV row position.
+        
+        Args:
+            connection: Open database connection.
+            where: Optional SQL condition.
+            params: Parameters of ``where``.
+            order: SQL ordering of the rows.
+            columns: Schema columns to read. Defaults to all.
+            chunksize: Yield frames of this many rows instead of one frame.
+            
+        Returns:
+            The rows, or an iterator over chunks of them.
+        """
+        columns = list(columns or cfg.COLUMN_DTYPES)
+        dtypes = {column: cfg.COLUMN_DTYPES[column] for column in columns}
+        dates = {
+            column: cfg.DATE_FORMAT for column, dtype in dtypes.items()
+            if dtype.startswith("datetime64")
+        }
+        sql = (
+            f"SELECT rowid - 1 AS _row, {', '.join(columns)} FROM {TABLE}"
+            f"{f' WHERE {where}' if where else ''} ORDER BY {order}"
+        )
+        frames = pd.read_sql_query(
+            sql, connection, params=list(params), index_col="_row", chunksize=chunksize,
+            parse_dates=dates,
+            dtype={column: dtype for column, dtype in dtypes.items() if column not in dates},
+        )
+        if chunksize is None:
+            return frames.rename_axis(index=None)
+        return (frame.rename_axis(index=None) for frame in frames)
+    
+    @instrument
+    def load(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Load every exam row in import order.
+        
+        Args:
+            columns: Schema columns to read. Defaults to all.
+            
+        Returns:
+            pd.DataFrame: Patient data with the schema dtypes.
+            
+        Raises:
+            DataLoadError: If the database cannot be read.
+        """
+        with self._connect() as connection:
+            return self._read_frame(connection, columns=columns)
+    
+    def iter_chunks(self, chunksize: int = cfg.STREAM_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Stream the exam rows in import order in bounded-size chunks.
+        
+        Args:
+            chunksize: Number of rows per chunk.
+            
+        Yields:
+            pd.DataFrame: Consecutive chunks of patient data.
+            
+        Raises:
+            DataLoadError: If the database cannot be read.
+        """
+        with self._connect() as connection:
+            yield from self._read_frame(connection, chunksize=chunksize)
+    
+    @instrument
+    def load_date_range(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Load the exams within a date range, like ``load_data_with_date_filter``.
+        
+        The bounds become a WHERE clause answered by the exam date index,
+        so only the matching rows are read.
+        
+        Args:
+            start_date: Filter records from this date (YYYY-MM-DD format).
+            end_date: Filter records until this date (YYYY-MM-DD format).
+            
+        Returns:
+            pd.DataFrame: Filtered patient data, ordered by exam date.
+            
+        Raises:
+            DataLoadError: If the database cannot be read.
+            ValueError: If a date bound is malformed or start is after end.
+        """
+        start = _date_bound("start_date", start_date)
+        end = _date_bound("end_date", end_date)
+        if start and end and start > end:
+            raise ValueError(f"start_date {start_date} is after end_date {end_date}")
+        
+        conditions, params = [], []
+        for bound, operator in ((start, ">="), (end, "<=")):
+            if bound:
+                conditions.append(f"{cfg.COLUMN_TANGGAL_PERIKSA} {operator} ?")
+                params.append(bound)
+        with self._connect() as connection:
+            return self._read_frame(
+                connection, " AND ".join(conditions), params, order=_DATE_ORDER
+            )
+    
+    @instrument
+    def history(self, patient_id: str) -> pd.DataFrame:
+        """
+        Get one patient's exams in date order via the ``id_pasien`` index.
+        
+        Args:
+            patient_id: Value of ``id_pasien``.
+            
+        Returns:
+            pd.DataFrame: The patient's rows (empty for an unknown patient).
+            
+        Raises:
+            DataLoadError: If the database cannot be read.
+        """
+        with self._connect() as connection:
+            return self._read_frame(
+                connection, f"{cfg.COLUMN_ID_PASIEN} = ?", [patient_id], order=_DATE_ORDER
+            )
+    
+    def _moments(self, columns: Sequence[str]) -> pd.DataFrame:
+        """
+        Count, sum, sum of squares, min and max of numeric columns.
+        
+        Sums of integer columns are exact in SQLite, so means and standard
+        deviations are derived from them without cancellation error.
+        """
+        aggregates = ", ".join(
+            f"COUNT({c}), SUM({c}), SUM({c} * {c}), MIN({c}), MAX({c})" for c in columns
+        )
+        with self._connect() as connection:
+            row = connection.execute(f"SELECT {aggregates} FROM {TABLE}").fetchone()
+        return pd.DataFrame(
+            np.array(row, dtype=object).reshape(len(columns), 5).T,
+            index=["count", "sum", "sumsq", "min", "max"],
+            columns=list(columns),
+        )
+    
+    @staticmethod
+    def _mean_std(moments: pd.Series) -> Tuple[float, float]:
+        """Mean and sample standard deviation (NaN when undefined) of one column."""
+        n, total, squares = moments["count"], moments["sum"], moments["sumsq"]
+        mean = total / n if n else np.nan
+        if n < 2:
+            return mean, np.nan
+        variance = (n * squares - total * total) / (n * (n - 1))
+        return mean, float(np.sqrt(max(variance, 0)))
+    
+    @instrument
+    def patient_summary(self) -> Dict[str, float]:
+        """Get the same summary as ``get_patient_summary``."""
+        umur = cfg.COLUMN_UMUR
+        with self._connect() as connection:
+            patients, min_age, max_age, mean_age, exams = connection.execute(
+                f"SELECT COUNT(DISTINCT {cfg.COLUMN_ID_PASIEN}), MIN({umur}), MAX({umur}), "
+                f"AVG({umur}), COUNT(*) FROM {TABLE}"
+            ).fetchone()
+            columns = connection.execute(f"SELECT * FROM {TABLE} LIMIT 0").description
+        return {
+            "unique_patients": patients,
+            "min_age": np.nan if min_age is None else min_age,
+            "max_age": np.nan if max_age is None else max_age,
+            "mean_age": np.nan if mean_age is None else mean_age,
+            "total_examinations": exams,
+            "total_columns": len(columns),
+        }
+    
+    @instrument
+    def statistics(self) -> HealthStatistics:
+        """Get the same statistics as ``calculate_statistics``."""
+        moments = self._moments(cfg.HEALTH_COLUMNS)
+        (mean_t, std_t), (mean_g, std_g), (mean_k, std_k) = (
+            self._mean_std(moments[column]) for column in cfg.HEALTH_COLUMNS
+        )
+        return HealthStatistics(
+            mean_tekanan=mean_t,
+            mean_gula=mean_g,
+            mean_kolesterol=mean_k,
+            std_tekanan=std_t,
+            std_gula=std_g,
+            std_kolesterol=std_k,
+        )
+    
+    @instrument
+    def describe(self) -> pd.DataFrame:
+        """
+        Get the same table as ``get_all_statistics``.
+        
+        Quartiles are exact: they are interpolated from each column's
+        value histogram (one row per distinct value) rather than from
+        sorted rows.
+        """
+        moments = self._moments(cfg.HEALTH_COLUMNS)
+        table = {}
+        with self._connect() as connection:
+            for column in cfg.HEALTH_COLUMNS:
+                histogram = np.array(connection.execute(
+                    f"SELECT {column}, COUNT(*) FROM {TABLE} WHERE {column} IS NOT NULL "
+                    f"GROUP BY {column} ORDER BY {column}"
+                ).fetchall(), dtype=np.float64).reshape(-1, 2)
+                mean, std = self._mean_std(moments[column])
+                quartiles = _quantiles_from_counts(
+                    histogram[:, 0], histogram[:, 1], DESCRIBE_PERCENTILES
+                )
+                minimum, maximum = moments[column]["min"], moments[column]["max"]
+                table[column] = [
+                    moments[column]["count"], mean, std,
+                    np.nan if minimum is None else minimum,
+                    *quartiles,
+                    np.nan if maximum is None else maximum,
+                ]
+        labels = [f"{p:.0%}" for p in DESCRIBE_PERCENTILES]
+        return pd.DataFrame(
+            table, index=["count", "mean", "std", "min", *labels, "max"], dtype="float64"
+        )
+    
+    def daily_averages(self) -> pd.DataFrame:
+        """Get the same result as ``get_daily_averages``."""
+        return self.period_averages("D")
+    
+    @instrument
+    def period_averages(self, freq: str = "D") -> pd.DataFrame:
+        """
+        Get the same result as ``get_period_averages``.
+        
+        Grouped by the exam date index, so only one row per period is
+        returned from SQLite.
+        """
+        if freq not in cfg.TREND_FREQUENCIES:
+            raise ValueError(
+                f"Unsupported frequency {freq!r}, "
+                f"expected one of {list(cfg.TREND_FREQUENCIES)}"
+            )
+        averages = ", ".join(f"AVG({column})" for column in cfg.HEALTH_COLUMNS)
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {_PERIOD_EXPRESSIONS[freq]} AS period, {averages} FROM {TABLE} "
+                f"WHERE {cfg.COLUMN_TANGGAL_PERIKSA} IS NOT NULL GROUP BY period ORDER BY period"
+            ).fetchall()
+        periods = [row[0] for row in rows]
+        index = pd.DatetimeIndex(
+            pd.to_datetime(periods, format=cfg.DATE_FORMAT), name=cfg.COLUMN_TANGGAL_PERIKSA
+        )
+        return pd.DataFrame(
+            [row[1:] for row in rows], index=index, columns=cfg.HEALTH_COLUMNS, dtype="float64"
+        )
+    
+    def _category_counts(self) -> CategoryCountAccumulator:
+        """Count the risk code combinations in SQL and tally every category column."""
+        codes = ", ".join(_risk_code_expression(column) for column in cfg.HEALTH_COLUMNS)
+        with self._connect() as connection:
+            rows = np.array(connection.execute(
+                f"SELECT {codes}, COUNT(*) FROM {TABLE} GROUP BY 1, 2, 3"
+            ).fetchall(), dtype=np.int64).reshape(-1, len(cfg.HEALTH_COLUMNS) + 1)
+        
+        combinations, weights = rows[:, :-1], rows[:, -1]
+        minlength = len(cfg.RISK_LEVELS)
+        counts = CategoryCountAccumulator()
+        for i, column in enumerate(cfg.HEALTH_COLUMNS):
+            counts.counts[cfg.INDICATOR_CATEGORY_COLUMNS[column]] += np.bincount(
+                combinations[:, i], weights=weights, minlength=minlength
+            ).astype(np.int64)
+        counts.counts[cfg.CAT_AKHIR] += np.bincount(
+            combinations.max(axis=1), weights=weights, minlength=minlength
+        ).astype(np.int64)
+        return counts
+    
+    def risk_distribution(self) -> pd.Series:
+        """Get the same result as ``get_risk_distribution``."""
+        return self._category_counts().distribution(cfg.CAT_AKHIR)
+    
+    def indicator_counts(self, category_column: str) -> pd.Series:
+        """Get the same result as ``get_indicator_counts``."""
+        return self._category_counts().distribution(category_column)
+    
+    def _patient_means(self, clauses: str = "ORDER BY MIN(rowid)") -> pd.DataFrame:
+        """
+        Per-patient name and indicator means aggregated in SQL.
+        
+        With a single MIN() aggregate, SQLite takes the bare ``nama``
+        column from the patient's first row, like ``get_patient_means``.
+        """
+        averages = ", ".join(f"AVG({column})" for column in cfg.HEALTH_COLUMNS)
+        with self._connect() as connection:
+            rows = connection.execute(
+                f"SELECT {cfg.COLUMN_ID_PASIEN}, {cfg.COLUMN_NAMA}, MIN(rowid), {averages} "
+                f"FROM {TABLE} GROUP BY {cfg.COLUMN_ID_PASIEN} {clauses}"
+            ).fetchall()
+        means = pd.DataFrame(
+            [row[3:] for row in rows],
+            index=pd.Index(
+                [row[0] for row in rows], dtype=cfg.COLUMN_DTYPES[cfg.COLUMN_ID_PASIEN],
+                name=cfg.COLUMN_ID_PASIEN,
+            ),
+            columns=cfg.HEALTH_COLUMNS,
+            dtype="float64",
+        )
+        means.insert(0, cfg.COLUMN_NAMA, pd.array(
+            [row[1] for row in rows], dtype=cfg.COLUMN_DTYPES[cfg.COLUMN_NAMA]
+        ))
+        return means
+    
+    def patient_means(self) -> pd.DataFrame:
+        """Get the same result as ``get_patient_means``."""
+        return self._patient_means()
+    
+    @instrument
+    def top_risk_patients(
+        self,
+        n: int = cfg.TOP_PATIENTS_COUNT,
+        by: str = cfg.TOP_PATIENTS_RANK_BY
+    ) -> pd.DataFrame:
+        """
+        Get the same result as ``get_top_risk_patients``.
+        
+        Ranking by an indicator is done in SQL (ties by patient ID, as in
+        ``select_top_patients``), so only ``n`` patients are returned; the
+        composite risk score is ranked over all per-patient means.
+        """
+        if by not in cfg.HEALTH_COLUMNS:
+            return select_top_patients(self._patient_means(), n, by)
+        top = self._patient_means(
+            f"HAVING AVG({by}) IS NOT NULL "
+            f"ORDER BY AVG({by}) DESC, {cfg.COLUMN_ID_PASIEN} LIMIT {int(n)}"
+        )
+        return select_top_patients(top, n, by)
+    
+    def trend_engine(self) -> TrendEngine:
+        """
+        Get the trend engine of the data, like ``get_trend_engine``.
+        
+        Only the exam date and indicator columns are read.
+        """
+        return TrendEngine.from_frame(
+            self.load([cfg.COLUMN_TANGGAL_PERIKSA, *cfg.HEALTH_COLUMNS])
+        )
+    
+    def aggregate_cube(self) -> AggregateCube:
+        """
+        Get the aggregate cube of the data, like ``get_aggregate_cube``.
+        
+        Only the cube dimension and indicator columns are read.
+        """
+        return AggregateCube.from_frame(self.load([
+            cfg.COLUMN_TANGGAL_PERIKSA, cfg.COLUMN_JENIS_KELAMIN, cfg.COLUMN_UMUR,
+            *cfg.HEALTH_COLUMNS,
+        ]))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Impor data pasien (CSV) ke database SQLite berindeks"
+    )
+    parser.add_argument(
+        "csv", nargs="?", default=str(cfg.DATA_FILE_PATH),
+        help="File CSV atau folder dataset berpartisi sumber",
+    )
+    parser.add_argument(
+        "db", nargs="?", default=str(cfg.SQLITE_DB_PATH), help="File database tujuan"
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=cfg.SQLITE_IMPORT_CHUNK_SIZE,
+        help="Jumlah baris yang dibaca dan dimasukkan per potongan",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Import a CSV file into an SQLite database from the command line."""
+    args = parse_args(argv)
+    path = import_csv(args.csv, args.db, args.chunksize)
+    print(f"Data {args.csv} diimpor ke: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Startup benchmark for the interactive CLI.
+Runs ``python -X importtime`` over the menu startup and the text-only
+options, reports where the import time goes, and fails when a scenario
+loads a module it must not load or exceeds its time budget.
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One startup path to measure."""
+    name: str
+    code: str
+    forbidden: Tuple[str, ...]
+    budget_ms: Optional[float] = None
+
+
+SCENARIOS: Tuple[Scenario, ...] = (
+    Scenario(
+        "menu",
+        "import main; main.show_menu()",
+        forbidden=("pandas", "numpy", "pyarrow", "matplotlib"),
+        budget_ms=100.0,
+    ),
+    Scenario(
+        "ringkasan",
+        "import main; main.option_summary()",
+        forbidden=("matplotlib",),
+    ),
+    Scenario(
+        "analisis_kesehatan",
+        "import main; main.option_health_analysis()",
+        forbidden=("matplotlib",),
+    ),
+)
+
+
+@dataclass
+class ImportProfile:
+    """Parsed ``-X importtime`` output of one run."""
+    self_us: Dict[str, int]
+    cumulative_us: Dict[str, int]
+    top_level: List[str]
+    
+    @property
+    def total_ms(self) -> float:
+        """Cumulative import time of all top-level imports in milliseconds."""
+        return sum(self.cumulative_us[name] for name in self.top_level) / 1000
+    
+    def loaded(self, package: str) -> bool:
+        """Whether ``package`` or any of its submodules was imported."""
+        return any(
+            name == package or name.startswith(package + ".")
+            for name in self.self_us
+        )
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    """
+    Parse the ``-X importtime`` report written to stderr.
+    
+    Args:
+        stderr: Captured standard error of the run.
+        
+    Returns:
+        ImportProfile: Self and cumulative microseconds per module.
+    """
+    self_us: Dict[str, int] = {}
+    cumulative_us: Dict[str, int] = {}
+    top_level: List[str] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, name_part = line[len("import time:"):].split("|")
+        name = name_part.strip()
+        self_us[name] = int(self_part)
+        cumulative_us[name] = int(cumulative_part)
+        # Nesting is shown by two extra spaces per level after the separator
+        if len(name_part) - len(name_part.lstrip()) == 1:
+            top_level.append(name)
+    return ImportProfile(self_us, cumulative_us, top_level)
+
+
+def run_scenario(scenario: Scenario) -> ImportProfile:
+    """
+    Run one scenario in a fresh interpreter with ``-X importtime``.
+    
+    Args:
+        scenario: Scenario to run.
+        
+    Returns:
+        ImportProfile: Import profile of the run.
+        
+    Raises:
+        RuntimeError: If the scenario exits with an error.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", scenario.code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Scenario {scenario.name} gagal:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def check_scenario(
+    scenario: Scenario,
+    repeat: int = 5,
+    show_top: int = 0
+) -> List[str]:
+    """
+    Measure a scenario and check it against its rules.
+    
+    The fastest of ``repeat`` runs is used so that a cold disk cache on
+    the first run does not count against the budget.
+    
+    Args:
+        scenario: Scenario to check.
+        repeat: Number of runs.
+        show_top: Also print this many slowest top-level imports.
+        
+    Returns:
+        List[str]: Rule violations; empty when the scenario passes.
+    """
+    profiles = [run_scenario(scenario) for _ in range(repeat)]
+    best = min(profiles, key=lambda profile: profile.total_ms)
+    print(f"{scenario.name:<22}{best.total_ms:>10.1f} ms{len(best.self_us):>8} modul")
+    
+    if show_top:
+        slowest = sorted(best.top_level, key=best.cumulative_us.get, reverse=True)
+        for name in slowest[:show_top]:
+            print(f"    {name:<30}{best.cumulative_us[name] / 1000:>10.1f} ms")
+    
+    violations = [
+        f"{scenario.name}: memuat {package}"
+        for package in scenario.forbidden
+        if best.loaded(package)
+    ]
+    if scenario.budget_ms is not None and best.total_ms > scenario.budget_ms:
+        violations.append(
+            f"{scenario.name}: {best.total_ms:.1f} ms melebihi batas {scenario.budget_ms:.1f} ms"
+        )
+    return violations
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark waktu mulai menu CLI")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Jumlah pengulangan per skenario"
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Tampilkan N impor paling lambat"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run all startup scenarios.
+    
+    Returns:
+        int: 0 when every scenario passes, 1 otherwise.
+    """
+    args = parse_args(argv)
+    print(f"{'Skenario':<22}{'Impor':>13}{'Jumlah':>14}")
+    violations: List[str] = []
+    for scenario in SCENARIOS:
+        violations.extend(check_scenario(scenario, args.repeat, args.top))
+    
+    if violations:
+        print("\nGAGAL:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("\nSemua skenario lolos.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,691 @@
+"""
+Streaming analysis module for patient data.
+Provides mergeable accumulators that reproduce the health_analyzer
+results while reading the data in bounded-size chunks.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.core.groupby import DataFrameGroupBy
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import config as cfg
+from cohort_cube import AggregateCube
+from data_loader import iter_data_chunks, read_csv_tail
+from data_quality import DataValidator
+from health_analyzer import HealthStatistics, compute_risk_codes, select_top_patients
+from quantile_sketch import KLLSketch, describe_table
+from time_series import TrendEngine
+
+
+@dataclass
+class MomentAccumulator:
+    """
+    Running count, mean, M2, min and max per column.
+    
+    Chunks are reduced with NumPy and combined with the parallel
+    (Chan et al.) variance update, so accumulators built on different
+    chunks or workers can be merged exactly.
+    """
+    columns: List[str]
+    count: np.ndarray = field(init=False)
+    mean: np.ndarray = field(init=False)
+    m2: np.ndarray = field(init=False)
+    minimum: np.ndarray = field(init=False)
+    maximum: np.ndarray = field(init=False)
+    
+    def __post_init__(self) -> None:
+        size = len(self.columns)
+        self.count = np.zeros(size, dtype=np.int64)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.minimum = np.full(size, np.inf)
+        self.maximum = np.full(size, -np.inf)
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Add the values of a chunk.
+        
+        Args:
+            chunk: DataFrame containing ``self.columns``.
+        """
+        values = chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        other = MomentAccumulator(self.columns)
+        other.count = np.count_nonzero(~np.isnan(values), axis=0)
+        if other.count.any():
+            with np.errstate(invalid="ignore", divide="ignore"):
+                other.mean = np.nansum(values, axis=0) / other.count
+                other.m2 = np.nansum((values - other.mean) ** 2, axis=0)
+            other.mean = np.nan_to_num(other.mean)
+            other.minimum = np.fmin.reduce(values, axis=0, initial=np.inf)
+            other.maximum = np.fmax.reduce(values, axis=0, initial=-np.inf)
+        self.merge(other)
+    
+    def merge(self, other: "MomentAccumulator") -> None:
+        """
+        Merge another accumulator over the same columns into this one.
+        
+        Args:
+            other: Accumulator to merge.
+        """
+        total = self.count + other.count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = other.mean - self.mean
+            weight = np.where(total > 0, other.count / total, 0.0)
+            self.mean = self.mean + delta * weight
+            self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * weight
+        self.count = total
+        self.minimum = np.minimum(self.minimum, other.minimum)
+        self.maximum = np.maximum(self.maximum, other.maximum)
+    
+    def means(self) -> pd.Series:
+        """Get the mean of every column (NaN for empty columns)."""
+        return pd.Series(
+            np.where(self.count > 0, self.mean, np.nan), index=self.columns
+        )
+    
+    def stds(self) -> pd.Series:
+        """Get the sample standard deviation (ddof=1) of every column."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+        return pd.Series(np.sqrt(variance), index=self.columns)
+
+
+@dataclass
+class QuantileAccumulator:
+    """KLL quantile sketch of every health indicator."""
+    epsilon: float = cfg.QUANTILE_SKETCH_EPSILON
+    sketches: Dict[str, KLLSketch] = field(init=False)
+    
+    def __post_init__(self) -> None:
+        self.sketches = {column: KLLSketch(self.epsilon) for column in cfg.HEALTH_COLUMNS}
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Add the indicator values of a chunk.
+        
+        Args:
+            chunk: Patient DataFrame chunk.
+        """
+        for column, sketch in self.sketches.items():
+            sketch.update(chunk[column].to_numpy(dtype=np.float64, na_value=np.nan))
+    
+    def merge(self, other: "QuantileAccumulator") -> None:
+        """
+        Merge another quantile accumulator into this one.
+        
+        Args:
+            other: Accumulator to merge.
+        """
+        for column, sketch in self.sketches.items():
+            sketch.merge(other.sketches[column])
+
+
+def _grow(array: np.ndarray, rows: int, fill: object = 0) -> np.ndarray:
+    """Return ``array`` with room for at least ``rows`` rows, doubling its capacity."""
+    if rows <= len(array):
+        return array
+    grown = np.full((max(rows, 2 * len(array)), *array.shape[1:]), fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class KeyedSums:
+    """
+    Sums and non-missing counts of the health indicators per key.
+    
+    Keys (patient ids, exam dates) map to rows of NumPy arrays through a
+    dict, and the arrays grow by doubling, so adding the groups of a
+    chunk costs O(groups in the chunk) rather than regrouping every key
+    seen so far.
+    
+    Args:
+        name: Name of the key index, e.g. ``cfg.COLUMN_ID_PASIEN``.
+        dtype: Dtype of the key index.
+    """
+    
+    def __init__(self, name: str, dtype: str) -> None:
+        self.name = name
+        self.dtype = dtype
+        self.rows: Dict[Hashable, int] = {}
+        self._sums = np.zeros((0, len(cfg.HEALTH_COLUMNS)))
+        self._counts = np.zeros((0, len(cfg.HEALTH_COLUMNS)), dtype=np.int64)
+    
+    def __len__(self) -> int:
+        """Number of keys."""
+        return len(self.rows)
+    
+    def add(self, keys: Iterable[Hashable], sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Add per-key sums and counts.
+        
+        Args:
+            keys: Distinct keys, one per row of ``sums`` and ``counts``.
+            sums: Indicator sums, shape (keys, indicators).
+            counts: Non-missing indicator counts, same shape.
+            
+        Returns:
+            np.ndarray: Row of every key; new keys get the next rows in
+            the order given.
+        """
+        rows = np.fromiter(
+            (self.rows.setdefault(key, len(self.rows)) for key in keys),
+            dtype=np.intp,
+            count=len(sums),
+        )
+        self._sums = _grow(self._sums, len(self.rows))
+        self._counts = _grow(self._counts, len(self.rows))
+        self._sums[rows] += sums
+        self._counts[rows] += counts
+        return rows
+    
+    def merge(self, other: "KeyedSums") -> np.ndarray:
+        """
+        Add the sums and counts of another instance.
+        
+        Args:
+            other: Sums to merge.
+            
+        Returns:
+            np.ndarray: Row of every key of ``other``, in its row order.
+        """
+        size = len(other)
+        return self.add(other.rows, other._sums[:size], other._counts[:size])
+    
+    def frames(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Get the sums and counts as DataFrames indexed by key.
+        
+        Returns:
+            Tuple of the float64 sums and the int64 counts, keys in order
+            of first appearance.
+        """
+        size = len(self.rows)
+        index = pd.Index(list(self.rows), dtype=self.dtype, name=self.name)
+        return (
+            pd.DataFrame(self._sums[:size], index=index, columns=cfg.HEALTH_COLUMNS),
+            pd.DataFrame(self._counts[:size], index=index, columns=cfg.HEALTH_COLUMNS),
+        )
+
+
+def _group_sums(grouped: DataFrameGroupBy) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+    """Reduce grouped indicator columns to their keys, sums and counts."""
+    sums = grouped.sum()
+    counts = grouped.count().to_numpy(dtype=np.int64)
+    return sums.index, sums.to_numpy(dtype=np.float64), counts
+
+
+@dataclass
+class DailyAccumulator:
+    """Per-date sums and counts of the health indicators."""
+    totals: KeyedSums = field(default_factory=lambda: KeyedSums(
+        cfg.COLUMN_TANGGAL_PERIKSA, cfg.COLUMN_DTYPES[cfg.COLUMN_TANGGAL_PERIKSA]
+    ))
+    
+    @property
+    def sums(self) -> pd.DataFrame:
+        """Indicator sums per date, in date order."""
+        return self.totals.frames()[0].sort_index()
+    
+    @property
+    def counts(self) -> pd.DataFrame:
+        """Non-missing indicator counts per date, in date order."""
+        return self.totals.frames()[1].sort_index()
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Add the values of a chunk.
+        
+        Args:
+            chunk: Patient DataFrame chunk.
+        """
+        grouped = chunk.groupby(cfg.COLUMN_TANGGAL_PERIKSA, sort=False)[cfg.HEALTH_COLUMNS]
+        self.totals.add(*_group_sums(grouped))
+    
+    def merge(self, other: "DailyAccumulator") -> None:
+        """
+        Merge another daily accumulator into this one.
+        
+        Args:
+            other: Accumulator to merge.
+        """
+        self.totals.merge(other.totals)
+    
+    def averages(self, freq: str = "D") -> pd.DataFrame:
+        """Get averages per period, like ``get_period_averages``."""
+        sums, counts = self.sums, self.counts
+        if freq == "D":
+            return sums / counts
+        periods = sums.index.to_period(freq).start_time
+        periods = periods.rename(cfg.COLUMN_TANGGAL_PERIKSA)
+        return sums.groupby(periods).sum() / counts.groupby(periods).sum()
+
+
+@dataclass
+class CategoryCountAccumulator:
+    """Counts of risk codes per indicator and for the final category."""
+    counts: Dict[str, np.ndarray] = field(default_factory=lambda: {
+        column: np.zeros(len(cfg.RISK_LEVELS), dtype=np.int64)
+        for column in (*cfg.INDICATOR_CATEGORY_COLUMNS.values(), cfg.CAT_AKHIR)
+    })
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Categorize a chunk and add its category counts.
+        
+        Args:
+            chunk: Patient DataFrame chunk.
+        """
+        codes = compute_risk_codes(chunk, cfg.HEALTH_COLUMNS)
+        minlength = len(cfg.RISK_LEVELS)
+        for i, column in enumerate(cfg.HEALTH_COLUMNS):
+            category_column = cfg.INDICATOR_CATEGORY_COLUMNS[column]
+            self.counts[category_column] += np.bincount(codes[:, i], minlength=minlength)
+        if len(codes):
+            self.counts[cfg.CAT_AKHIR] += np.bincount(codes.max(axis=1), minlength=minlength)
+    
+    def merge(self, other: "CategoryCountAccumulator") -> None:
+        """
+        Merge another category accumulator into this one.
+        
+        Args:
+            other: Accumulator to merge.
+        """
+        for column, counts in other.counts.items():
+            self.counts[column] += counts
+    
+    def distribution(self, category_column: str) -> pd.Series:
+        """
+        Get the observed categories and their counts.
+        
+        Args:
+            category_column: Category column name.
+            
+        Returns:
+            pd.Series: Counts in the same shape as ``get_indicator_counts``.
+        """
+        counts = self.counts[category_column]
+        observed = np.flatnonzero(counts)
+        index = pd.CategoricalIndex(
+            [cfg.RISK_LEVELS[i] for i in observed],
+            categories=list(cfg.RISK_LEVELS),
+            ordered=True,
+            name=category_column,
+        )
+        return pd.Series(counts[observed], index=index, name=cfg.COLUMN_ID_PASIEN)
+
+
+@dataclass
+class PatientAccumulator:
+    """
+    Per-patient (``id_pasien``) sums and counts of the health indicators,
+    and the first known name of every patient.
+    """
+    totals: KeyedSums = field(default_factory=lambda: KeyedSums(
+        cfg.COLUMN_ID_PASIEN, cfg.COLUMN_DTYPES[cfg.COLUMN_ID_PASIEN]
+    ))
+    _names: np.ndarray = field(
+        init=False, repr=False, default_factory=lambda: np.empty(0, dtype=object)
+    )
+    
+    @property
+    def sums(self) -> pd.DataFrame:
+        """Indicator sums per patient, in order of first appearance."""
+        return self.totals.frames()[0]
+    
+    @property
+    def counts(self) -> pd.DataFrame:
+        """Non-missing indicator counts per patient, in order of first appearance."""
+        return self.totals.frames()[1]
+    
+    @property
+    def names(self) -> pd.Series:
+        """First known name per patient, in order of first appearance."""
+        index = pd.Index(list(self.totals.rows), dtype=self.totals.dtype, name=self.totals.name)
+        return pd.Series(
+            self._names[:len(index)], index=index, dtype="string[pyarrow]", name=cfg.COLUMN_NAMA
+        )
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Add the values of a chunk.
+        
+        Args:
+            chunk: Patient DataFrame chunk.
+        """
+        grouped = chunk.groupby(cfg.COLUMN_ID_PASIEN, sort=False, observed=True)
+        rows = self.totals.add(*_group_sums(grouped[cfg.HEALTH_COLUMNS]))
+        self._add_names(rows, grouped[cfg.COLUMN_NAMA].first().to_numpy(dtype=object))
+    
+    def merge(self, other: "PatientAccumulator") -> None:
+        """
+        Merge another patient accumulator into this one.
+        
+        Args:
+            other: Accumulator to merge.
+        """
+        rows = self.totals.merge(other.totals)
+        self._add_names(rows, other._names[:len(other.totals)])
+    
+    def _add_names(self, rows: np.ndarray, names: np.ndarray) -> None:
+        """Fill in the names of the given rows that have none yet (like ``first``)."""
+        self._names = _grow(self._names, len(self.totals), fill=None)
+        unnamed = pd.isna(self._names[rows])
+        self._names[rows[unnamed]] = names[unnamed]
+    
+    def patient_means(self) -> pd.DataFrame:
+        """Get the same result as ``get_patient_means``."""
+        sums, counts = self.totals.frames()
+        means = sums / counts
+        means.insert(0, cfg.COLUMN_NAMA, self.names)
+        return means
+    
+    def top_risk_patients(
+        self,
+        n: int = cfg.TOP_PATIENTS_COUNT,
+        by: str = cfg.TOP_PATIENTS_RANK_BY
+    ) -> pd.DataFrame:
+        """Get the same result as ``get_top_risk_patients``."""
+        return select_top_patients(self.patient_means(), n, by)
+
+
+class StreamingAnalysis:
+    """
+    Chunk-by-chunk analysis state for patient data.
+    
+    The accumulators hold state per distinct exam date and patient ID,
+    independent of the number of rows. Checking a stream for repeated
+    (id_pasien, tanggal_periksa) pairs keeps 8 bytes per accepted row
+    (see ``DataValidator``), so ``analyze_csv_stream`` only does so when
+    asked.
+    """
+    
+    def __init__(self) -> None:
+        self.moments = MomentAccumulator([cfg.COLUMN_UMUR, *cfg.HEALTH_COLUMNS])
+        self.quantiles = QuantileAccumulator()
+        self.daily = DailyAccumulator()
+        self.categories = CategoryCountAccumulator()
+        self.patients = PatientAccumulator()
+        self.trends = TrendEngine()
+        self.cube = AggregateCube()
+        self.patient_ids: Set[str] = set()
+        self.total_examinations = 0
+        self.total_columns = 0
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Feed one chunk of patient data into every accumulator.
+        
+        Args:
+            chunk: Patient DataFrame chunk.
+        """
+        self.moments.update(chunk)
+        self.quantiles.update(chunk)
+        self.daily.update(chunk)
+        self.categories.update(chunk)
+        self.patients.update(chunk)
+        self.trends.update(chunk)
+        self.cube.update(chunk)
+        self.patient_ids.update(chunk[cfg.COLUMN_ID_PASIEN].dropna().unique())
+        self.total_examinations += len(chunk)
+        self.total_columns = chunk.shape[1]
+    
+    def merge(self, other: "StreamingAnalysis") -> None:
+        """
+        Merge the state of another analysis (e.g. from another worker).
+        
+        Args:
+            other: Analysis to merge into this one.
+        """
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+        self.daily.merge(other.daily)
+        self.categories.merge(other.categories)
+        self.patients.merge(other.patients)
+        self.trends.merge(other.trends)
+        self.cube.merge(other.cube)
+        self.patient_ids |= other.patient_ids
+        self.total_examinations += other.total_examinations
+        self.total_columns = self.total_columns or other.total_columns
+    
+    def patient_summary(self) -> Dict[str, float]:
+        """Get the same summary as ``get_patient_summary``."""
+        umur = self.moments.columns.index(cfg.COLUMN_UMUR)
+        has_age = self.moments.count[umur] > 0
+        return {
+            "unique_patients": len(self.patient_ids),
+            "min_age": int(self.moments.minimum[umur]) if has_age else np.nan,
+            "max_age": int(self.moments.maximum[umur]) if has_age else np.nan,
+            "mean_age": self.moments.means()[cfg.COLUMN_UMUR],
+            "total_examinations": self.total_examinations,
+            "total_columns": self.total_columns,
+        }
+    
+    def statistics(self) -> HealthStatistics:
+        """Get the same statistics as ``calculate_statistics``."""
+        means = self.moments.means()
+        stds = self.moments.stds()
+        return HealthStatistics(
+            mean_tekanan=means[cfg.COLUMN_TEKANAN_DARAH],
+            mean_gula=means[cfg.COLUMN_GULA_DARAH],
+            mean_kolesterol=means[cfg.COLUMN_KOLESTEROL],
+            std_tekanan=stds[cfg.COLUMN_TEKANAN_DARAH],
+            std_gula=stds[cfg.COLUMN_GULA_DARAH],
+            std_kolesterol=stds[cfg.COLUMN_KOLESTEROL],
+        )
+    
+    def describe(self) -> pd.DataFrame:
+        """
+        Get the same table as ``get_all_statistics``.
+        
+        Count, mean, std, min and max are exact; the quartiles come from
+        the quantile sketches and are within ``cfg.QUANTILE_SKETCH_EPSILON``
+        of their rank.
+        """
+        columns = cfg.HEALTH_COLUMNS
+        positions = [self.moments.columns.index(column) for column in columns]
+        moments = pd.DataFrame(
+            [
+                self.moments.count[positions].astype("float64"),
+                self.moments.means()[columns].to_numpy(),
+                self.moments.stds()[columns].to_numpy(),
+                self.moments.minimum[positions],
+                self.moments.maximum[positions],
+            ],
+            index=["count", "mean", "std", "min", "max"],
+            columns=columns,
+        )
+        return describe_table(moments, self.quantiles.sketches)
+    
+    def daily_averages(self) -> pd.DataFrame:
+        """Get the same result as ``get_daily_averages``."""
+        return self.daily.averages()
+    
+    def period_averages(self, freq: str = "D") -> pd.DataFrame:
+        """Get the same result as ``get_period_averages``."""
+        if freq not in cfg.TREND_FREQUENCIES:
+            raise ValueError(
+                f"Unsupported frequency {freq!r}, "
+                f"expected one of {list(cfg.TREND_FREQUENCIES)}"
+            )
+        return self.daily.averages(freq)
+    
+    def trend_engine(self) -> TrendEngine:
+        """Get the trend engine of the rows seen so far, like ``get_trend_engine``."""
+        return self.trends
+    
+    def aggregate_cube(self) -> AggregateCube:
+        """Get the aggregate cube of the rows seen so far, like ``get_aggregate_cube``."""
+        return self.cube
+    
+    def risk_distribution(self) -> pd.Series:
+        """Get the same result as ``get_risk_distribution``."""
+        return self.categories.distribution(cfg.CAT_AKHIR)
+    
+    def indicator_counts(self, category_column: str) -> pd.Series:
+        """Get the same result as ``get_indicator_counts``."""
+        return self.categories.distribution(category_column)
+    
+    def top_risk_patients(
+        self,
+        n: int = cfg.TOP_PATIENTS_COUNT,
+        by: str = cfg.TOP_PATIENTS_RANK_BY
+    ) -> pd.DataFrame:
+        """Get the same result as ``get_top_risk_patients``."""
+        return self.patients.top_risk_patients(n, by)
+
+
+class IncrementalAnalysis(StreamingAnalysis):
+    """
+    Analysis state that is kept up to date as new exams arrive.
+    
+    New rows are folded into the running moments, daily buckets,
+    category counts and per-patient sums in O(new rows), and rolling
+    trends are recomputed only from the first day the rows fall on; all
+    results equal a full recompute over every row seen so far (means
+    and standard deviations up to floating-point rounding).
+    """
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._csv_path: Optional[Path] = None
+        self._csv_offset = 0
+        # Validates the followed file from its first read through every
+        # tail, so duplicates are detected across the tail boundary
+        self._validator = DataValidator()
+    
+    def append(self, rows: pd.DataFrame) -> None:
+        """
+        Add newly arrived exam rows.
+        
+        Args:
+            rows: Patient DataFrame with the new exams.
+        """
+        if len(rows):
+            self.update(rows)
+    
+    def append_csv_tail(
+        self,
+        file_path: Optional[str] = None,
+        chunksize: int = cfg.STREAM_CHUNK_SIZE
+    ) -> int:
+        """
+        Add the rows appended to a CSV file since the previous call.
+        
+        The first call reads the file in chunks up to its size at the
+        time of the call; later calls only read the bytes after that
+        (rows appended during the first read are left for the next call).
+        Every read is validated by the same ``DataValidator``, so a new
+        row repeating an (id_pasien, tanggal_periksa) pair read before is
+        quarantined, as in a full load of the file.
+        
+        Args:
+            file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+            chunksize: Number of rows per chunk for the first read.
+            
+        Returns:
+            int: Number of new rows added.
+            
+        Raises:
+            DataLoadError: If the file cannot be read.
+            ValueError: If called with a different file than before.
+        """
+        path = Path(file_path) if file_path else cfg.DATA_FILE_PATH
+        if self._csv_path is not None and path.resolve() != self._csv_path:
+            raise ValueError(f"Already following {self._csv_path}, not {path}")
+        
+        before = self.total_examinations
+        if self._csv_path is None:
+            size = path.stat().st_size if path.exists() else 0
+            chunks = iter_data_chunks(
+                str(path), chunksize, end=size, validator=self._validator
+            )
+            for chunk in chunks:
+                self.update(chunk)
+            self._csv_path = path.resolve()
+            self._csv_offset = size
+        else:
+            rows, self._csv_offset = read_csv_tail(
+                str(path), self._csv_offset, self._validator
+            )
+            self.append(rows)
+        return self.total_examinations - before
+
+
+def analyze_chunks(chunks: Iterable[pd.DataFrame]) -> StreamingAnalysis:
+    """
+    Run the streaming analysis over an iterable of DataFrame chunks.
+    
+    Args:
+        chunks: Patient DataFrame chunks.
+        
+    Returns:
+        StreamingAnalysis: Accumulated analysis state.
+    """
+    analysis = StreamingAnalysis()
+    for chunk in chunks:
+        analysis.update(chunk)
+    return analysis
+
+
+def analyze_csv_stream(
+    file_path: Optional[str] = None,
+    chunksize: int = cfg.STREAM_CHUNK_SIZE,
+    check_duplicates: bool = False
+) -> StreamingAnalysis:
+    """
+    Analyze a patient CSV file without loading it into memory at once.
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        chunksize: Number of rows per chunk.
+        check_duplicates: Quarantine repeated (id_pasien, tanggal_periksa)
+            pairs as a full load does, at 8 bytes of memory per row.
+            
+    Returns:
+        StreamingAnalysis: Accumulated analysis state.
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+    """
+    validator = DataValidator(check_duplicates)
+    return analyze_chunks(iter_data_chunks(file_path, chunksize, validator=validator))
+
+
+def stream_top_risk_patients(
+    file_path: Optional[str] = None,
+    n: int = cfg.TOP_PATIENTS_COUNT,
+    by: str = cfg.TOP_PATIENTS_RANK_BY,
+    chunksize: int = cfg.STREAM_CHUNK_SIZE,
+    check_duplicates: bool = False
+) -> pd.DataFrame:
+    """
+    Get the top-risk patients of a CSV file read in chunks.
+    
+    Only per-patient sums are kept between chunks, so the analysis state
+    grows with the number of patients rather than the number of exams
+    (unless ``check_duplicates`` is set).
+    
+    Args:
+        file_path: Optional path to the CSV file. Defaults to DATA_FILE_PATH.
+        n: Number of patients to return.
+        by: Column to rank by, as in ``get_top_risk_patients``.
+        chunksize: Number of rows per chunk.
+        check_duplicates: Quarantine repeated (id_pasien, tanggal_periksa)
+            pairs as a full load does, at 8 bytes of memory per exam.
+            
+    Returns:
+        pd.DataFrame: Same result as ``get_top_risk_patients`` on the
+        whole file (with ``check_duplicates``, or if no exam repeats).
+        
+    Raises:
+        DataLoadError: If the file cannot be loaded or is invalid.
+        ValueError: If ``by`` is not a rankable column.
+    """
+    patients = PatientAccumulator()
+    validator = DataValidator(check_duplicates)
+    for chunk in iter_data_chunks(file_path, chunksize, validator=validator):
+        patients.update(chunk)
+    return patients.top_risk_patients(n, by)
@@ -0,0 +1,305 @@
+"""
+Synthetic patient data generator.
+Produces deterministic examination records with the same schema as
+``data_pasien.csv`` at any size, for benchmarks and load tests.
+
+Rows are generated in fixed-size blocks seeded by ``(seed, block)``, and
+per-patient attributes are derived by hashing the patient number, so any
+row range can be produced independently: the output does not depend on
+the chunk size, and 10^8 rows can be written with bounded memory.
+
+Patients are assigned to rows by an affine permutation of the row
+number, so every run of ``n_patients`` consecutive rows has distinct
+patients. Since the rows of a day are consecutive, no
+(id_pasien, tanggal_periksa) pair repeats (as long as a day holds no
+more rows than there are patients), and the data passes the duplicate
+check of ``data_quality`` without quarantining rows.
+"""
+
+import argparse
+import math
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import config as cfg
+
+# Version of the generated data; bump it when the same arguments start
+# producing different rows, so cached datasets are regenerated
+GENERATOR_VERSION = 2
+
+# Rows per independently seeded block
+_BLOCK_SIZE = 1 << 16
+
+_INVERSE_GOLDEN_RATIO = (5 ** 0.5 - 1) / 2
+
+_NAMES = (
+    "Rangga", "Fadli", "Ivan", "Faizul", "Dewi", "Siti", "Budi", "Ayu",
+    "Rina", "Agus", "Putri", "Dimas", "Nur", "Wahyu", "Lestari", "Eko",
+    "Indah", "Yusuf", "Sari", "Hendra", "Maya", "Rizky", "Fitri", "Bayu",
+)
+_GENDERS = ("L", "P")
+
+_AGE_RANGE = (18, 85)
+
+# Clinical plausibility bounds per indicator
+_VITAL_BOUNDS = {
+    cfg.COLUMN_TEKANAN_DARAH: (80, 220),
+    cfg.COLUMN_GULA_DARAH: (60, 400),
+    cfg.COLUMN_KOLESTEROL: (110, 400),
+}
+
+# Increase of each indicator per year of age above 45, in units of the
+# indicator's Perlu Waspada band width
+_AGE_EFFECT = 0.02
+
+
+def _mix64(values: np.ndarray, salt: int) -> np.ndarray:
+    """SplitMix64 finalizer: hash uint64 ``values`` with ``salt``."""
+    with np.errstate(over="ignore"):
+        z = values.astype(np.uint64) + np.uint64((salt * 0x9E3779B97F4A7C15) % 2**64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _hash_uniform(patients: np.ndarray, seed: int, salt: int) -> np.ndarray:
+    """Deterministic uniform [0, 1) value per patient."""
+    bits = _mix64(_mix64(patients, seed), salt) >> np.uint64(11)
+    return bits.astype(np.float64) * 2.0 ** -53
+
+
+def _hash_normal(patients: np.ndarray, seed: int, salt: int) -> np.ndarray:
+    """Deterministic standard normal value per patient (Box-Muller)."""
+    u1 = 1.0 - _hash_uniform(patients, seed, salt)
+    u2 = _hash_uniform(patients, seed, salt + 1)
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+
+def _patient_numbers(rows: np.ndarray, n_patients: int, seed: int) -> np.ndarray:
+    """
+    Assign zero-based patient numbers to row numbers.
+    
+    ``(a * row + b) % n_patients`` with ``a`` coprime to ``n_patients``
+    is a bijection on every run of ``n_patients`` consecutive rows, so
+    such a run never repeats a patient. ``a`` is near ``n_patients``
+    divided by the golden ratio, which scatters consecutive rows evenly
+    across the patients; both are offset by ``seed``.
+    """
+    offsets = _mix64(np.array([0, 1], dtype=np.uint64), seed)
+    a = int(n_patients * _INVERSE_GOLDEN_RATIO) + int(offsets[0] % np.uint64(n_patients // 64 + 1))
+    b = int(offsets[1] % np.uint64(n_patients))
+    while math.gcd(a, n_patients) != 1:
+        a += 1
+    return ((rows * a + b) % n_patients).astype(np.uint64)
+
+
+def _patient_ids(patients: np.ndarray, width: int) -> pd.arrays.ArrowStringArray:
+    """Format zero-based patient numbers as ``P001``-style ids."""
+    numbers = pc.cast(pa.array(patients + 1), pa.string())
+    padded = pc.utf8_lpad(numbers, width=width, padding="0")
+    return pd.arrays.ArrowStringArray(pc.binary_join_element_wise("P", padded, ""))
+
+
+def _generate_block(
+    block: int,
+    n_rows: int,
+    n_patients: int,
+    seed: int,
+    span_days: int
+) -> dict:
+    """Generate the column arrays of one block of rows."""
+    start = block * _BLOCK_SIZE
+    stop = max(min(start + _BLOCK_SIZE, n_rows), start)
+    rng = np.random.default_rng([seed, block])
+    
+    # Dates increase with the row number, so the whole dataset is sorted
+    position = np.arange(start, stop) + rng.random(stop - start)
+    days = (position * span_days / n_rows).astype(np.int64)
+    
+    patients = _patient_numbers(np.arange(start, stop, dtype=np.int64), n_patients, seed)
+    age_low, age_high = _AGE_RANGE
+    ages = age_low + (_hash_uniform(patients, seed, 1) * (age_high - age_low + 1)).astype(np.int64)
+    
+    columns = {
+        "patients": patients,
+        "names": (_hash_uniform(patients, seed, 2) * len(_NAMES)).astype(np.int64),
+        "ages": ages,
+        "genders": (_hash_uniform(patients, seed, 3) * len(_GENDERS)).astype(np.int8),
+        "days": days,
+    }
+    
+    # Each patient has a stable baseline around the indicator's Normal
+    # threshold, rising with age; visits scatter around it
+    for salt, (column, (normal_max, high_max)) in enumerate(
+        cfg.INDICATOR_THRESHOLDS.items(), start=10
+    ):
+        band = high_max - normal_max
+        baseline = (
+            normal_max
+            + 0.8 * band * _hash_normal(patients, seed, 2 * salt)
+            + band * _AGE_EFFECT * (ages - 45)
+        )
+        values = baseline + 0.3 * band * rng.standard_normal(stop - start)
+        low, high = _VITAL_BOUNDS[column]
+        columns[column] = np.clip(np.rint(values), low, high).astype(np.int16)
+    return columns
+
+
+def generate_patient_data(
+    n_rows: int,
+    seed: int = 0,
+    start: int = 0,
+    stop: Optional[int] = None,
+    n_patients: Optional[int] = None,
+    start_date: str = cfg.SYNTHETIC_START_DATE,
+    span_days: int = cfg.SYNTHETIC_DATE_SPAN_DAYS
+) -> pd.DataFrame:
+    """
+    Generate synthetic patient examinations.
+    
+    Rows ``start`` to ``stop`` of an ``n_rows``-row dataset are
+    generated; the same arguments always yield the same rows.
+    
+    Args:
+        n_rows: Total number of rows in the dataset.
+        seed: Random seed.
+        start: First row to generate.
+        stop: Row after the last row to generate. Defaults to ``n_rows``.
+        n_patients: Number of distinct patients. Defaults to
+            ``n_rows / SYNTHETIC_VISITS_PER_PATIENT``.
+        start_date: Date of the first examination.
+        span_days: Number of days the examinations are spread over.
+        
+    Returns:
+        pd.DataFrame: Rows with the ``COLUMN_DTYPES`` schema, sorted by date.
+        
+    Raises:
+        ValueError: If the row range or sizes are invalid.
+    """
+    stop = n_rows if stop is None else stop
+    if n_rows < 1 or span_days < 1 or not 0 <= start <= stop <= n_rows:
+        raise ValueError(f"Invalid row range {start}:{stop} of {n_rows} rows")
+    if n_patients is None:
+        n_patients = max(1, n_rows // cfg.SYNTHETIC_VISITS_PER_PATIENT)
+    
+    first_block = start // _BLOCK_SIZE
+    last_block = max(-(-stop // _BLOCK_SIZE), first_block + 1)
+    blocks = [
+        _generate_block(block, n_rows, n_patients, seed, span_days)
+        for block in range(first_block, last_block)
+    ]
+    offset = start - first_block * _BLOCK_SIZE
+    rows = slice(offset, offset + stop - start)
+    arrays = {
+        key: np.concatenate([block[key] for block in blocks])[rows]
+        for key in blocks[0]
+    }
+    
+    width = max(3, len(str(n_patients)))
+    names = pa.array(_NAMES).take(pa.array(arrays["names"]))
+    dates = np.datetime64(start_date, "D") + arrays["days"].astype("timedelta64[D]")
+    return pd.DataFrame({
+        cfg.COLUMN_ID_PASIEN: _patient_ids(arrays["patients"], width),
+        cfg.COLUMN_NAMA: pd.arrays.ArrowStringArray(names),
+        cfg.COLUMN_UMUR: arrays["ages"].astype(np.uint8),
+        cfg.COLUMN_JENIS_KELAMIN: pd.Categorical.from_codes(arrays["genders"], _GENDERS),
+        cfg.COLUMN_TANGGAL_PERIKSA: dates.astype("datetime64[ns]"),
+        cfg.COLUMN_TEKANAN_DARAH: arrays[cfg.COLUMN_TEKANAN_DARAH],
+        cfg.COLUMN_GULA_DARAH: arrays[cfg.COLUMN_GULA_DARAH],
+        cfg.COLUMN_KOLESTEROL: arrays[cfg.COLUMN_KOLESTEROL],
+    })
+
+
+def iter_patient_data(
+    n_rows: int,
+    seed: int = 0,
+    chunksize: int = cfg.STREAM_CHUNK_SIZE,
+    **kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate a synthetic dataset in bounded-size chunks.
+    
+    Args:
+        n_rows: Total number of rows in the dataset.
+        seed: Random seed.
+        chunksize: Number of rows per chunk.
+        **kwargs: Further arguments of ``generate_patient_data``.
+        
+    Yields:
+        pd.DataFrame: Consecutive chunks of the dataset.
+    """
+    for start in range(0, n_rows, chunksize):
+        yield generate_patient_data(
+            n_rows, seed, start, min(start + chunksize, n_rows), **kwargs
+        )
+
+
+def write_patient_csv(
+    path: Path,
+    n_rows: int,
+    seed: int = 0,
+    chunksize: int = cfg.STREAM_CHUNK_SIZE,
+    **kwargs
+) -> Path:
+    """
+    Write a synthetic dataset as a patient CSV file, chunk by chunk.
+    
+    Args:
+        path: Target CSV file.
+        n_rows: Total number of rows in the dataset.
+        seed: Random seed.
+        chunksize: Number of rows generated and written at a time.
+        **kwargs: Further arguments of ``generate_patient_data``.
+        
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as output:
+        for i, chunk in enumerate(iter_patient_data(n_rows, seed, chunksize, **kwargs)):
+            chunk.to_csv(output, header=i == 0, index=False, date_format=cfg.DATE_FORMAT)
+    tmp_path.replace(path)
+    return path
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments.
+    
+    Args:
+        argv: Argument list. Defaults to ``sys.argv[1:]``.
+        
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Buat data pasien sintetis (CSV)")
+    parser.add_argument("output", type=Path, help="File CSV tujuan")
+    parser.add_argument(
+        "--rows", type=lambda s: int(float(s)), default=1000,
+        help="Jumlah baris, misalnya 1e6",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed acak")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=cfg.STREAM_CHUNK_SIZE,
+        help="Jumlah baris yang dibuat dan ditulis per potongan",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Write a synthetic dataset from the command line."""
+    args = parse_args(argv)
+    path = write_patient_csv(args.output, args.rows, args.seed, args.chunksize)
+    print(f"{args.rows} baris data sintetis ditulis ke: {path}")
+
+
+if __name__ == "__main__":
+    main()
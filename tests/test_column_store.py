@@ -0,0 +1,102 @@
+"""
+Tests for answering the analyses from the memory-mapped column store.
+"""
+
+import pickle
+import tempfile
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+
+import config as cfg
+from column_store import ColumnStore, build_column_store
+from data_loader import clear_cache, load_data_patients
+from health_analyzer import (
+    calculate_statistics,
+    compute_risk_pipeline,
+    get_daily_averages,
+    get_indicator_counts,
+    get_patient_summary,
+    get_period_averages,
+    get_risk_distribution,
+)
+from synthetic_data import write_patient_csv
+
+SYNTHETIC_ROWS = 3000
+
+
+class ColumnStoreEquivalenceTest(unittest.TestCase):
+    """The column store results equal the in-memory analysis of the CSV."""
+    
+    @classmethod
+    def setUpClass(cls) -> None:
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.addClassCleanup(clear_cache)
+        csv_path = write_patient_csv(
+            Path(directory.name) / "data_pasien.csv", SYNTHETIC_ROWS, seed=3
+        )
+        # A chunk size that does not divide the rows, so chunks are appended unevenly
+        cls.store = build_column_store(str(csv_path), chunksize=700)
+        cls.df = load_data_patients(str(csv_path))
+    
+    def test_columns(self) -> None:
+        self.assertEqual(len(self.store), len(self.df))
+        pd.testing.assert_frame_equal(self.store.to_frame(), self.df[self.store.columns])
+    
+    def test_reopen(self) -> None:
+        reopened = ColumnStore(self.store.root)
+        pd.testing.assert_frame_equal(reopened.to_frame(), self.store.to_frame())
+    
+    def test_pickled_slice(self) -> None:
+        view = pickle.loads(pickle.dumps(self.store.slice(100, 200)))
+        pd.testing.assert_frame_equal(
+            view.to_frame(), self.df[self.store.columns].iloc[100:200]
+        )
+    
+    def test_summary(self) -> None:
+        expected = get_patient_summary(self.df)
+        summary = get_patient_summary(self.store)
+        # The store keeps only the analysed columns
+        del expected["total_columns"], summary["total_columns"]
+        self.assertEqual(summary, expected)
+    
+    def test_statistics(self) -> None:
+        expected = asdict(calculate_statistics(self.df))
+        for field, value in asdict(calculate_statistics(self.store)).items():
+            with self.subTest(field=field):
+                self.assertAlmostEqual(value, expected[field])
+    
+    def test_risk_pipeline(self) -> None:
+        expected = compute_risk_pipeline(self.df, columns_only=True)
+        categories = compute_risk_pipeline(self.store, columns_only=True)
+        pd.testing.assert_frame_equal(categories, expected)
+        pd.testing.assert_series_equal(
+            get_risk_distribution(categories), get_risk_distribution(expected)
+        )
+        for category_column in cfg.INDICATOR_CATEGORY_COLUMNS.values():
+            with self.subTest(category_column=category_column):
+                pd.testing.assert_series_equal(
+                    get_indicator_counts(categories, category_column),
+                    get_indicator_counts(expected, category_column),
+                )
+    
+    def test_risk_pipeline_requires_columns_only(self) -> None:
+        with self.assertRaises(ValueError):
+            compute_risk_pipeline(self.store)
+    
+    def test_averages(self) -> None:
+        pd.testing.assert_frame_equal(
+            get_daily_averages(self.store), get_daily_averages(self.df)
+        )
+        for freq in cfg.TREND_FREQUENCIES:
+            with self.subTest(freq=freq):
+                pd.testing.assert_frame_equal(
+                    get_period_averages(self.store, freq), get_period_averages(self.df, freq)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
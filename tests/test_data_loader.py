@@ -0,0 +1,310 @@
+"""
+Tests for loading patient data files, CSV tails and partitioned dataset directories.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List, Optional
+from unittest import mock
+
+import pandas as pd
+
+import config as cfg
+from data_loader import (
+    DataLoadError,
+    DatasetCache,
+    DateIndex,
+    clear_cache,
+    get_cache_stats,
+    get_quarantine_path,
+    get_sidecar_path,
+    list_partitions,
+    load_data_patients,
+    load_data_with_date_filter,
+    read_csv_tail,
+    write_partitioned_dataset,
+)
+
+HEADER = "id_pasien,nama,umur,jenis_kelamin,tanggal_periksa,tekanan_darah,gula_darah,kolesterol\n"
+ROWS = [
+    "P001,Rangga,35,L,2024-01-05,120,95,180\n",
+    "P002,Fadli,42,P,2024-01-31,130,110,200\n",
+    "P001,Rangga,35,L,2024-02-01,145,130,250\n",
+    "P003,Siti,50,P,2024-03-12,118,90,170\n",
+]
+# Blood pressure outside VALID_RANGES
+INVALID = "P004,Dewi,29,P,2024-01-20,999,90,170\n"
+
+
+class DataFileTestCase(unittest.TestCase):
+    """Writes ``HEADER`` and ``ROWS`` to a CSV file in a temporary directory."""
+    
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(clear_cache)
+        self.directory = Path(directory.name)
+        self.path = self.directory / "data_pasien.csv"
+        self.path.write_text(HEADER + "".join(ROWS))
+
+
+class SchemaTest(DataFileTestCase):
+
+    def test_columns_are_parsed_into_the_declared_dtypes(self) -> None:
+        df = load_data_patients(str(self.path))
+        self.assertEqual(
+            {column: str(dtype) for column, dtype in df.dtypes.items()},
+            {
+                column: str(pd.api.types.pandas_dtype(dtype))
+                for column, dtype in cfg.COLUMN_DTYPES.items()
+            },
+        )
+    
+    def test_values_survive_the_compact_dtypes(self) -> None:
+        df = load_data_patients(str(self.path))
+        expected = pd.read_csv(self.path, parse_dates=[cfg.COLUMN_TANGGAL_PERIKSA])
+        for column in expected.columns:
+            self.assertEqual(df[column].tolist(), expected[column].tolist(), column)
+
+
+class SidecarCacheTest(DataFileTestCase):
+
+    def load_without_parsing(self) -> pd.DataFrame:
+        """Load the CSV into an empty cache, failing if it is parsed instead."""
+        clear_cache()
+        with mock.patch("data_loader._read_patient_csv", side_effect=AssertionError("CSV parsed")):
+            return load_data_patients(str(self.path))
+    
+    def shift_mtime(self) -> None:
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    
+    def test_sidecar_is_read_instead_of_the_csv(self) -> None:
+        df = load_data_patients(str(self.path))
+        self.assertTrue(get_sidecar_path(str(self.path)).exists())
+        pd.testing.assert_frame_equal(self.load_without_parsing(), df)
+    
+    def test_appended_rows_invalidate_the_sidecar(self) -> None:
+        load_data_patients(str(self.path))
+        with open(self.path, "a") as file:
+            file.write("P005,Budi,61,L,2024-03-20,150,140,260\n")
+        clear_cache()
+        self.assertEqual(len(load_data_patients(str(self.path))), len(ROWS) + 1)
+        self.assertEqual(len(self.load_without_parsing()), len(ROWS) + 1)
+    
+    def test_same_size_edit_is_detected_by_content_hash(self) -> None:
+        load_data_patients(str(self.path))
+        self.path.write_text(self.path.read_text().replace(",120,95,", ",125,95,"))
+        self.shift_mtime()
+        clear_cache()
+        df = load_data_patients(str(self.path))
+        self.assertEqual(df[cfg.COLUMN_TEKANAN_DARAH].iloc[0], 125)
+    
+    def test_touched_file_keeps_the_sidecar(self) -> None:
+        df = load_data_patients(str(self.path))
+        self.shift_mtime()
+        pd.testing.assert_frame_equal(self.load_without_parsing(), df)
+        # Re-stamped with the new mtime, so the next load skips hashing
+        with mock.patch("data_loader._hash_file", side_effect=AssertionError("CSV hashed")):
+            pd.testing.assert_frame_equal(self.load_without_parsing(), df)
+
+
+class DatasetCacheTest(DataFileTestCase):
+
+    def test_unchanged_file_is_served_from_memory(self) -> None:
+        cache = DatasetCache()
+        df = cache.get(self.path)
+        self.assertIs(cache.get(self.path), df)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+    
+    def test_changed_file_is_reloaded(self) -> None:
+        cache = DatasetCache()
+        cache.get(self.path)
+        with open(self.path, "a") as file:
+            file.write("P005,Budi,61,L,2024-03-20,150,140,260\n")
+        self.assertEqual(len(cache.get(self.path)), len(ROWS) + 1)
+        self.assertEqual(cache.misses, 2)
+    
+    def test_least_recently_used_dataset_is_evicted(self) -> None:
+        other = self.directory / "lain.csv"
+        other.write_text(HEADER + ROWS[0])
+        cache = DatasetCache(max_bytes=1)
+        cache.get(self.path)
+        # The most recently loaded dataset is kept even over the budget
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.get(other)
+        self.assertEqual((cache.stats()["entries"], cache.evictions), (1, 1))
+        cache.get(other)
+        self.assertEqual(cache.hits, 1)
+    
+    def test_invalidate_drops_one_dataset(self) -> None:
+        other = self.directory / "lain.csv"
+        other.write_text(HEADER + ROWS[0])
+        cache = DatasetCache()
+        df = cache.get(self.path)
+        cache.get(other)
+        cache.invalidate(other)
+        self.assertIs(cache.get(self.path), df)
+        self.assertEqual(cache.stats()["entries"], 1)
+
+
+class DateRangeTest(DataFileTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        dates = ["2024-01-12", "2024-01-05", None, "2024-01-31", "2024-01-05"]
+        self.index = DateIndex(pd.DataFrame({
+            cfg.COLUMN_TANGGAL_PERIKSA: pd.to_datetime(dates),
+            "baris": range(len(dates)),
+        }))
+    
+    def rows(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[int]:
+        return self.index.slice(start_date, end_date)["baris"].tolist()
+    
+    def test_bounds_are_inclusive(self) -> None:
+        self.assertEqual(self.rows("2024-01-05", "2024-01-05"), [1, 4])
+        self.assertEqual(self.rows("2024-01-05", "2024-01-12"), [1, 4, 0])
+        self.assertEqual(self.rows("2024-01-06", "2024-01-31"), [0, 3])
+    
+    def test_open_and_empty_ranges(self) -> None:
+        self.assertEqual(self.rows(end_date="2024-01-11"), [1, 4])
+        self.assertEqual(self.rows(start_date="2024-01-13"), [3])
+        self.assertEqual(self.rows("2024-02-01", "2024-12-31"), [])
+        self.assertEqual(self.rows("2023-01-01", "2024-01-04"), [])
+    
+    def test_rows_without_a_date_only_appear_unbounded(self) -> None:
+        self.assertEqual(self.rows(), [1, 4, 0, 3, 2])
+        self.assertEqual(self.rows("2000-01-01", "2100-01-01"), [1, 4, 0, 3])
+    
+    def test_invalid_bounds_are_rejected(self) -> None:
+        for start_date, end_date in [
+            ("2024-02-30", None),
+            ("05-01-2024", None),
+            (None, "2024-01-05 10:00"),
+            ("2024-01-12", "2024-01-05"),
+        ]:
+            with self.assertRaises(ValueError, msg=(start_date, end_date)):
+                self.index.slice(start_date, end_date)
+    
+    def test_file_filter_matches_a_boolean_mask(self) -> None:
+        df = load_data_patients(str(self.path))
+        dates = df[cfg.COLUMN_TANGGAL_PERIKSA]
+        expected = df[(dates >= "2024-01-31") & (dates <= "2024-03-12")]
+        pd.testing.assert_frame_equal(
+            load_data_with_date_filter("2024-01-31", "2024-03-12", str(self.path)), expected
+        )
+
+
+class PartitionPruningTest(DataFileTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.root = self.directory / "data_pasien"
+        write_partitioned_dataset(pd.read_csv(self.path, dtype=str), str(self.root))
+    
+    def test_partitions_are_listed_in_date_order(self) -> None:
+        partitions = list_partitions(str(self.root))
+        self.assertEqual(
+            [(partition.start, partition.end.normalize()) for partition in partitions],
+            [
+                (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31")),
+                (pd.Timestamp("2024-02-01"), pd.Timestamp("2024-02-29")),
+                (pd.Timestamp("2024-03-01"), pd.Timestamp("2024-03-31")),
+            ],
+        )
+    
+    def test_partitions_outside_the_range_are_not_read(self) -> None:
+        # Reading the March partition would fail on its missing columns
+        march = self.root / f"{cfg.COLUMN_TANGGAL_PERIKSA}=2024-03" / "part-0.csv"
+        march.write_text("bukan,data,pasien\n")
+        
+        df = load_data_with_date_filter("2024-01-05", "2024-02-29", str(self.root))
+        expected = load_data_with_date_filter("2024-01-05", "2024-02-29", str(self.path))
+        pd.testing.assert_frame_equal(df, expected.reset_index(drop=True))
+        with self.assertRaises(DataLoadError):
+            load_data_with_date_filter("2024-02-01", "2024-03-01", str(self.root))
+    
+    def test_bounds_inside_a_partition_are_exact(self) -> None:
+        df = load_data_with_date_filter("2024-01-06", "2024-02-01", str(self.root))
+        self.assertEqual(df[cfg.COLUMN_ID_PASIEN].tolist(), ["P002", "P001"])
+    
+    def test_year_and_day_partitions(self) -> None:
+        root = self.directory / "campuran"
+        df = pd.read_csv(self.path, dtype=str)
+        january = df[cfg.COLUMN_TANGGAL_PERIKSA] < "2024-02-01"
+        write_partitioned_dataset(df[january], str(root), freq="D")
+        write_partitioned_dataset(df[~january], str(root), freq="Y")
+        self.assertEqual(len(list_partitions(str(root))), 3)
+        rows = load_data_with_date_filter("2024-01-31", "2024-02-01", str(root))
+        self.assertEqual(rows[cfg.COLUMN_ID_PASIEN].tolist(), ["P002", "P001"])
+    
+    def test_invalid_partition_name_is_rejected(self) -> None:
+        (self.root / f"{cfg.COLUMN_TANGGAL_PERIKSA}=januari").mkdir()
+        with self.assertRaises(DataLoadError):
+            list_partitions(str(self.root))
+
+
+class PartitionedQuarantineTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(clear_cache)
+        self.root = Path(directory.name) / "data_pasien"
+        source = Path(directory.name) / "data_pasien.csv"
+        source.write_text(HEADER + "".join(ROWS))
+        self.files = write_partitioned_dataset(
+            pd.read_csv(source, dtype=str), str(self.root)
+        )
+        with open(self.files[0], "a") as file:
+            file.write(INVALID)
+    
+    def test_quarantine_file_is_not_a_partition_file(self) -> None:
+        df = load_data_patients(str(self.root))
+        self.assertEqual(len(df), len(ROWS))
+        self.assertTrue(get_quarantine_path(str(self.files[0])).exists())
+        
+        partition_files = [
+            file
+            for partition in list_partitions(str(self.root))
+            for file in partition.files
+        ]
+        self.assertEqual(partition_files, self.files)
+    
+    def test_load_twice_after_quarantine(self) -> None:
+        first = load_data_patients(str(self.root))
+        misses = get_cache_stats()["misses"]
+        
+        # The quarantine file written by the first load is not a change
+        self.assertIs(load_data_patients(str(self.root)), first)
+        self.assertEqual(get_cache_stats()["misses"], misses)
+        
+        clear_cache()
+        pd.testing.assert_frame_equal(load_data_patients(str(self.root)), first)
+
+
+
+class CsvTailTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "data_pasien.csv"
+        self.path.write_text(HEADER + "".join(ROWS))
+    
+    def test_reads_rows_after_offset(self) -> None:
+        offset = len(HEADER) + len(ROWS[0])
+        rows, end = read_csv_tail(str(self.path), offset)
+        self.assertEqual(rows[cfg.COLUMN_ID_PASIEN].tolist(), ["P002", "P001", "P003"])
+        self.assertEqual(end, self.path.stat().st_size)
+    
+    def test_offset_before_header_end_is_rejected(self) -> None:
+        for offset in (0, -1):
+            with self.assertRaises(ValueError):
+                read_csv_tail(str(self.path), offset)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests for risk categorization and memoized analysis results.
+"""
+
+import gc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+from health_analyzer import (
+    add_risk_categories,
+    calculate_final_risk_category,
+    categorize_gula_darah,
+    categorize_kolesterol,
+    categorize_tekanan_darah,
+    categorize_values,
+    clear_analysis_cache,
+    compute_risk_codes,
+    compute_risk_pipeline,
+    get_analysis_cache_stats,
+    get_period_averages,
+)
+
+SCALAR_CATEGORIZE = {
+    cfg.COLUMN_TEKANAN_DARAH: categorize_tekanan_darah,
+    cfg.COLUMN_GULA_DARAH: categorize_gula_darah,
+    cfg.COLUMN_KOLESTEROL: categorize_kolesterol,
+}
+
+
+def boundary_values(column: str) -> list:
+    """Values on and around both thresholds of an indicator."""
+    normal_max, risiko_tinggi_max = cfg.INDICATOR_THRESHOLDS[column]
+    return [
+        0, normal_max - 1, normal_max - 0.5, normal_max, normal_max + 1,
+        risiko_tinggi_max - 1, risiko_tinggi_max, risiko_tinggi_max + 0.5,
+        risiko_tinggi_max + 1, 999,
+    ]
+
+
+class VectorizedCategorizationTest(unittest.TestCase):
+
+    def test_categorize_values_matches_scalar_functions(self) -> None:
+        for column, categorize in SCALAR_CATEGORIZE.items():
+            values = boundary_values(column) + [np.nan]
+            codes = categorize_values(pd.Series(values), *cfg.INDICATOR_THRESHOLDS[column])
+            self.assertEqual(
+                [cfg.RISK_LEVELS[code] for code in codes],
+                [categorize(value) for value in values],
+                column,
+            )
+    
+    def test_nullable_missing_value_is_normal(self) -> None:
+        values = pd.Series([None, 150], dtype="Int16")
+        codes = categorize_values(values, *cfg.INDICATOR_THRESHOLDS[cfg.COLUMN_TEKANAN_DARAH])
+        self.assertEqual(codes.tolist(), [cfg.RISK_CODE_NORMAL, cfg.RISK_CODE_RISIKO_TINGGI])
+    
+    def test_add_risk_categories_matches_scalar_functions(self) -> None:
+        # Every combination of the boundary values of the three indicators
+        grid = pd.MultiIndex.from_product(
+            [boundary_values(column) for column in cfg.HEALTH_COLUMNS],
+            names=cfg.HEALTH_COLUMNS,
+        ).to_frame(index=False)
+        
+        result = add_risk_categories(grid)
+        for column, categorize in SCALAR_CATEGORIZE.items():
+            category_column = cfg.INDICATOR_CATEGORY_COLUMNS[column]
+            self.assertEqual(
+                result[category_column].astype(str).tolist(),
+                grid[column].map(categorize).tolist(),
+                category_column,
+            )
+        self.assertNotIn(cfg.CAT_TEKANAN, grid)
+    
+    def test_compute_risk_codes_bins_columns_independently(self) -> None:
+        df = pd.DataFrame({
+            cfg.COLUMN_TEKANAN_DARAH: [120, 119, 141],
+            cfg.COLUMN_GULA_DARAH: [99, 125, 126],
+            cfg.COLUMN_KOLESTEROL: [241, 200, 199],
+        })
+        np.testing.assert_array_equal(
+            compute_risk_codes(df),
+            [[1, 0, 2], [0, 1, 1], [2, 2, 0]],
+        )
+
+
+
+def boundary_grid() -> pd.DataFrame:
+    """Every combination of the integer boundary values of the three indicators."""
+    return pd.MultiIndex.from_product(
+        [
+            [value for value in boundary_values(column) if float(value).is_integer()]
+            for column in cfg.HEALTH_COLUMNS
+        ],
+        names=cfg.HEALTH_COLUMNS,
+    ).to_frame(index=False).astype("int16")
+
+
+class FinalRiskCategoryTest(unittest.TestCase):
+
+    def test_final_category_is_the_worst_indicator_category(self) -> None:
+        grid = boundary_grid()
+        worst = [
+            max(
+                (SCALAR_CATEGORIZE[column](row[column]) for column in cfg.HEALTH_COLUMNS),
+                key=cfg.RISK_LEVELS.index,
+            )
+            for _, row in grid.iterrows()
+        ]
+        
+        pipeline = compute_risk_pipeline(grid)
+        self.assertEqual(pipeline[cfg.CAT_AKHIR].astype(str).tolist(), worst)
+        two_step = calculate_final_risk_category(add_risk_categories(grid))
+        pd.testing.assert_frame_equal(pipeline, two_step)
+    
+    def test_high_risk_is_not_overwritten_by_watch_level(self) -> None:
+        # The baseline mask order turned this row into Perlu Waspada
+        df = pd.DataFrame({
+            cfg.CAT_TEKANAN: [cfg.RISK_RISIKO_TINGGI],
+            cfg.CAT_GULA: [cfg.RISK_PERLU_WASPADA],
+            cfg.CAT_KOLESTEROL: [cfg.RISK_NORMAL],
+        })
+        result = calculate_final_risk_category(df)
+        self.assertEqual(result[cfg.CAT_AKHIR].tolist(), [cfg.RISK_RISIKO_TINGGI])
+    
+    def test_columns_only_returns_the_category_columns(self) -> None:
+        grid = boundary_grid()
+        grid.index += 100
+        categories = compute_risk_pipeline(grid, columns_only=True)
+        self.assertEqual(
+            list(categories.columns),
+            [*cfg.INDICATOR_CATEGORY_COLUMNS.values(), cfg.CAT_AKHIR],
+        )
+        pd.testing.assert_index_equal(categories.index, grid.index)
+        pd.testing.assert_frame_equal(
+            categories, compute_risk_pipeline(grid)[categories.columns]
+        )
+
+
+
+class MemoizationTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        clear_analysis_cache()
+        self.addCleanup(clear_analysis_cache)
+        grid = boundary_grid()
+        self.df = grid.assign(**{
+            cfg.COLUMN_TANGGAL_PERIKSA: pd.date_range("2024-01-01", periods=len(grid)),
+        })
+    
+    def test_results_are_memoized_per_dataset_and_arguments(self) -> None:
+        hits = get_analysis_cache_stats()["hits"]
+        weekly = get_period_averages(self.df, "W")
+        self.assertIs(get_period_averages(self.df, freq="W"), weekly)
+        self.assertIsNot(get_period_averages(self.df, "M"), weekly)
+        self.assertIsNot(get_period_averages(self.df.copy(), "W"), weekly)
+        self.assertEqual(get_analysis_cache_stats()["hits"], hits + 1)
+    
+    def test_results_are_dropped_with_the_dataset(self) -> None:
+        get_period_averages(self.df, "W")
+        self.assertEqual(get_analysis_cache_stats()["datasets"], 1)
+        del self.df
+        gc.collect()
+        self.assertEqual(get_analysis_cache_stats()["datasets"], 0)
+    
+    def test_only_the_category_columns_are_memoized(self) -> None:
+        categories = compute_risk_pipeline(self.df, columns_only=True)
+        self.assertIs(compute_risk_pipeline(self.df, columns_only=True), categories)
+        # The copy of the whole frame is left to the caller
+        self.assertIsNot(compute_risk_pipeline(self.df), compute_risk_pipeline(self.df))
+        self.assertEqual(get_analysis_cache_stats()["results"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
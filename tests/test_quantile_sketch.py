@@ -0,0 +1,79 @@
+"""
+Tests for the rank error bound of the KLL quantile sketch.
+"""
+
+import unittest
+
+import numpy as np
+
+import config as cfg
+from quantile_sketch import KLLSketch, k_for_error
+
+PROBABILITIES = np.linspace(0.01, 0.99, 99)
+VALUES = 200_000
+SEEDS = range(5)
+
+
+def rank_errors(sketch: KLLSketch, values: np.ndarray) -> np.ndarray:
+    """Distance of every returned quantile's rank range from its probability."""
+    ordered = np.sort(values)
+    estimates = sketch.quantiles(PROBABILITIES)
+    low = np.searchsorted(ordered, estimates, side="left") / len(values)
+    high = np.searchsorted(ordered, estimates, side="right") / len(values)
+    return np.maximum(low - PROBABILITIES, PROBABILITIES - high).clip(min=0)
+
+
+class KLLErrorBoundTest(unittest.TestCase):
+
+    def assert_within_bound(self, errors: np.ndarray, bound: float) -> None:
+        # The bound holds per query with 99% confidence
+        self.assertLessEqual((errors > bound).mean(), 0.01)
+        self.assertLessEqual(errors.max(), 1.5 * bound)
+    
+    def test_error_bound_meets_epsilon(self) -> None:
+        for epsilon in (0.05, cfg.QUANTILE_SKETCH_EPSILON, 0.002):
+            sketch = KLLSketch(epsilon)
+            sketch.update(np.arange(100 * k_for_error(epsilon)))
+            self.assertLessEqual(sketch.error_bound, epsilon)
+    
+    def test_small_input_is_exact(self) -> None:
+        values = np.random.default_rng(0).normal(size=100)
+        sketch = KLLSketch()
+        sketch.update(values)
+        self.assertTrue(sketch.is_exact)
+        self.assertEqual(sketch.error_bound, 0)
+        np.testing.assert_array_equal(
+            sketch.quantiles(PROBABILITIES), np.quantile(values, PROBABILITIES)
+        )
+    
+    def test_streamed_quantiles_are_within_the_bound(self) -> None:
+        errors = []
+        for seed in SEEDS:
+            values = np.random.default_rng(seed).normal(size=VALUES)
+            sketch = KLLSketch(seed=seed)
+            for chunk in np.array_split(values, 37):
+                sketch.update(chunk)
+            self.assertFalse(sketch.is_exact)
+            self.assertLess(sketch.retained, 3 * sketch.k)
+            errors.append(rank_errors(sketch, values))
+        self.assert_within_bound(np.concatenate(errors), sketch.error_bound)
+    
+    def test_merged_quantiles_are_within_the_bound(self) -> None:
+        errors = []
+        for seed in SEEDS:
+            values = np.random.default_rng(seed).exponential(size=VALUES)
+            shards = np.array_split(values, 8)
+            merged = KLLSketch(seed=seed)
+            for i, shard in enumerate(shards):
+                sketch = KLLSketch(seed=seed * len(shards) + i + 1)
+                sketch.update(shard)
+                merged.merge(sketch)
+            self.assertEqual(merged.count, VALUES)
+            self.assertEqual((merged.minimum, merged.maximum), (values.min(), values.max()))
+            self.assertLess(merged.retained, 3 * merged.k)
+            errors.append(rank_errors(merged, values))
+        self.assert_within_bound(np.concatenate(errors), merged.error_bound)
+
+
+if __name__ == "__main__":
+    unittest.main()
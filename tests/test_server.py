@@ -0,0 +1,33 @@
+"""
+Tests for shutting down the HTTP analysis service.
+"""
+
+import http.client
+import threading
+import unittest
+
+from server import serve_in_background
+
+
+class ShutdownTest(unittest.TestCase):
+
+    def test_idle_keep_alive_client_does_not_block_shutdown(self) -> None:
+        connected = threading.Event()
+        
+        def run() -> None:
+            with serve_in_background(warm=False) as (_, host, port):
+                connection = http.client.HTTPConnection(host, port)
+                self.addCleanup(connection.close)
+                connection.request("GET", "/health")
+                connection.getresponse().read()
+                connected.set()
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+        self.assertTrue(connected.is_set())
+        self.assertFalse(thread.is_alive(), "shutdown waited for the idle connection")
+
+
+if __name__ == "__main__":
+    unittest.main()
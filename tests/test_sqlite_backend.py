@@ -0,0 +1,111 @@
+"""
+Tests for answering the analyses from the SQLite storage backend.
+"""
+
+import tempfile
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+
+import config as cfg
+from data_loader import (
+    clear_cache,
+    get_patient_index,
+    load_data_patients,
+    load_data_with_date_filter,
+)
+from health_analyzer import (
+    calculate_statistics,
+    compute_risk_pipeline,
+    get_all_statistics,
+    get_indicator_counts,
+    get_patient_summary,
+    get_period_averages,
+    get_risk_distribution,
+    get_top_risk_patients,
+)
+from sqlite_backend import SQLiteStore, import_csv
+from synthetic_data import write_patient_csv
+
+SYNTHETIC_ROWS = 3000
+# Blood pressure outside VALID_RANGES
+INVALID = "P999,Dewi,29,P,2024-01-20,999,90,170\n"
+
+
+class SQLiteEquivalenceTest(unittest.TestCase):
+    """The SQL results equal the in-memory analysis of the imported CSV."""
+    
+    @classmethod
+    def setUpClass(cls) -> None:
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.addClassCleanup(clear_cache)
+        cls.csv_path = write_patient_csv(
+            Path(directory.name) / "data_pasien.csv", SYNTHETIC_ROWS, seed=2
+        )
+        # A repeated exam and an invalid row, quarantined by both paths
+        with open(cls.csv_path) as file:
+            first_row = file.readlines()[1]
+        with open(cls.csv_path, "a") as file:
+            file.write(first_row + INVALID)
+        
+        cls.db_path = import_csv(
+            str(cls.csv_path), str(Path(directory.name) / "data_pasien.db"), chunksize=500
+        )
+        cls.store = SQLiteStore(cls.db_path)
+        cls.df = load_data_patients(str(cls.csv_path))
+    
+    def test_rows(self) -> None:
+        self.assertEqual(len(self.df), SYNTHETIC_ROWS)
+        pd.testing.assert_frame_equal(self.store.load(), self.df)
+        pd.testing.assert_frame_equal(load_data_patients(str(self.db_path)), self.df)
+    
+    def test_date_range_and_history(self) -> None:
+        pd.testing.assert_frame_equal(
+            load_data_with_date_filter("2024-03-01", "2024-03-31", str(self.db_path))
+            .reset_index(drop=True),
+            load_data_with_date_filter("2024-03-01", "2024-03-31", str(self.csv_path))
+            .reset_index(drop=True),
+        )
+        patient_id = self.df[cfg.COLUMN_ID_PASIEN].iloc[0]
+        # Categorical columns only hold the categories of the rows read
+        pd.testing.assert_frame_equal(
+            self.store.history(patient_id),
+            get_patient_index(str(self.csv_path)).history(patient_id),
+            check_categorical=False,
+        )
+    
+    def test_summary_and_statistics(self) -> None:
+        self.assertEqual(self.store.patient_summary(), get_patient_summary(self.df))
+        stored = asdict(self.store.statistics())
+        for name, value in asdict(calculate_statistics(self.df)).items():
+            self.assertAlmostEqual(stored[name], value, places=9, msg=name)
+        pd.testing.assert_frame_equal(self.store.describe(), get_all_statistics(self.df))
+    
+    def test_category_counts(self) -> None:
+        categories = compute_risk_pipeline(self.df, columns_only=True)
+        pd.testing.assert_series_equal(
+            self.store.risk_distribution(), get_risk_distribution(categories)
+        )
+        for column in cfg.INDICATOR_CATEGORY_COLUMNS.values():
+            pd.testing.assert_series_equal(
+                self.store.indicator_counts(column), get_indicator_counts(categories, column)
+            )
+    
+    def test_period_averages(self) -> None:
+        for freq in cfg.TREND_FREQUENCIES:
+            pd.testing.assert_frame_equal(
+                self.store.period_averages(freq), get_period_averages(self.df, freq)
+            )
+    
+    def test_top_risk_patients(self) -> None:
+        for by in [*cfg.HEALTH_COLUMNS, cfg.COLUMN_SKOR_RISIKO]:
+            pd.testing.assert_frame_equal(
+                self.store.top_risk_patients(by=by), get_top_risk_patients(self.df, by=by)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
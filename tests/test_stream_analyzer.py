@@ -0,0 +1,118 @@
+"""
+Tests for the chunked streaming analysis and for following an appended
+CSV file with IncrementalAnalysis.
+"""
+
+import tempfile
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+
+import config as cfg
+from data_loader import clear_cache, get_quarantine_path, load_data_patients
+from health_analyzer import (
+    calculate_statistics,
+    compute_risk_pipeline,
+    get_all_statistics,
+    get_indicator_counts,
+    get_patient_summary,
+    get_period_averages,
+    get_risk_distribution,
+    get_top_risk_patients,
+)
+from stream_analyzer import IncrementalAnalysis, analyze_csv_stream
+from synthetic_data import write_patient_csv
+
+HEADER = "id_pasien,nama,umur,jenis_kelamin,tanggal_periksa,tekanan_darah,gula_darah,kolesterol\n"
+ROWS = [
+    "P001,Rangga,35,L,2024-01-05,120,95,180\n",
+    "P002,Fadli,42,P,2024-01-05,130,110,200\n",
+    "P001,Rangga,35,L,2024-01-12,145,130,250\n",
+]
+# Repeats the (P002, 2024-01-05) exam read before the tail boundary
+DUPLICATE = "P002,Fadli,42,P,2024-01-05,180,200,300\n"
+NEW = "P003,Siti,50,P,2024-01-12,118,90,170\n"
+# Rows of the synthetic dataset, and a chunk size that does not divide them
+SYNTHETIC_ROWS = 3000
+CHUNKSIZE = 397
+
+
+class StreamingEquivalenceTest(unittest.TestCase):
+    """The streamed results equal the in-memory analysis of the same file."""
+    
+    @classmethod
+    def setUpClass(cls) -> None:
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.addClassCleanup(clear_cache)
+        path = write_patient_csv(Path(directory.name) / "data_pasien.csv", SYNTHETIC_ROWS, seed=1)
+        cls.df = load_data_patients(str(path))
+        cls.analysis = analyze_csv_stream(str(path), CHUNKSIZE)
+    
+    def test_summary_and_statistics(self) -> None:
+        self.assertEqual(self.analysis.patient_summary(), get_patient_summary(self.df))
+        streamed = asdict(self.analysis.statistics())
+        for name, value in asdict(calculate_statistics(self.df)).items():
+            self.assertAlmostEqual(streamed[name], value, places=9, msg=name)
+        
+        moments = ["count", "mean", "std", "min", "max"]
+        pd.testing.assert_frame_equal(
+            self.analysis.describe().loc[moments], get_all_statistics(self.df).loc[moments]
+        )
+    
+    def test_category_counts(self) -> None:
+        categories = compute_risk_pipeline(self.df, columns_only=True)
+        pd.testing.assert_series_equal(
+            self.analysis.risk_distribution(), get_risk_distribution(categories)
+        )
+        for column in cfg.INDICATOR_CATEGORY_COLUMNS.values():
+            pd.testing.assert_series_equal(
+                self.analysis.indicator_counts(column), get_indicator_counts(categories, column)
+            )
+    
+    def test_period_averages(self) -> None:
+        for freq in cfg.TREND_FREQUENCIES:
+            pd.testing.assert_frame_equal(
+                self.analysis.period_averages(freq), get_period_averages(self.df, freq)
+            )
+    
+    def test_top_risk_patients(self) -> None:
+        for by in [*cfg.HEALTH_COLUMNS, cfg.COLUMN_SKOR_RISIKO]:
+            pd.testing.assert_frame_equal(
+                self.analysis.top_risk_patients(by=by), get_top_risk_patients(self.df, by=by)
+            )
+
+
+class IncrementalTailTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "data_pasien.csv"
+        self.path.write_text(HEADER + "".join(ROWS))
+    
+    def test_duplicate_across_tail_boundary_is_quarantined(self) -> None:
+        analysis = IncrementalAnalysis()
+        self.assertEqual(analysis.append_csv_tail(str(self.path)), len(ROWS))
+        
+        with open(self.path, "a") as file:
+            file.write(DUPLICATE + NEW)
+        self.assertEqual(analysis.append_csv_tail(str(self.path)), 1)
+        
+        quarantine = pd.read_csv(get_quarantine_path(str(self.path)))
+        self.assertEqual(quarantine[cfg.COLUMN_ID_PASIEN].tolist(), ["P002"])
+        self.assertEqual(
+            quarantine[cfg.COLUMN_ALASAN].tolist(),
+            [f"{cfg.COLUMN_ID_PASIEN}+{cfg.COLUMN_TANGGAL_PERIKSA}:{cfg.REASON_DUPLIKAT}"],
+        )
+        
+        full = analyze_csv_stream(str(self.path), check_duplicates=True)
+        self.assertEqual(analysis.total_examinations, full.total_examinations)
+        pd.testing.assert_series_equal(analysis.risk_distribution(), full.risk_distribution())
+        pd.testing.assert_frame_equal(analysis.daily_averages(), full.daily_averages())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,274 @@
+"""
+Time-series engine for health indicator trends.
+Keeps per-day sufficient statistics (exam counts, sums and sums of
+squares of each indicator, and final risk category counts) on a gap-free
+daily calendar, and derives daily/weekly/monthly resamples and rolling
+means, standard deviations and risk-category shares from them with
+vectorized NumPy operations.
+
+The statistics are additive: engines built on different chunks can be
+merged, and new exams only recompute the days they fall on plus the
+trailing rolling windows that contain those days.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+import config as cfg
+from health_analyzer import compute_risk_codes, memoize_by_dataset
+from instrumentation import instrument
+
+_K = len(cfg.HEALTH_COLUMNS)
+_L = len(cfg.RISK_LEVELS)
+
+# Column layout of the daily statistics matrix
+_COUNT = slice(0, _K)
+_SUM = slice(_K, 2 * _K)
+_SUMSQ = slice(2 * _K, 3 * _K)
+_RISK = slice(3 * _K, 3 * _K + _L)
+_EXAMS = 3 * _K + _L
+_WIDTH = _EXAMS + 1
+
+
+def _aggregate_days(df: pd.DataFrame) -> Tuple[Optional[np.datetime64], np.ndarray]:
+    """
+    Reduce exam rows to daily statistics.
+    
+    Args:
+        df: Patient DataFrame.
+        
+    Returns:
+        Tuple of the first exam day and the statistics of every calendar
+        day from it to the last exam day; (None, empty) without dated rows.
+    """
+    dates = df[cfg.COLUMN_TANGGAL_PERIKSA].to_numpy(dtype="datetime64[ns]")
+    dated = ~np.isnat(dates)
+    days = dates[dated].astype("datetime64[D]")
+    if not len(days):
+        return None, np.zeros((0, _WIDTH))
+    
+    first = days.min()
+    positions = (days - first).astype(np.int64)
+    n_days = int(positions.max()) + 1
+    values = df[cfg.HEALTH_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)[dated]
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    final_codes = np.maximum(
+        compute_risk_codes(df)[dated].max(axis=1), cfg.RISK_CODE_NORMAL
+    ).astype(np.int64)
+    
+    stats = np.zeros((n_days, _WIDTH))
+    for i in range(_K):
+        stats[:, _COUNT.start + i] = np.bincount(positions, present[:, i], n_days)
+        stats[:, _SUM.start + i] = np.bincount(positions, filled[:, i], n_days)
+        stats[:, _SUMSQ.start + i] = np.bincount(positions, filled[:, i] ** 2, n_days)
+    stats[:, _RISK] = np.bincount(
+        positions * _L + final_codes, minlength=n_days * _L
+    ).reshape(n_days, _L)
+    stats[:, _EXAMS] = np.bincount(positions, minlength=n_days)
+    return first, stats
+
+
+def _trend_table(stats: np.ndarray, index: pd.Index) -> pd.DataFrame:
+    """
+    Turn summed statistics into a trend table.
+    
+    Columns are the indicator means (so the table can be passed to the
+    trend plots as is), their sample standard deviations, the share of
+    exams per final risk category and the number of exams. Rows without
+    exams have NaN means and shares.
+    """
+    counts, sums, sumsq = stats[:, _COUNT], stats[:, _SUM], stats[:, _SUMSQ]
+    exams = stats[:, _EXAMS]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+        variances = (sumsq - sums * means) / (counts - 1)
+        shares = stats[:, _RISK] / exams[:, None]
+    stds = np.where(counts >= 2, np.sqrt(np.maximum(variances, 0.0)), np.nan)
+    
+    columns: Dict[str, np.ndarray] = {}
+    for i, column in enumerate(cfg.HEALTH_COLUMNS):
+        columns[column] = means[:, i]
+    for i, column in enumerate(cfg.HEALTH_COLUMNS):
+        columns[column + cfg.TREND_STD_SUFFIX] = stds[:, i]
+    for i, level in enumerate(cfg.RISK_LEVELS):
+        columns[level] = shares[:, i]
+    columns[cfg.COLUMN_JUMLAH_PEMERIKSAAN] = exams.astype(np.int64)
+    return pd.DataFrame(columns, index=index)
+
+
+class TrendEngine:
+    """
+    Mergeable, incrementally updated daily trend statistics.
+    
+    ``resample`` and ``rolling`` return trend tables (see
+    ``_trend_table``) on a calendar without gaps. Rolling windows are
+    computed from running totals, so a window of any length costs one
+    subtraction per day, and after ``update`` only the days from the
+    first changed day onward are recomputed.
+    """
+    
+    def __init__(self) -> None:
+        self.start: Optional[np.datetime64] = None
+        self._daily = np.zeros((0, _WIDTH))
+        # Running totals: row i holds the sum of the first i days
+        self._cumulative = np.zeros((1, _WIDTH))
+        self._rolling: Dict[int, np.ndarray] = {}
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TrendEngine":
+        """
+        Build an engine from patient data.
+        
+        Args:
+            df: Patient DataFrame.
+            
+        Returns:
+            TrendEngine: Engine holding every dated exam of ``df``.
+        """
+        engine = cls()
+        engine.update(df)
+        return engine
+    
+    def __len__(self) -> int:
+        """Number of calendar days covered."""
+        return len(self._daily)
+    
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """Calendar days covered, without gaps."""
+        if self.start is None:
+            return pd.DatetimeIndex([], name=cfg.COLUMN_TANGGAL_PERIKSA)
+        return pd.date_range(
+            self.start, periods=len(self._daily), freq="D", name=cfg.COLUMN_TANGGAL_PERIKSA
+        )
+    
+    @instrument
+    def update(self, df: pd.DataFrame) -> Optional[pd.Timestamp]:
+        """
+        Add exam rows, e.g. a chunk or the exams of newly arrived days.
+        
+        Args:
+            df: Patient DataFrame.
+            
+        Returns:
+            Optional[pd.Timestamp]: First day whose trends changed, or
+            None if ``df`` has no dated rows.
+        """
+        first, stats = _aggregate_days(df)
+        if first is None:
+            return None
+        return self._add(first, stats)
+    
+    def merge(self, other: "TrendEngine") -> None:
+        """
+        Merge another engine (e.g. from another chunk or worker) into this one.
+        
+        Args:
+            other: Engine to merge.
+        """
+        if other.start is not None:
+            self._add(other.start, other._daily)
+    
+    def _add(self, first: np.datetime64, stats: np.ndarray) -> pd.Timestamp:
+        """Add the statistics of consecutive days starting at ``first``."""
+        if self.start is None or first < self.start:
+            # New days before the calendar start shift every row
+            shift = 0 if self.start is None else int((self.start - first).astype(np.int64))
+            self._daily = np.vstack([np.zeros((shift, _WIDTH)), self._daily])
+            self.start = first
+            self._rolling.clear()
+        
+        offset = int((first - self.start).astype(np.int64))
+        missing = offset + len(stats) - len(self._daily)
+        if missing > 0:
+            self._daily = np.vstack([self._daily, np.zeros((missing, _WIDTH))])
+        self._daily[offset:offset + len(stats)] += stats
+        
+        # Recompute from the first changed day, or from the old calendar end
+        # when the new days start after a gap
+        changed = min(offset, len(self._cumulative) - 1)
+        cumulative = np.empty((len(self._daily) + 1, _WIDTH))
+        cumulative[:changed + 1] = self._cumulative[:changed + 1]
+        cumulative[changed + 1:] = cumulative[changed] + np.cumsum(self._daily[changed:], axis=0)
+        self._cumulative = cumulative
+        
+        for window, rolled in self._rolling.items():
+            self._rolling[window] = np.vstack([rolled[:changed], self._window_sums(window, changed)])
+        return pd.Timestamp(first)
+    
+    def _window_sums(self, window: int, start_row: int) -> np.ndarray:
+        """Statistics summed over the ``window`` days ending at each day from ``start_row``."""
+        ends = np.arange(start_row, len(self._daily)) + 1
+        return self._cumulative[ends] - self._cumulative[np.maximum(ends - window, 0)]
+    
+    def resample(self, freq: str = "D") -> pd.DataFrame:
+        """
+        Trend table per day, week (Monday-Sunday) or month.
+        
+        Args:
+            freq: A key of ``cfg.TREND_FREQUENCIES``.
+            
+        Returns:
+            pd.DataFrame: One row per period from the first to the last
+            exam, indexed by the first day of the period.
+            
+        Raises:
+            ValueError: If ``freq`` is not supported.
+        """
+        if freq not in cfg.TREND_FREQUENCIES:
+            raise ValueError(
+                f"Unsupported frequency {freq!r}, "
+                f"expected one of {list(cfg.TREND_FREQUENCIES)}"
+            )
+        dates = self.dates
+        if freq == "D" or not len(dates):
+            return _trend_table(self._daily, dates)
+        
+        periods = dates.to_period(freq).start_time
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        return _trend_table(
+            np.add.reduceat(self._daily, starts),
+            periods[starts].rename(cfg.COLUMN_TANGGAL_PERIKSA),
+        )
+    
+    def rolling(self, window: int) -> pd.DataFrame:
+        """
+        Trend table over a trailing window ending on each day.
+        
+        Means and standard deviations are over all exams in the window,
+        not over daily averages.
+        
+        Args:
+            window: Window length in calendar days.
+            
+        Returns:
+            pd.DataFrame: One row per calendar day.
+            
+        Raises:
+            ValueError: If ``window`` is not positive.
+        """
+        if window < 1:
+            raise ValueError(f"Rolling window must be at least 1 day, got {window}")
+        if window not in self._rolling:
+            self._rolling[window] = self._window_sums(window, 0)
+        return _trend_table(self._rolling[window], self.dates)
+
+
+@instrument
+@memoize_by_dataset
+def get_trend_engine(df: pd.DataFrame) -> TrendEngine:
+    """
+    Get the trend engine of a dataset, built once per DataFrame.
+    
+    The engine is shared between callers; build one with
+    ``TrendEngine.from_frame`` to ``update`` it with new exams.
+    
+    Args:
+        df: Patient DataFrame.
+        
+    Returns:
+        TrendEngine: Engine holding every dated exam of ``df``.
+    """
+    return TrendEngine.from_frame(df)
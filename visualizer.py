@@ -1,186 +1,289 @@
 """
 Visualization module for patient data analysis.
 Provides functions to create various charts and graphs.
+
+Charts are drawn with the object-oriented Matplotlib API onto a given
+Figure. Trend lines longer than the axes are wide in pixels are
+downsampled first (LTTB or min/max bucketing), which keeps peaks
+visible and the drawing time independent of the history length.
+``plot_*`` functions show the charts interactively through pyplot,
+while ``render_chart``/``render_charts`` draw them off-screen on the Agg
+canvas without touching global pyplot state, optionally fanned out
+across worker processes.
 """
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
 import config as cfg
+from instrumentation import instrument
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Pick points with Largest-Triangle-Three-Buckets downsampling.
+    
+    The first and last points are kept; every bucket in between
+    contributes the point forming the largest triangle with the point
+    chosen in the previous bucket and the mean of the next bucket, which
+    preserves the visual shape of the line including its peaks.
+    
+    Args:
+        x: Ascending x values.
+        y: Y values (no NaN).
+        n_out: Number of points to keep.
+        
+    Returns:
+        np.ndarray: Ascending positions of the kept points.
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)])
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[stop:edges[i + 2]].mean()
+            next_y = y[stop:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
 
-def setup_plot(
-    title: str, 
-    xlabel: str, 
-    ylabel: str,
-    figsize: tuple = cfg.DEFAULT_FIGURE_SIZE
-) -> plt.Figure:
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
     """
-    Create a configured plot with standard settings.
+    Pick the minimum and maximum of equal-size buckets.
     
     Args:
-        title: Plot title.
-        xlabel: X-axis label.
-        ylabel: Y-axis label.
-        figsize: Figure size tuple.
+        y: Y values (no NaN).
+        n_out: Maximum number of points to keep (two per bucket).
         
     Returns:
-        plt.Figure: Configured matplotlib figure.
+        np.ndarray: Ascending positions of the kept points.
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    ax.set_title(title, fontsize=16, fontweight='bold')
-    ax.set_xlabel(xlabel, fontsize=12)
-    ax.set_ylabel(ylabel, fontsize=12)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, max(n_out // 2, 1) + 1).astype(np.int64)
+    picks = [
+        (start + int(np.argmin(y[start:stop])), start + int(np.argmax(y[start:stop])))
+        for start, stop in zip(edges[:-1], edges[1:])
+        if stop > start
+    ]
+    return np.unique(np.array(picks, dtype=np.int64).ravel())
+
+
+def downsample_series(
+    series: pd.Series,
+    n_out: int,
+    method: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> pd.Series:
+    """
+    Reduce a date-indexed series to at most ``n_out`` points.
+    
+    Args:
+        series: Values indexed by ascending dates; NaN values are dropped.
+        n_out: Maximum number of points to keep.
+        method: "lttb", "minmax", or None to keep every point.
+        
+    Returns:
+        pd.Series: The kept points.
+        
+    Raises:
+        ValueError: If ``method`` is unknown.
+    """
+    series = series.dropna()
+    if method is None or len(series) <= n_out:
+        return series
+    if method == "lttb":
+        x = series.index.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        positions = lttb_indices(x, series.to_numpy(dtype=np.float64), n_out)
+    elif method == "minmax":
+        positions = minmax_indices(series.to_numpy(dtype=np.float64), n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method {method!r}")
+    return series.iloc[positions]
+
+
+def _draw_trend_axes(
+    ax: Axes,
+    daily_data: pd.DataFrame,
+    column: str,
+    marker: str,
+    color: str,
+    markersize: int = 8,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
+    """
+    Draw one indicator's averages as a line on ``ax``.
+    
+    Series with more points than the axes are wide in pixels are
+    downsampled and drawn without markers, which would only overlap.
+    """
+    max_points = max(int(ax.bbox.width), 3)
+    series = downsample_series(daily_data[column], max_points, downsample)
+    if len(series) < len(daily_data[column].dropna()):
+        marker = None
+    ax.plot(
+        series.index,
+        series.to_numpy(),
+        marker=marker,
+        linewidth=2,
+        markersize=markersize,
+        color=color
+    )
+    ax.tick_params(axis='x', labelrotation=45)
     ax.grid(True, alpha=0.3)
-    return fig
 
 
-def plot_blood_pressure_trend(daily_data: pd.DataFrame) -> None:
+def draw_blood_pressure_trend(
+    fig: Figure,
+    daily_data: pd.DataFrame,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
     """
-    Create a line chart for blood pressure trends.
+    Draw a line chart for blood pressure trends.
     
     Args:
-        daily_data: DataFrame with daily averages.
-    """
-    plt.figure(figsize=cfg.DEFAULT_FIGURE_SIZE)
-    plt.plot(
-        daily_data.index, 
-        daily_data[cfg.COLUMN_TEKANAN_DARAH],
-        marker='o', 
-        linewidth=2, 
-        markersize=8, 
-        color=cfg.COLOR_TEKANAN
+        fig: Figure to draw on.
+        daily_data: DataFrame with daily (or weekly/monthly) averages.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    ax = fig.subplots()
+    _draw_trend_axes(
+        ax, daily_data, cfg.COLUMN_TEKANAN_DARAH, 'o', cfg.COLOR_TEKANAN,
+        downsample=downsample
     )
-    plt.title('Grafik Tren Tekanan Darah', fontsize=16, fontweight='bold')
-    plt.xlabel('Tanggal Pemeriksaan', fontsize=12)
-    plt.ylabel('Rata-rata Tekanan Darah (mmHg)', fontsize=12)
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
-    print("\nGrafik Tren Tekanan Darah telah ditampilkan!")
+    ax.set_title('Grafik Tren Tekanan Darah', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Tanggal Pemeriksaan', fontsize=12)
+    ax.set_ylabel('Rata-rata Tekanan Darah (mmHg)', fontsize=12)
 
 
-def plot_blood_sugar_trend(daily_data: pd.DataFrame) -> None:
+def draw_blood_sugar_trend(
+    fig: Figure,
+    daily_data: pd.DataFrame,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
     """
-    Create a line chart for blood sugar trends.
+    Draw a line chart for blood sugar trends.
     
     Args:
-        daily_data: DataFrame with daily averages.
-    """
-    plt.figure(figsize=cfg.DEFAULT_FIGURE_SIZE)
-    plt.plot(
-        daily_data.index, 
-        daily_data[cfg.COLUMN_GULA_DARAH],
-        marker='s', 
-        linewidth=2, 
-        markersize=8, 
-        color=cfg.COLOR_GULA
+        fig: Figure to draw on.
+        daily_data: DataFrame with daily (or weekly/monthly) averages.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    ax = fig.subplots()
+    _draw_trend_axes(
+        ax, daily_data, cfg.COLUMN_GULA_DARAH, 's', cfg.COLOR_GULA,
+        downsample=downsample
     )
-    plt.title('Grafik Tren Gula Darah', fontsize=16, fontweight='bold')
-    plt.xlabel('Tanggal Pemeriksaan', fontsize=12)
-    plt.ylabel('Rata-rata Gula Darah (mg/dL)', fontsize=12)
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
-    print("\nGrafik Tren Gula Darah telah ditampilkan!")
+    ax.set_title('Grafik Tren Gula Darah', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Tanggal Pemeriksaan', fontsize=12)
+    ax.set_ylabel('Rata-rata Gula Darah (mg/dL)', fontsize=12)
 
 
-def plot_cholesterol_trend(daily_data: pd.DataFrame) -> None:
+def draw_cholesterol_trend(
+    fig: Figure,
+    daily_data: pd.DataFrame,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
     """
-    Create a line chart for cholesterol trends.
+    Draw a line chart for cholesterol trends.
     
     Args:
-        daily_data: DataFrame with daily averages.
-    """
-    plt.figure(figsize=cfg.DEFAULT_FIGURE_SIZE)
-    plt.plot(
-        daily_data.index, 
-        daily_data[cfg.COLUMN_KOLESTEROL],
-        marker='^', 
-        linewidth=2, 
-        markersize=8, 
-        color=cfg.COLOR_KOLESTEROL
+        fig: Figure to draw on.
+        daily_data: DataFrame with daily (or weekly/monthly) averages.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    ax = fig.subplots()
+    _draw_trend_axes(
+        ax, daily_data, cfg.COLUMN_KOLESTEROL, '^', cfg.COLOR_KOLESTEROL,
+        downsample=downsample
     )
-    plt.title('Grafik Tren Kolesterol', fontsize=16, fontweight='bold')
-    plt.xlabel('Tanggal Pemeriksaan', fontsize=12)
-    plt.ylabel('Rata-rata Kolesterol (mg/dL)', fontsize=12)
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.show()
-    print("\nGrafik Tren Kolesterol telah ditampilkan!")
+    ax.set_title('Grafik Tren Kolesterol', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Tanggal Pemeriksaan', fontsize=12)
+    ax.set_ylabel('Rata-rata Kolesterol (mg/dL)', fontsize=12)
 
 
-def plot_comparison(daily_data: pd.DataFrame) -> None:
+def draw_comparison(
+    fig: Figure,
+    daily_data: pd.DataFrame,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
     """
-    Create a comparison plot with all three indicators.
+    Draw a comparison plot with all three indicators.
     
     Args:
-        daily_data: DataFrame with daily averages for all indicators.
+        fig: Figure to draw on.
+        daily_data: DataFrame with daily (or weekly/monthly) averages for
+            all indicators.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
     """
-    plt.figure(figsize=cfg.COMPARISON_FIGURE_SIZE)
+    ax_tekanan, ax_gula, ax_kolesterol = fig.subplots(3, 1)
     
     # Blood pressure subplot
-    plt.subplot(3, 1, 1)
-    plt.plot(
-        daily_data.index, 
-        daily_data[cfg.COLUMN_TEKANAN_DARAH],
-        marker='o', 
-        linewidth=2, 
-        markersize=6, 
-        color=cfg.COLOR_TEKANAN
+    _draw_trend_axes(
+        ax_tekanan, daily_data, cfg.COLUMN_TEKANAN_DARAH, 'o', cfg.COLOR_TEKANAN,
+        6, downsample
     )
-    plt.title('Grafik Tren Tekanan Darah', fontsize=14, fontweight='bold')
-    plt.ylabel('Tekanan Darah (mmHg)', fontsize=11)
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
+    ax_tekanan.set_title('Grafik Tren Tekanan Darah', fontsize=14, fontweight='bold')
+    ax_tekanan.set_ylabel('Tekanan Darah (mmHg)', fontsize=11)
     
     # Blood sugar subplot
-    plt.subplot(3, 1, 2)
-    plt.plot(
-        daily_data.index, 
-        daily_data[cfg.COLUMN_GULA_DARAH],
-        marker='s', 
-        linewidth=2, 
-        markersize=6, 
-        color=cfg.COLOR_GULA
+    _draw_trend_axes(
+        ax_gula, daily_data, cfg.COLUMN_GULA_DARAH, 's', cfg.COLOR_GULA,
+        6, downsample
     )
-    plt.title('Grafik Tren Gula Darah', fontsize=14, fontweight='bold')
-    plt.ylabel('Gula Darah (mg/dL)', fontsize=11)
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
+    ax_gula.set_title('Grafik Tren Gula Darah', fontsize=14, fontweight='bold')
+    ax_gula.set_ylabel('Gula Darah (mg/dL)', fontsize=11)
     
     # Cholesterol subplot
-    plt.subplot(3, 1, 3)
-    plt.plot(
-        daily_data.index, 
-        daily_data[cfg.COLUMN_KOLESTEROL],
-        marker='^', 
-        linewidth=2, 
-        markersize=6, 
-        color=cfg.COLOR_KOLESTEROL
+    _draw_trend_axes(
+        ax_kolesterol, daily_data, cfg.COLUMN_KOLESTEROL, '^', cfg.COLOR_KOLESTEROL,
+        6, downsample
     )
-    plt.title('Grafik Tren Kolesterol', fontsize=14, fontweight='bold')
-    plt.xlabel('Tanggal Pemeriksaan', fontsize=11)
-    plt.ylabel('Kolesterol (mg/dL)', fontsize=11)
-    plt.xticks(rotation=45)
-    plt.grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.show()
-    print("\nGrafik Perbandingan Semua Indikator telah ditampilkan!")
+    ax_kolesterol.set_title('Grafik Tren Kolesterol', fontsize=14, fontweight='bold')
+    ax_kolesterol.set_xlabel('Tanggal Pemeriksaan', fontsize=11)
+    ax_kolesterol.set_ylabel('Kolesterol (mg/dL)', fontsize=11)
 
 
-def plot_risk_categories(risk_counts: pd.Series) -> None:
+def draw_risk_categories(fig: Figure, risk_counts: pd.Series) -> None:
     """
-    Create a pie chart for risk category distribution.
+    Draw a pie chart for risk category distribution.
     
     Args:
+        fig: Figure to draw on.
         risk_counts: Series with risk category counts.
     """
-    plt.figure(figsize=(10, 8))
+    ax = fig.subplots()
     
-    colors = [cfg.RISK_NORMAL, cfg.RISK_PERLU_WASPADA, cfg.RISK_RISIKO_TINGGI]
     color_map = {
         cfg.RISK_NORMAL: 'green',
         cfg.RISK_PERLU_WASPADA: 'orange',
@@ -192,108 +295,366 @@ def plot_risk_categories(risk_counts: pd.Series) -> None:
     
     explode = [0.1 if cat == cfg.RISK_RISIKO_TINGGI else 0 for cat in risk_counts.index]
     
-    plt.pie(
-        risk_counts.values, 
-        labels=risk_counts.index, 
-        autopct='%1.1f%%', 
-        startangle=90, 
-        colors=actual_colors, 
-        explode=explode, 
-        shadow=True, 
+    ax.pie(
+        risk_counts.values,
+        labels=risk_counts.index,
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=actual_colors,
+        explode=explode,
+        shadow=True,
         textprops={'fontsize': 12}
     )
-    plt.title('Kategori Risiko Kesehatan Pasien', fontsize=16, fontweight='bold', pad=20)
-    plt.tight_layout()
-    plt.show()
-    print("\nKategori Risiko Kesehatan Pasien telah ditampilkan!")
+    ax.set_title('Kategori Risiko Kesehatan Pasien', fontsize=16, fontweight='bold', pad=20)
 
 
-def plot_average_indicators(
-    avg_tekanan: float, 
-    avg_gula: float, 
+def draw_average_indicators(
+    fig: Figure,
+    avg_tekanan: float,
+    avg_gula: float,
     avg_kolesterol: float
 ) -> None:
     """
-    Create a bar chart for average health indicators.
+    Draw a bar chart for average health indicators.
     
     Args:
+        fig: Figure to draw on.
         avg_tekanan: Average blood pressure.
         avg_gula: Average blood sugar.
         avg_kolesterol: Average cholesterol.
     """
-    plt.figure(figsize=(10, 6))
+    ax = fig.subplots()
     
     indikator = ['Tekanan Darah', 'Gula Darah', 'Kolesterol']
     nilai = [avg_tekanan, avg_gula, avg_kolesterol]
     warna = [cfg.COLOR_TEKANAN, cfg.COLOR_GULA, cfg.COLOR_KOLESTEROL]
     
-    bars = plt.bar(indikator, nilai, color=warna, alpha=0.7, edgecolor='black', linewidth=1.5)
+    bars = ax.bar(indikator, nilai, color=warna, alpha=0.7, edgecolor='black', linewidth=1.5)
     
     for bar in bars:
         height = bar.get_height()
-        plt.text(
-            bar.get_x() + bar.get_width() / 2., 
+        ax.text(
+            bar.get_x() + bar.get_width() / 2.,
             height,
             f'{height:.2f}',
-            ha='center', 
-            va='bottom', 
-            fontsize=12, 
+            ha='center',
+            va='bottom',
+            fontsize=12,
             fontweight='bold'
         )
     
-    plt.title('Rata-Rata Indikator Kesehatan Pasien', fontsize=16, fontweight='bold')
-    plt.ylabel('Nilai Rata-Rata', fontsize=12)
-    plt.xlabel('Indikator Kesehatan', fontsize=12)
-    plt.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
-    plt.show()
-    print("\nRata-Rata Indikator Kesehatan Pasien telah ditampilkan!")
+    ax.set_title('Rata-Rata Indikator Kesehatan Pasien', fontsize=16, fontweight='bold')
+    ax.set_ylabel('Nilai Rata-Rata', fontsize=12)
+    ax.set_xlabel('Indikator Kesehatan', fontsize=12)
+    ax.grid(axis='y', alpha=0.3)
 
 
-def plot_high_risk_patients(top_patients: pd.DataFrame) -> None:
+def draw_high_risk_patients(fig: Figure, top_patients: pd.DataFrame) -> None:
     """
-    Create a grouped bar chart for top high-risk patients.
+    Draw a grouped bar chart for top high-risk patients.
     
     Args:
+        fig: Figure to draw on.
         top_patients: DataFrame with top patients and their averages.
     """
-    plt.figure(figsize=cfg.DEFAULT_FIGURE_SIZE)
+    ax = fig.subplots()
     
     x = range(len(top_patients))
     width = cfg.BAR_WIDTH
     
-    plt.bar(
-        [i - width for i in x], 
-        top_patients[cfg.COLUMN_TEKANAN_DARAH], 
-        width=width, 
-        label='Tekanan Darah', 
-        color=cfg.COLOR_TEKANAN, 
+    ax.bar(
+        [i - width for i in x],
+        top_patients[cfg.COLUMN_TEKANAN_DARAH],
+        width=width,
+        label='Tekanan Darah',
+        color=cfg.COLOR_TEKANAN,
         alpha=0.7
     )
-    plt.bar(
-        x, 
-        top_patients[cfg.COLUMN_GULA_DARAH], 
-        width=width, 
-        label='Gula Darah', 
-        color=cfg.COLOR_GULA, 
+    ax.bar(
+        x,
+        top_patients[cfg.COLUMN_GULA_DARAH],
+        width=width,
+        label='Gula Darah',
+        color=cfg.COLOR_GULA,
         alpha=0.7
     )
-    plt.bar(
-        [i + width for i in x], 
-        top_patients[cfg.COLUMN_KOLESTEROL], 
-        width=width, 
-        label='Kolesterol', 
-        color=cfg.COLOR_KOLESTEROL, 
+    ax.bar(
+        [i + width for i in x],
+        top_patients[cfg.COLUMN_KOLESTEROL],
+        width=width,
+        label='Kolesterol',
+        color=cfg.COLOR_KOLESTEROL,
         alpha=0.7
     )
     
-    plt.xlabel('Nama Pasien', fontsize=12)
-    plt.ylabel('Nilai Indikator', fontsize=12)
-    plt.title('Pasien Risiko Tertinggi', fontsize=16, fontweight='bold')
-    plt.xticks(x, top_patients.index, rotation=45)
-    plt.legend()
-    plt.grid(axis='y', alpha=0.3)
-    plt.tight_layout()
+    ax.set_xlabel('Nama Pasien', fontsize=12)
+    ax.set_ylabel('Nilai Indikator', fontsize=12)
+    ax.set_title('Pasien Risiko Tertinggi', fontsize=16, fontweight='bold')
+    if cfg.COLUMN_NAMA in top_patients.columns:
+        labels = [
+            f"{nama}\n({patient_id})"
+            for patient_id, nama in top_patients[cfg.COLUMN_NAMA].items()
+        ]
+    else:
+        labels = list(top_patients.index)
+    ax.set_xticks(list(x), labels, rotation=45)
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """How to draw one chart type."""
+    title: str
+    draw: Callable[..., None]
+    figsize: Tuple[float, float]
+
+
+# Chart name -> spec; names are also used as default file stems
+CHARTS: Dict[str, ChartSpec] = {
+    "tren_tekanan_darah": ChartSpec(
+        "Grafik Tren Tekanan Darah", draw_blood_pressure_trend, cfg.DEFAULT_FIGURE_SIZE
+    ),
+    "tren_gula_darah": ChartSpec(
+        "Grafik Tren Gula Darah", draw_blood_sugar_trend, cfg.DEFAULT_FIGURE_SIZE
+    ),
+    "tren_kolesterol": ChartSpec(
+        "Grafik Tren Kolesterol", draw_cholesterol_trend, cfg.DEFAULT_FIGURE_SIZE
+    ),
+    "perbandingan_indikator": ChartSpec(
+        "Grafik Perbandingan Semua Indikator", draw_comparison, cfg.COMPARISON_FIGURE_SIZE
+    ),
+    "kategori_risiko": ChartSpec(
+        "Kategori Risiko Kesehatan Pasien", draw_risk_categories, (10, 8)
+    ),
+    "rata_rata_indikator": ChartSpec(
+        "Rata-Rata Indikator Kesehatan Pasien", draw_average_indicators, (10, 6)
+    ),
+    "pasien_risiko_tinggi": ChartSpec(
+        "Pasien Risiko Tertinggi", draw_high_risk_patients, cfg.DEFAULT_FIGURE_SIZE
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ChartJob:
+    """
+    One chart to render to a file: chart name, draw arguments, target
+    path and keyword options of the draw function (e.g. ``downsample``).
+    """
+    name: str
+    args: Tuple[Any, ...]
+    path: Path
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+
+@instrument
+def render_chart(
+    name: str,
+    *args: Any,
+    save_path: Optional[Path] = None,
+    dpi: int = cfg.CHART_DPI,
+    **options: Any
+) -> Figure:
+    """
+    Draw a chart off-screen on an Agg canvas.
+    
+    Args:
+        name: Chart name from ``CHARTS``.
+        *args: Data arguments of the chart's draw function.
+        save_path: Also save the chart to this file.
+        dpi: Resolution of the saved image.
+        **options: Keyword options of the chart's draw function.
+        
+    Returns:
+        Figure: The drawn figure (not registered with pyplot).
+    """
+    spec = CHARTS[name]
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    spec.draw(fig, *args, **options)
+    fig.tight_layout()
+    if save_path is not None:
+        fig.savefig(save_path, dpi=dpi)
+    return fig
+
+
+def _render_job(job: ChartJob) -> Path:
+    """Render one chart job to its file (worker-process entry point)."""
+    render_chart(job.name, *job.args, save_path=job.path, **job.options)
+    return job.path
+
+
+@instrument
+def render_charts(
+    jobs: Iterable[ChartJob],
+    max_workers: int = cfg.RENDER_MAX_WORKERS
+) -> List[Path]:
+    """
+    Render a batch of charts to files, in parallel worker processes.
+    
+    Args:
+        jobs: Charts to render, e.g. one chart set per clinic or month.
+        max_workers: Maximum number of worker processes; 1 renders serially.
+        
+    Returns:
+        List[Path]: Written files, in job order.
+    """
+    jobs = list(jobs)
+    if len(jobs) <= 1 or max_workers <= 1:
+        return [_render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+        return list(pool.map(_render_job, jobs))
+
+
+def _show_or_save(
+    name: str,
+    args: Tuple[Any, ...],
+    save_path: Optional[Path],
+    **options: Any
+) -> None:
+    """
+    Show a chart in an interactive pyplot window, or save it off-screen.
+    
+    Args:
+        name: Chart name from ``CHARTS``.
+        args: Data arguments of the chart's draw function.
+        save_path: Save the chart to this file instead of showing it.
+        **options: Keyword options of the chart's draw function.
+    """
+    if save_path is not None:
+        render_chart(name, *args, save_path=save_path, **options)
+        return
+    
+    import matplotlib.pyplot as plt
+    
+    spec = CHARTS[name]
+    fig = plt.figure(figsize=spec.figsize)
+    spec.draw(fig, *args, **options)
+    fig.tight_layout()
     plt.show()
-    print("\nPasien Risiko Tertinggi telah ditampilkan!")
+    print(f"\n{spec.title} telah ditampilkan!")
+
+
+@instrument
+def plot_blood_pressure_trend(
+    daily_data: pd.DataFrame,
+    save_path: Optional[Path] = None,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
+    """
+    Create a line chart for blood pressure trends.
+    
+    Args:
+        daily_data: DataFrame with daily (or weekly/monthly) averages.
+        save_path: Save the chart to this file instead of showing it.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    _show_or_save("tren_tekanan_darah", (daily_data,), save_path, downsample=downsample)
+
+
+@instrument
+def plot_blood_sugar_trend(
+    daily_data: pd.DataFrame,
+    save_path: Optional[Path] = None,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
+    """
+    Create a line chart for blood sugar trends.
+    
+    Args:
+        daily_data: DataFrame with daily (or weekly/monthly) averages.
+        save_path: Save the chart to this file instead of showing it.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    _show_or_save("tren_gula_darah", (daily_data,), save_path, downsample=downsample)
+
+
+@instrument
+def plot_cholesterol_trend(
+    daily_data: pd.DataFrame,
+    save_path: Optional[Path] = None,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
+    """
+    Create a line chart for cholesterol trends.
+    
+    Args:
+        daily_data: DataFrame with daily (or weekly/monthly) averages.
+        save_path: Save the chart to this file instead of showing it.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    _show_or_save("tren_kolesterol", (daily_data,), save_path, downsample=downsample)
 
+
+@instrument
+def plot_comparison(
+    daily_data: pd.DataFrame,
+    save_path: Optional[Path] = None,
+    downsample: Optional[str] = cfg.TREND_DOWNSAMPLE_METHOD
+) -> None:
+    """
+    Create a comparison plot with all three indicators.
+    
+    Args:
+        daily_data: DataFrame with daily (or weekly/monthly) averages for
+            all indicators.
+        save_path: Save the chart to this file instead of showing it.
+        downsample: Downsampling method for long series, see
+            ``downsample_series``.
+    """
+    _show_or_save("perbandingan_indikator", (daily_data,), save_path, downsample=downsample)
+
+
+@instrument
+def plot_risk_categories(
+    risk_counts: pd.Series,
+    save_path: Optional[Path] = None
+) -> None:
+    """
+    Create a pie chart for risk category distribution.
+    
+    Args:
+        risk_counts: Series with risk category counts.
+        save_path: Save the chart to this file instead of showing it.
+    """
+    _show_or_save("kategori_risiko", (risk_counts,), save_path)
+
+
+@instrument
+def plot_average_indicators(
+    avg_tekanan: float,
+    avg_gula: float,
+    avg_kolesterol: float,
+    save_path: Optional[Path] = None
+) -> None:
+    """
+    Create a bar chart for average health indicators.
+    
+    Args:
+        avg_tekanan: Average blood pressure.
+        avg_gula: Average blood sugar.
+        avg_kolesterol: Average cholesterol.
+        save_path: Save the chart to this file instead of showing it.
+    """
+    _show_or_save(
+        "rata_rata_indikator", (avg_tekanan, avg_gula, avg_kolesterol), save_path
+    )
+
+
+@instrument
+def plot_high_risk_patients(
+    top_patients: pd.DataFrame,
+    save_path: Optional[Path] = None
+) -> None:
+    """
+    Create a grouped bar chart for top high-risk patients.
+    
+    Args:
+        top_patients: DataFrame with top patients and their averages.
+        save_path: Save the chart to this file instead of showing it.
+    """
+    _show_or_save("pasien_risiko_tinggi", (top_patients,), save_path)